@@ -1,13 +1,18 @@
-"""Extract GSLIB data."""
+"""Extract GSLIB data.
+
+The same can be done from the command line, for one or many realizations, with
+``petrelpy facies "OOIP facies dep.txt" -z Mainzones -f Facies_BEG_DiscreteIK100K
+-p PHITSGSfacies-dep -p SWTSGSfacies-dep --ooip OOIP_Facies_dep``.
+"""
 
 from __future__ import annotations
 
-import petrelpy
+import petrelpy.gslib
 
 fin = "OOIP facies dep.txt"
 ooip_cells = petrelpy.gslib.load_from_petrel(fin, npartitions=30)
 ooip_cells = ooip_cells.dropna(subset=["Mainzones"]).drop(
-    ["i_index", "j_index", "k_index", "x_coord", "y_coord", "z_coord"], 1
+    columns=["i_index", "j_index", "k_index", "x_coord", "y_coord", "z_coord"]
 )
 
 zone_name = "Mainzones"
@@ -21,15 +26,14 @@ aggregators = {
     "SWTSGSfacies-dep": "mean",
 }
 
-ooip = petrelpy.gslib.get_facies_stats(ooip_cells, zone_name, facies_name, aggregators)
-ooip.to_csv("OOIP_summary.csv")
+# stats, histograms and maxima share two passes over the model
+summary = petrelpy.gslib.summarize_facies(
+    {fin: ooip_cells}, zone_name, facies_name, properties, ooip_name, aggregators
+)[fin]
+summary.stats.to_csv("OOIP_summary.csv")
 print("saved OOIP summary")  # noqa: T201
 
-ooip_splits, conversion, prop_max = petrelpy.gslib.get_facies_histograms(
-    ooip_cells, zone_name, facies_name, properties, ooip_name
-)
-
 print("Calculated OOIP splits")  # noqa: T201
-ooip_splits.to_csv("OOIP_hist.csv")
-conversion.to_csv("OOIP_hist_converter.csv")
-prop_max.to_csv("property_maxes.csv")
+summary.ooip_splits.to_csv("OOIP_hist.csv")
+summary.index_conversion.to_csv("OOIP_hist_converter.csv")
+summary.prop_max.to_csv("property_maxes.csv")
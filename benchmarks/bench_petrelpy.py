@@ -0,0 +1,287 @@
+"""Benchmark petrelpy readers and writers over synthetic data of several sizes.
+
+Each case writes its input data once per size, then runs in a fresh process so that the
+wall time, throughput and peak resident memory are those of the function being timed.
+Results are printed as a table and appended as JSON lines to the results file, to track
+scaling and regressions across commits::
+
+    python benchmarks/bench_petrelpy.py --sizes 1000 100000 10000000
+    python benchmarks/bench_petrelpy.py --only load_from_petrel --sizes 100000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from petrelpy import synthetic
+from petrelpy.gslib import get_facies_histograms, load_from_petrel
+from petrelpy.petrel import (
+    export_perfs_prn,
+    export_vol,
+    read_petrel_tops,
+    read_production,
+)
+from petrelpy.wellconnection import (
+    COL_NAMES_TRAJECTORY,
+    get_trajectory_geomodel_columns,
+    process_well_connection_file,
+)
+
+DIR = Path(__file__).parent.resolve()
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+SEED = 42
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Case(NamedTuple):
+    """A benchmark: write inputs of n rows, load them untimed, then time run."""
+
+    generate: Callable[[Path, int], Path]
+    load: Callable[[Path], Any]
+    run: Callable[[Any, Path], None]
+
+
+# synthetic inputs
+
+
+def _write_gslib(directory: Path, n: int) -> Path:
+    ni = nj = max(int(np.sqrt(n / 10)), 1)
+    nk = max(n // (ni * nj), 1)
+    return synthetic.write_gslib_model(
+        directory / "geomodel.gslib", shape=(ni, nj, nk), seed=SEED
+    )
+
+
+def _write_well_connection(directory: Path, n: int) -> Path:
+    fname = directory / "connection.wcf"
+    heels = synthetic.write_well_connection_file(
+        fname, n_wells=max(n // 50, 1), cells_per_well=45, vertical_cells=5, seed=SEED
+    )
+    heels.to_csv(directory / "heels.csv", index=False)
+    return fname
+
+
+def _write_production(directory: Path, n: int) -> Path:
+    return synthetic.write_production_csv(
+        directory / "production.csv", n_wells=max(n // 120, 1), n_months=120, seed=SEED
+    )
+
+
+def _write_perforations(directory: Path, n: int) -> Path:
+    return synthetic.write_perforations_csv(
+        directory / "perforations.csv", n_perforations=n, seed=SEED
+    )
+
+
+def _write_tops(directory: Path, n: int) -> Path:
+    return synthetic.write_tops_file(directory / "tops.txt", n_wells=n, seed=SEED)
+
+
+# cases
+
+
+def _compute_len(geomodel) -> int:
+    return int(geomodel.map_partitions(len).compute().sum())
+
+
+def _run_histograms(geomodel, _out: Path) -> None:
+    get_facies_histograms(geomodel, "Mainzones", "Facies", ["Porosity"], "OOIP")
+
+
+def _load_connection(fname: Path):
+    heels = pd.read_csv(fname.with_name("heels.csv"))
+    return fname, heels, COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+
+
+def _run_connection(args, _out: Path) -> None:
+    fname, heels, col_names = args
+    process_well_connection_file(fname, heels, col_names=col_names)
+
+
+def _run_read_production(fname: Path, _out: Path) -> None:
+    read_production(fname)
+
+
+def _run_export_vol(wells, out: Path) -> None:
+    export_vol(wells, out / "production.vol")
+
+
+def _load_perforations(fname: Path):
+    return pd.read_csv(fname, index_col=0)
+
+
+def _run_export_perfs_prn(perforations, out: Path) -> None:
+    export_perfs_prn(perforations, out / "perforations.prn")
+
+
+def _run_read_tops(fname: Path, _out: Path) -> None:
+    read_petrel_tops(fname)
+
+
+def _no_load(fname: Path) -> Path:
+    return fname
+
+
+CASES = {
+    "load_from_petrel": Case(
+        _write_gslib,
+        _no_load,
+        lambda fname, _out: _compute_len(load_from_petrel(fname)),
+    ),
+    "get_facies_histograms": Case(_write_gslib, load_from_petrel, _run_histograms),
+    "process_well_connection_file": Case(
+        _write_well_connection, _load_connection, _run_connection
+    ),
+    "read_production": Case(_write_production, _no_load, _run_read_production),
+    "export_vol": Case(_write_production, read_production, _run_export_vol),
+    "export_perfs_prn": Case(
+        _write_perforations, _load_perforations, _run_export_perfs_prn
+    ),
+    "read_petrel_tops": Case(_write_tops, _no_load, _run_read_tops),
+}
+
+
+# harness
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _run_case(name: str, fname: Path, out: Path, queue) -> None:
+    case = CASES[name]
+    loaded = case.load(fname)
+    rss_loaded = _peak_rss_mb()
+    start = time.perf_counter()
+    case.run(loaded, out)
+    seconds = time.perf_counter() - start
+    queue.put(
+        {"seconds": seconds, "rss_loaded_mb": rss_loaded, "peak_rss_mb": _peak_rss_mb()}
+    )
+
+
+def run_benchmark(name: str, n: int, directory: Path) -> dict[str, Any]:
+    """Time one case at one size in a fresh process.
+
+    Raises a RuntimeError if the process exits without a result, as when it crashes.
+    """
+    fname = CASES[name].generate(directory, n)
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(name, fname, directory, queue))
+    process.start()
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1)
+        except Empty:
+            if not process.is_alive():
+                # it may have put its result just before exiting
+                try:
+                    result = queue.get(timeout=1)
+                except Empty:
+                    break
+    process.join()
+    if result is None:
+        msg = (
+            f"{name} with {n:,} rows exited with code {process.exitcode} and no result"
+        )
+        raise RuntimeError(msg)
+    return {
+        "benchmark": name,
+        "rows": n,
+        "input_mb": fname.stat().st_size / 2**20,
+        **result,
+        "rows_per_second": n / result["seconds"],
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> pd.DataFrame:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="rows per input"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted(CASES),
+        default=sorted(CASES),
+        help="cases to run",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=DIR / "results.jsonl",
+        help="JSON lines file to append results to",
+    )
+    args = parser.parse_args(argv)
+
+    meta = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    results, failed = [], []
+    for n in args.sizes:
+        for name in args.only:
+            try:
+                with tempfile.TemporaryDirectory() as td:
+                    result = run_benchmark(name, n, Path(td))
+            except RuntimeError as e:
+                failed.append(str(e))
+                print(  # noqa: T201
+                    f"{name:<30} {n:>12,} rows FAILED: {e}", file=sys.stderr
+                )
+                continue
+            results.append(result)
+            print(  # noqa: T201
+                f"{name:<30} {n:>12,} rows {result['seconds']:>10.3f} s "
+                f"{result['rows_per_second']:>14,.0f} rows/s "
+                f"{result['peak_rss_mb'] or float('nan'):>10.1f} MB peak RSS"
+            )
+    with args.output.open("a") as f:
+        f.writelines(json.dumps({**meta, **r}) + "\n" for r in results)
+    if failed:
+        sys.exit(f"{len(failed)} benchmark(s) failed")
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    main()
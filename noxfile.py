@@ -30,6 +30,13 @@ def tests(session: nox.Session) -> None:
     session.run("pytest", *session.posargs)
 
 
+@nox.session(venv_backend="uv|venv")
+def benchmarks(session: nox.Session) -> None:
+    """Time the readers and writers. Pass "--sizes 1000 1000000" to pick input sizes."""
+    session.install(".")
+    session.run("python", "benchmarks/bench_petrelpy.py", *session.posargs)
+
+
 @nox.session(reuse_venv=True, venv_backend="uv|venv")
 def docs(session: nox.Session) -> None:
     """Build the docs. Pass "--serve" to serve. Pass "-b linkcheck" to check links."""
@@ -1,36 +1,82 @@
-"""Command line tool for working with Petrel input and output formats."""
+"""Command line tool for working with Petrel input and output formats.
+
+Only click and the standard library are imported at startup. Each command imports
+pandas, dask and the petrelpy module it needs when it runs, so ``petrelpy --help`` and
+calls from batch scripts don't pay for libraries they don't use.
+"""
 
 from __future__ import annotations
 
+import csv
+import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from zipfile import ZipFile
+from typing import Any
 
 import click
-import pandas as pd
-from trogon import tui
 
-from petrelpy.gslib import load_from_petrel
-from petrelpy.petrel import (
-    export_perfs_ev,
-    export_perfs_prn,
-    export_vol,
-    get_raw_table,
-    read_production,
-)
-from petrelpy.wellconnection import (
-    COL_NAMES_TRAJECTORY,
-    get_trajectory_geomodel_columns,
-    process_well_connection_file,
-)
+from petrelpy.profiling import StageProfiler
+from petrelpy.progress import dask_progress, log_to_stderr
 
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
 
-@tui()
 @click.group(context_settings=CONTEXT_SETTINGS)
-def cli():
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="print the time, rows and peak memory (RSS) of each stage when done",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(writable=True, dir_okay=False),
+    help="also write a detailed profile: dask diagnostics for .html, cProfile otherwise",
+)
+@click.option(
+    "--progress",
+    is_flag=True,
+    default=False,
+    help="log progress, throughput and time remaining of long reads and writes",
+)
+@click.pass_context
+def cli(ctx: click.Context, profile: bool, profile_output: str | None, progress: bool):
     """Command line tool for working with Petrel input and output formats."""
+    profiler = StageProfiler(profile, profile_output)
+    ctx.ensure_object(dict).update(profiler=profiler, progress=progress)
+    if progress:
+        log_to_stderr()
+    profiler.start()
+
+    @ctx.call_on_close
+    def report():
+        profiler.stop()
+        if profiler.enabled:
+            click.echo(profiler.summary(), err=True)
+
+
+def _get_profiler() -> StageProfiler:
+    """Get the profiler set up by the cli group, or a disabled one."""
+    obj = click.get_current_context().ensure_object(dict)
+    return obj.setdefault("profiler", StageProfiler())
+
+
+def _progress_enabled() -> bool:
+    """Check whether the cli group was asked to log progress."""
+    return click.get_current_context().ensure_object(dict).get("progress", False)
+
+
+@cli.command(name="tui")
+@click.pass_context
+def tui(ctx: click.Context):
+    """Open Textual TUI."""
+    from trogon import Trogon
+
+    Trogon(cli, command_name="tui", click_context=ctx).run()
 
 
 @cli.command()
@@ -57,23 +103,58 @@ def cli():
     default=False,
     help="whether to unzip the file, by default False",
 )
-def production(input: click.Path, output: click.Path, yearly: bool, zip: bool):
+@click.option(
+    "-m",
+    "--member",
+    default=None,
+    help="glob pattern for the spreadsheets to read from a zip file, "
+    "by default '*Monthly Production.*' or '*Yearly Production.*'",
+)
+@click.option(
+    "-i",
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="only rewrite wells that changed since the last incremental run, by default False",
+)
+def production(
+    input: click.Path,
+    output: click.Path,
+    yearly: bool,
+    zip: bool,
+    member: str | None,
+    incremental: bool,
+):
     """Convert IHS production spreadsheet to Petrel vol format.
 
     This allows production to be easily imported into Petrel.
     """
+    from petrelpy.petrel import export_vol, read_production, read_production_zip
+
     if output is None:
         output = Path(input).with_suffix(".vol")
         click.secho(f"output: {output!s}", fg="green")
 
-    if zip:
-        with ZipFile(input) as f:
-            spreadsheet_name = f"_{'Yearly' if yearly else 'Monthly'} Production.csv"
-            inside_zip = Path(input).stem + spreadsheet_name
-            wells = read_production(f.open(inside_zip), yearly)
-    else:
-        wells = read_production(input, yearly)
-    export_vol(wells, output)
+    profiler = _get_profiler()
+    with profiler.stage("read") as stage:
+        if zip:
+            wells = read_production_zip(input, yearly, pattern=member)
+        else:
+            wells = read_production(input, yearly)
+        stage.rows = len(wells)
+    with profiler.stage("write", rows=len(wells)):
+        export_vol(wells, output, incremental=incremental, progress=_progress_enabled())
+
+
+_HEELS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _read_heels(fname: Path, _mtime_ns: int):
+    """Read a heel csv once per batch run, or again if the file changed."""
+    import pandas as pd
+
+    return pd.read_csv(fname)
 
 
 @cli.command()
@@ -90,23 +171,177 @@ def production(input: click.Path, output: click.Path, yearly: bool, zip: bool):
     type=click.Path(exists=True),
     help="csv file with well to heel measured depth. The columns needed are UWI,Name,Depth_Heel",
 )
-def connection(input: click.Path, output: click.Path, heel: click.Path):
+@click.option(
+    "-p",
+    "--properties",
+    multiple=True,
+    help="geomodel property to average, can be repeated. Only these are parsed; defaults to all",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="only re-aggregate wells that changed since the last --incremental run",
+)
+@click.option(
+    "--geometry",
+    is_flag=True,
+    help="add lateral length, TVD range and azimuth of each lateral",
+)
+@click.option(
+    "--zones",
+    help="with --geometry, the geomodel property holding zones, to count the zones crossed",
+)
+def connection(
+    input: click.Path,
+    output: click.Path,
+    heel: click.Path,
+    properties: tuple[str],
+    incremental: bool,
+    geometry: bool,
+    zones: str | None,
+):
     """Process well connection file to average geomodel properties.
 
     This gets well properties from Petrel (in an Eclipse format) into a spreadsheet.
     """
-    geomodel_cols = get_trajectory_geomodel_columns(input)
-    # click.echo(f"The columns are {geomodel_cols}")
-    all_cols = COL_NAMES_TRAJECTORY + geomodel_cols
-    heel_frame = pd.read_csv(heel)
-    aggregates = (
-        process_well_connection_file(input, heel_frame, col_names=all_cols)
-        .dropna(subset=["GRID_I"])
-        .rename_axis(index="UWI")
+    from petrelpy.wellconnection import (
+        COL_NAMES_TRAJECTORY,
+        get_trajectory_geomodel_columns,
+        process_well_connection_file,
     )
+
+    profiler = _get_profiler()
+    with profiler.stage("read heels") as stage:
+        geomodel_cols = get_trajectory_geomodel_columns(input)
+        # click.echo(f"The columns are {geomodel_cols}")
+        all_cols = COL_NAMES_TRAJECTORY + geomodel_cols
+        unknown = [p for p in properties if p not in geomodel_cols]
+        if unknown:
+            msg = f"{', '.join(unknown)} not in {input}, which has {', '.join(geomodel_cols)}"
+            raise click.BadParameter(msg, param_hint="--properties")
+        if zones is not None and zones not in geomodel_cols:
+            msg = f"{zones} not in {input}, which has {', '.join(geomodel_cols)}"
+            raise click.BadParameter(msg, param_hint="--zones")
+        with _HEELS_LOCK:
+            heel_frame = _read_heels(
+                Path(heel).resolve(), Path(heel).stat().st_mtime_ns
+            )
+        stage.rows = len(heel_frame)
+    with profiler.stage("parse+aggregate") as stage:
+        aggregates = (
+            process_well_connection_file(
+                input,
+                heel_frame,
+                col_names=all_cols,
+                progress=_progress_enabled(),
+                properties=list(properties) or None,
+                incremental=incremental,
+                geometry=geometry,
+                zone_column=zones,
+            )
+            .dropna(subset=["GRID_I"])
+            .rename_axis(index="UWI")
+        )
+        stage.rows = len(aggregates)
     if output is None:
         output = Path(input).with_suffix(".csv")
-    aggregates.to_csv(output)
+    with profiler.stage("write", rows=len(aggregates)):
+        aggregates.to_csv(output)
+
+
+@cli.command()
+@click.argument("input", type=click.Path(exists=True))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(writable=True),
+    help="parquet dataset folder, defaults to input file location with .parquet extension",
+)
+@click.option(
+    "-b",
+    "--buckets",
+    default=16,
+    show_default=True,
+    help="number of partitions to spread the wells between, by a hash of their names",
+)
+def trajectories(input: click.Path, output: click.Path | None, buckets: int):
+    """Convert every cell of a well connection file's trajectories to parquet.
+
+    This keeps the measured depths, grid cells, entry and exit points and geomodel
+    properties of every cell, so new aggregations can run on the parquet dataset
+    instead of parsing the well connection file again.
+    """
+    from petrelpy.wellconnection import export_trajectories
+
+    if output is None:
+        output = Path(input).with_suffix(".parquet")
+    with _get_profiler().stage("parse+write"):
+        try:
+            export_trajectories(
+                input, output, n_buckets=buckets, progress=_progress_enabled()
+            )
+        except FileExistsError as e:
+            raise click.BadParameter(str(e), param_hint="--output") from e
+
+
+@cli.command()
+@click.argument("input", type=click.Path(exists=True))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(writable=True),
+    help="csv of offset wells, defaults to input file location with _spacing.csv suffix",
+)
+@click.option(
+    "-e",
+    "--heel",
+    type=click.Path(exists=True),
+    help="csv file with well to heel measured depth, defaults to using whole trajectories",
+)
+@click.option(
+    "-k",
+    "--offsets",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="number of nearest offset wells to find for each well",
+)
+@click.option(
+    "--max-distance",
+    type=float,
+    help="ignore offset wells farther away than this, defaults to no limit",
+)
+def spacing(
+    input: click.Path,
+    output: click.Path | None,
+    heel: click.Path | None,
+    offsets: int,
+    max_distance: float | None,
+):
+    """Find the nearest offset wells of each lateral in a well connection file.
+
+    For each well, this gives its nearest offset wells with their minimum and mean
+    separation and their vertical offset, for spacing and parent-child studies.
+    """
+    from petrelpy.spacing import lateral_points, well_spacing
+
+    profiler = _get_profiler()
+    heel_frame = None
+    if heel is not None:
+        with _HEELS_LOCK:
+            heel_frame = _read_heels(
+                Path(heel).resolve(), Path(heel).stat().st_mtime_ns
+            )
+    with profiler.stage("parse") as stage:
+        points = lateral_points(input, heel_frame, progress=_progress_enabled())
+        stage.rows = len(points)
+    with profiler.stage("query") as stage:
+        offset_wells = well_spacing(points, k=offsets, max_distance=max_distance)
+        stage.rows = len(offset_wells)
+    if output is None:
+        output = Path(input).with_name(Path(input).stem + "_spacing.csv")
+    with profiler.stage("write", rows=len(offset_wells)):
+        offset_wells.to_csv(output)
 
 
 @cli.command()
@@ -129,13 +364,26 @@ def connection(input: click.Path, output: click.Path, heel: click.Path):
     default="Treatment Start Date",
     help="column for perforation dates",
 )
+@click.option(
+    "--date-format",
+    default=None,
+    help="strptime format of the perforation dates, e.g. %Y-%m-%d. Detected if not given",
+)
 @click.option("--sheetname", default=0, help="sheet name for excel file inputs")
+@click.option(
+    "--cache",
+    is_flag=True,
+    default=False,
+    help="keep a parquet copy of excel inputs next to them, and reuse it on later runs",
+)
 def perforation(
     input: tuple[click.Path],
     output: click.Path,
     header: str,
     date_col: str,
+    date_format: str | None,
     sheetname: str | int,
+    cache: bool,
 ):
     """Create petrel perforation file.
 
@@ -144,21 +392,34 @@ def perforation(
 
     Produces .ev (default) or .prn file
     """
-    perforations = pd.concat(
-        [get_raw_table(fname, sheetname) for fname in input]
-    ).rename_axis(index="API")
+    import pandas as pd
+
+    from petrelpy.petrel import (
+        export_perfs_ev,
+        export_perfs_prn,
+        format_petrel_dates,
+        get_raw_table,
+    )
+
+    profiler = _get_profiler()
+    with profiler.stage("read") as stage:
+        perforations = pd.concat(
+            [get_raw_table(fname, sheetname, cache) for fname in input]
+        ).rename_axis(index="API")
+        stage.rows = len(perforations)
     click.echo(f"{len(perforations)} reports found")
     if date_col not in perforations.columns:
         msg = f"{date_col} is not among the columns loaded from the files provided"
         raise click.BadParameter(msg, param=date_col)
-    perforations["Date"] = pd.to_datetime(perforations[date_col]).dt.strftime(
-        "%m.%d.%Y"
-    )
+    with profiler.stage("dates", rows=len(perforations)):
+        perforations["Date"] = format_petrel_dates(perforations[date_col], date_format)
     output = Path(input[0]).with_suffix(".ev") if output is None else Path(output)
     if output.suffix == ".ev":
-        export_perfs_ev(perforations, output, header)
+        with profiler.stage("write", rows=len(perforations)):
+            export_perfs_ev(perforations, output, header, _progress_enabled())
     elif output.suffix == ".prn":
-        export_perfs_prn(perforations, output)
+        with profiler.stage("write", rows=len(perforations)):
+            export_perfs_prn(perforations, output, _progress_enabled())
     else:
         msg = (
             f"The output file {output} does not have a supported extension.\n"
@@ -168,6 +429,58 @@ def perforation(
         raise click.BadOptionUsage(option_name, msg)
 
 
+def _subset_options(command):
+    """Add the options that pick part of a geomodel to a command."""
+    options = [
+        click.option(
+            "--bbox",
+            type=float,
+            nargs=4,
+            default=None,
+            metavar="XMIN YMIN XMAX YMAX",
+            help="only keep cells with x_coord and y_coord in this box",
+        ),
+        *(
+            click.option(
+                f"--{axis}-range",
+                type=int,
+                nargs=2,
+                default=None,
+                metavar="FIRST LAST",
+                help=f"only keep cells with {axis}_index from FIRST to LAST",
+            )
+            for axis in "ijk"
+        ),
+        click.option(
+            "--polygon",
+            type=click.Path(exists=True, dir_okay=False),
+            help="csv file of x,y polygon vertices, only keep cells inside it",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _subset_kwargs(subset: dict[str, Any]) -> dict[str, Any]:
+    """Turn the subset options into load_from_petrel arguments."""
+    kwargs = {key: value for key, value in subset.items() if value}
+    if "polygon" in kwargs:
+        with Path(kwargs["polygon"]).open(newline="") as f:
+            rows = [row for row in csv.reader(f) if row]
+        start = 0
+        try:
+            float(rows[0][0])
+        except (ValueError, IndexError):
+            start = 1  # header row
+        try:
+            kwargs["polygon"] = [(float(row[0]), float(row[1])) for row in rows[start:]]
+        except (ValueError, IndexError) as e:
+            msg = f"{kwargs['polygon']} should hold one x,y vertex per line"
+            raise click.BadParameter(msg, param_hint="--polygon") from e
+    return kwargs
+
+
 @cli.command()
 @click.argument("gslib_file", type=click.Path(exists=True))
 @click.option(
@@ -182,24 +495,424 @@ def perforation(
     default="parquet",
     help="Format to write gslib file to. Defaults to parquet.",
 )
-def gslib(gslib_file: str, output: str | None, output_format: str):
+@_subset_options
+def gslib(gslib_file: str, output: str | None, output_format: str, **subset: Any):
     """Process GSLIB geocellular model file to spreadsheet.
 
     Defaults to writing a parquet format to ease further manipulation with
-    python, but csv is also supported.
+    python, but csv is also supported, gzip or zstandard compressed if the output
+    ends in .gz or .zst. The subset options keep only part of the model, such as a
+    county or a few layers.
     """
-    geomodel = load_from_petrel(gslib_file)
+    from petrelpy.gslib import load_from_petrel
+
+    profiler = _get_profiler()
+    with profiler.stage("read header"):
+        geomodel = load_from_petrel(gslib_file, **_subset_kwargs(subset))
+
+    from petrelpy.compression import compression_of, open_text
 
     if output is None:
         output = Path(gslib_file).with_suffix(f".{output_format}")
+    elif output_format == "csv" and compression_of(output):
+        output = Path(output)  # e.g. model.csv.gz, compressed as it is written
     else:
         output = Path(output).with_suffix(f".{output_format}")
 
+    progress = dask_progress(f"converting {gslib_file}", _progress_enabled())
     if output_format == "parquet":
-        geomodel.to_parquet(output, write_index=False)
+        with profiler.stage("parse+write"), progress:
+            geomodel.to_parquet(output, write_index=False)
     elif output_format == "csv":
-        geomodel.compute().to_csv(output, index=False)
+        with profiler.stage("parse") as stage, progress:
+            geomodel = geomodel.compute()
+            stage.rows = len(geomodel)
+        with profiler.stage("write", rows=len(geomodel)), open_text(output, "w") as f:
+            geomodel.to_csv(f, index=False)
     else:
         errmsg = f"Only writes to parquet or csv, not {output_format}"
         option = "output_format"
         raise click.BadOptionUsage(option, errmsg)
+
+
+@cli.command(name="to-gslib")
+@click.argument("input", type=click.Path(exists=True))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(writable=True),
+    help="gslib file, defaults to input file location with .gslib extension",
+)
+@click.option(
+    "--title", default="PETREL: Properties", help="first line of the gslib file"
+)
+@click.option(
+    "-d",
+    "--decimals",
+    default=6,
+    show_default=True,
+    help="decimal places to round floats to",
+)
+def to_gslib(input: str, output: str | None, title: str, decimals: int):
+    """Write a parquet or csv geocellular model to a GSLIB file for Petrel.
+
+    INPUT is a parquet file or folder, such as one written by the gslib command, or a
+    csv file. Missing values are written as -999.
+    """
+    import dask.dataframe as dd
+
+    from petrelpy.compression import compression_of, uncompressed_suffix
+    from petrelpy.gslib import write_gslib
+
+    profiler = _get_profiler()
+    compressed = compression_of(input) is not None
+    if uncompressed_suffix(input) == ".csv":
+        geomodel = dd.read_csv(input, blocksize=None if compressed else "default")
+    else:
+        geomodel = dd.read_parquet(input)
+    if output is None:
+        stem = Path(input).with_suffix("") if compressed else Path(input)
+        output = stem.with_suffix(".gslib")
+    with profiler.stage("parse+write"):
+        write_gslib(
+            geomodel, output, title, decimals=decimals, progress=_progress_enabled()
+        )
+
+
+@cli.command()
+@click.argument("models", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=".",
+    help="folder for the csv files, named after each model. Defaults to the current folder",
+)
+@click.option("-z", "--zone", default="Mainzones", help="column naming the zone")
+@click.option("-f", "--facies", default="Facies", help="column naming the facies")
+@click.option(
+    "-p",
+    "--property",
+    "properties",
+    multiple=True,
+    required=True,
+    help="property to compute OOIP histograms over, repeat for several",
+)
+@click.option(
+    "--ooip",
+    default="OOIP",
+    help="column summed in the histograms, e.g. OOIP or Bulkvolume",
+)
+@click.option(
+    "-b",
+    "--bins",
+    multiple=True,
+    help="PROPERTY=N for N bins from 0 to the maximum, or PROPERTY=E0,E1,... for bin "
+    "edges. Defaults to 100 bins. Edges for every property save a pass over the data",
+)
+@click.option(
+    "-a",
+    "--agg",
+    multiple=True,
+    help="COLUMN=AGGREGATION for the facies statistics, e.g. Bulkvolume=sum. "
+    "Defaults to summing OOIP and averaging the properties",
+)
+@click.option(
+    "-e",
+    "--derive",
+    multiple=True,
+    help="NAME=EXPRESSION for a derived property, e.g. 'HCPV=Bulkvolume*Porosity*(1-Sw)', "
+    "computed in the same pass and usable in -p, --ooip and --agg. Repeat for several",
+)
+@click.option(
+    "-c",
+    "--constant",
+    multiple=True,
+    help="NAME=VALUE for a constant in the derived property expressions, e.g. Bo=1.2",
+)
+@click.option(
+    "--derived-cache",
+    type=click.Path(file_okay=False, writable=True),
+    help="folder to keep the models with derived properties in, for faster reruns",
+)
+@click.option(
+    "-n", "--npartitions", default=60, help="partitions per model, by default 60"
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="run on a dask distributed LocalCluster with this many workers",
+)
+@_subset_options
+def facies(
+    models: tuple[str],
+    output_dir: str,
+    zone: str,
+    facies: str,
+    properties: tuple[str],
+    ooip: str,
+    bins: tuple[str],
+    agg: tuple[str],
+    derive: tuple[str],
+    constant: tuple[str],
+    derived_cache: str | None,
+    npartitions: int,
+    workers: int | None,
+    **subset: Any,
+):
+    """Compute facies statistics and OOIP histograms of GSLIB geomodels.
+
+    Give several MODELS, such as the realizations of an uncertainty study, to compute
+    them together. For each model, writes <name>_summary.csv, <name>_hist.csv,
+    <name>_hist_converter.csv and <name>_property_maxes.csv.
+    """
+    from contextlib import ExitStack
+
+    from petrelpy.derived import add_derived_properties
+    from petrelpy.gslib import load_from_petrel, summarize_facies
+
+    names = [Path(model).stem for model in models]
+    if len(set(names)) < len(names):
+        msg = "models need distinct file names, which name their outputs"
+        raise click.BadParameter(msg, param_hint="MODELS")
+    attrs = None
+    if agg:
+        try:
+            attrs = dict(a.split("=", 1) for a in agg)
+        except ValueError as e:
+            msg = "aggregations look like COLUMN=AGGREGATION"
+            raise click.BadParameter(msg, param_hint="--agg") from e
+
+    derived = _name_value_pairs(derive, "NAME=EXPRESSION", "--derive")
+    try:
+        constants = {
+            name: float(value)
+            for name, value in _name_value_pairs(
+                constant, "NAME=VALUE", "--constant"
+            ).items()
+        }
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--constant") from e
+
+    bin_specs = {}
+    for spec in bins:
+        name, _, value = spec.partition("=")
+        try:
+            bin_specs[name] = (
+                [float(edge) for edge in value.split(",")]
+                if "," in value
+                else int(value)
+            )
+        except ValueError as e:
+            msg = f"{spec} should look like PROPERTY=N or PROPERTY=E0,E1,..."
+            raise click.BadParameter(msg, param_hint="--bins") from e
+
+    profiler = _get_profiler()
+    with ExitStack() as stack:
+        if workers is not None:
+            try:
+                from dask.distributed import Client, LocalCluster
+            except ImportError as e:
+                msg = (
+                    "--workers needs dask distributed: pip install 'dask[distributed]'"
+                )
+                raise click.UsageError(msg) from e
+            cluster = stack.enter_context(LocalCluster(n_workers=workers))
+            stack.enter_context(Client(cluster))
+        with profiler.stage("read headers"):
+            geomodels = {
+                name: load_from_petrel(model, npartitions, **_subset_kwargs(subset))
+                for name, model in zip(names, models)
+            }
+            if derived:
+                geomodels = {
+                    name: add_derived_properties(
+                        geomodel, derived, constants, derived_cache
+                    )
+                    for name, geomodel in geomodels.items()
+                }
+        with profiler.stage("summarize"):
+            summaries = summarize_facies(
+                geomodels,
+                zone,
+                facies,
+                list(properties),
+                ooip,
+                attrs,
+                progress=_progress_enabled(),
+                bins=bin_specs,
+            )
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with profiler.stage("write"):
+        for name, summary in summaries.items():
+            summary.stats.to_csv(output_dir / f"{name}_summary.csv")
+            summary.ooip_splits.to_csv(output_dir / f"{name}_hist.csv")
+            summary.index_conversion.to_csv(output_dir / f"{name}_hist_converter.csv")
+            summary.prop_max.to_csv(output_dir / f"{name}_property_maxes.csv")
+
+
+def _name_value_pairs(specs: tuple[str], form: str, option: str) -> dict[str, str]:
+    """Split repeated NAME=VALUE options into a dictionary."""
+    pairs = {}
+    for spec in specs:
+        name, equals, value = spec.partition("=")
+        if not (name.strip() and equals and value.strip()):
+            msg = f"{spec!r} should look like {form}"
+            raise click.BadParameter(msg, param_hint=option)
+        pairs[name.strip()] = value.strip()
+    return pairs
+
+
+BATCH_COMMANDS = (
+    "production",
+    "perforation",
+    "connection",
+    "trajectories",
+    "spacing",
+    "gslib",
+    "to-gslib",
+    "facies",
+)
+
+
+@cli.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="number of jobs to run at once, by default 1",
+)
+@click.option(
+    "--keep-going",
+    is_flag=True,
+    default=False,
+    help="run the remaining jobs after one fails, by default False",
+)
+@click.pass_context
+def batch(ctx: click.Context, manifest: str, workers: int, keep_going: bool):
+    r"""Run many production, perforation, connection, trajectories, spacing, gslib or facies jobs.
+
+    MANIFEST is a YAML (needs pyyaml), JSON or csv file listing one job per entry or
+    row. Each job has a command and that command's arguments and options under their
+    long names, e.g. in YAML:
+
+    \b
+    - {command: production, input: county1.csv, yearly: true}
+    - {command: connection, input: field.wcf, heel: heels.csv, output: field.csv}
+
+    Interpreter and library startup is paid once, and heel files shared by several
+    connection jobs are read once. With --profile, jobs have to run one at a time, so
+    each stage's time and memory belong to one job.
+    """
+    if workers > 1 and _get_profiler().enabled:
+        msg = (
+            "--profile measures one job at a time, so can't be used with --workers > 1"
+        )
+        raise click.UsageError(msg)
+    jobs = _read_manifest(Path(manifest))
+    argvs = [_job_args(job, number) for number, job in enumerate(jobs, start=1)]
+
+    def run(number: int, argv: list[str]) -> str | None:
+        command = cli.commands[argv[0]]
+        start = time.perf_counter()
+        try:
+            with command.make_context(argv[0], argv[1:], parent=ctx) as job_ctx:
+                command.invoke(job_ctx)
+        except Exception as e:
+            message = e.format_message() if isinstance(e, click.ClickException) else e
+            click.secho(f"[{number}/{len(jobs)}] failed: {message}", fg="red", err=True)
+            return f"{number}: {' '.join(argv)}"
+        seconds = time.perf_counter() - start
+        click.echo(f"[{number}/{len(jobs)}] {' '.join(argv)} ({seconds:.1f} s)")
+        return None
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run, number, argv)
+            for number, argv in enumerate(argvs, start=1)
+        ]
+        for future in futures:
+            if future.cancelled():
+                continue
+            failure = future.result()
+            if failure is not None:
+                failed.append(failure)
+                if not keep_going:
+                    for pending in futures:
+                        pending.cancel()
+    if failed:
+        msg = f"{len(failed)} of {len(jobs)} jobs failed:\n" + "\n".join(failed)
+        raise click.ClickException(msg)
+
+
+def _read_manifest(fname: Path) -> list[dict[str, Any]]:
+    """Read the jobs listed in a YAML, JSON or csv manifest."""
+    if fname.suffix.lower() == ".csv":
+        with fname.open(newline="") as f:
+            # blank cells fall back to the command's defaults
+            return [
+                {key: value for key, value in row.items() if value}
+                for row in csv.DictReader(f)
+            ]
+    if fname.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError as e:
+            msg = "Reading YAML manifests needs pyyaml, use JSON or csv instead"
+            raise click.UsageError(msg) from e
+        jobs = yaml.safe_load(fname.read_text())
+    else:
+        jobs = json.loads(fname.read_text())
+    if isinstance(jobs, dict):
+        jobs = jobs.get("jobs")
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        msg = f"{fname} should hold a list of jobs, or a mapping with a 'jobs' list"
+        raise click.BadParameter(msg, param_hint="MANIFEST")
+    return jobs
+
+
+def _job_args(job: dict[str, Any], number: int) -> list[str]:
+    """Turn a manifest job into the command line arguments of its command."""
+    job = dict(job)
+    name = job.pop("command", None)
+    if name not in BATCH_COMMANDS:
+        msg = (
+            f"job {number} has command {name!r}, not one of {', '.join(BATCH_COMMANDS)}"
+        )
+        raise click.BadParameter(msg, param_hint="MANIFEST")
+    # jobs can name parameters by their long options, e.g. property for --property, or
+    # by their names in the command's signature
+    params = {}
+    for param in cli.commands[name].params:
+        for alias in (*param.opts, param.name):
+            params[_param_key(alias)] = param
+    args, options = [], []
+    for key, value in job.items():
+        param = params.get(_param_key(key))
+        if param is None:
+            msg = f"job {number}: {name} has no argument or option {key!r}"
+            raise click.BadParameter(msg, param_hint="MANIFEST")
+        values = value if isinstance(value, list) else [value]
+        if isinstance(param, click.Argument):
+            args += [str(v) for v in values]
+        elif param.is_flag:
+            if click.BOOL.convert(value, param, None):
+                options.append(param.opts[-1])
+        elif param.nargs > 1:  # e.g. --bbox XMIN YMIN XMAX YMAX
+            options += [param.opts[-1], *(str(v) for v in values)]
+        else:
+            for v in values:
+                options += [param.opts[-1], str(v)]
+    return [name, *options, "--", *args]
+
+
+def _param_key(name: str) -> str:
+    """Normalize a parameter name or option so --max-distance matches max_distance."""
+    return name.lstrip("-").replace("-", "_")
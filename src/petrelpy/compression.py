@@ -0,0 +1,134 @@
+"""Read and write text files compressed with gzip or zstandard, chosen by file suffix.
+
+Files ending in ``.gz`` are gzip, files ending in ``.zst`` are zstandard (which needs
+the zstandard package), anything else is plain text. Writers compress in parallel:
+gzip output is split into blocks compressed by a thread pool and written as
+consecutive gzip members, which any gzip reader joins back together, and zstandard
+output uses the library's own worker threads.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+BLOCK_SIZE = 4 * 2**20
+
+
+def compression_of(fname: str | Path) -> str | None:
+    """Get the compression a file's suffix asks for, "gzip", "zstd" or None."""
+    return COMPRESSION_SUFFIXES.get(Path(fname).suffix.lower())
+
+
+def uncompressed_suffix(fname: str | Path) -> str:
+    """Get a file's suffix, ignoring a compression suffix, e.g. ".csv" for a.csv.gz."""
+    fname = Path(fname)
+    return Path(fname.stem).suffix if compression_of(fname) else fname.suffix
+
+
+def open_text(
+    fname: str | Path,
+    mode: str = "r",
+    encoding: str | None = None,
+    level: int | None = None,
+    max_workers: int | None = None,
+) -> IO[str]:
+    """Open a text file, compressing or decompressing it according to its suffix.
+
+    Args:
+        fname (str | Path): file to open
+        mode (str, optional): "r" to read or "w" to write. Defaults to "r".
+        encoding (str | None, optional): text encoding. Defaults to None, the locale's.
+        level (int | None, optional): compression level. Defaults to None, which is 6
+            for gzip and 3 for zstandard.
+        max_workers (int | None, optional): compression threads when writing. Defaults
+            to None, one per CPU.
+
+    Returns:
+        IO[str]: file object to use in a ``with`` block
+
+    """
+    if mode not in ("r", "w"):
+        msg = f"mode must be 'r' or 'w', not {mode!r}"
+        raise ValueError(msg)
+    compression = compression_of(fname)
+    if compression is None:
+        return Path(fname).open(mode, encoding=encoding)
+    if compression == "gzip":
+        if mode == "r":
+            return gzip.open(fname, "rt", encoding=encoding)
+        raw = _ParallelGzipWriter(
+            Path(fname).open("wb"),  # noqa: SIM115
+            6 if level is None else level,
+            max_workers,
+        )
+        return io.TextIOWrapper(io.BufferedWriter(raw, BLOCK_SIZE), encoding=encoding)
+
+    zstandard = _import_zstandard()
+    f = Path(fname).open(f"{mode}b")  # noqa: SIM115
+    if mode == "r":
+        # read every frame, as from files written in pieces or by other tools
+        stream = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        return io.TextIOWrapper(io.BufferedReader(stream), encoding=encoding)
+    compressor = zstandard.ZstdCompressor(
+        level=3 if level is None else level, threads=max_workers or -1
+    )
+    return io.TextIOWrapper(compressor.stream_writer(f), encoding=encoding)
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard  # noqa: PLC0415
+    except ImportError as e:
+        msg = "Reading and writing .zst files needs zstandard (pip install zstandard)"
+        raise ImportError(msg) from e
+    return zstandard
+
+
+class _ParallelGzipWriter(io.RawIOBase):
+    """Binary sink that gzips blocks in a thread pool and writes them in order."""
+
+    def __init__(self, f: IO[bytes], level: int, max_workers: int | None = None):
+        self._f = f
+        self._level = level
+        self._workers = max_workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(self._workers)
+        self._pending: deque[Future] = deque()
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        if len(self._buffer) >= BLOCK_SIZE:
+            self._submit()
+        return len(data)
+
+    def _submit(self) -> None:
+        block, self._buffer = bytes(self._buffer), bytearray()
+        self._pending.append(
+            self._pool.submit(gzip.compress, block, self._level, mtime=0)
+        )
+        # bound the blocks held in memory to two per worker
+        while len(self._pending) > 2 * self._workers:
+            self._f.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self._pending:
+                self._submit()
+            while self._pending:
+                self._f.write(self._pending.popleft().result())
+        finally:
+            self._pool.shutdown()
+            self._f.close()
+            super().close()
@@ -0,0 +1,113 @@
+"""Derived geomodel properties, declared as expressions and evaluated lazily.
+
+A derived property is a name and an expression over the geomodel's columns, constants,
+and the properties derived before it, such as::
+
+    {
+        "HCPV": "Bulkvolume * Porosity * (1 - Sw)",
+        "OOIP": "HCPV / Bo / 5.615",
+        "net": "(Porosity >= phi_cutoff) & (Sw <= sw_cutoff)",
+    }
+
+with constants ``{"Bo": 1.2, "phi_cutoff": 0.04, "sw_cutoff": 0.6}``. Expressions are
+evaluated a partition at a time with ``DataFrame.eval``, which uses numexpr when it is
+installed, as part of whatever computation needs them, so deriving properties and
+aggregating them takes one pass over the model. Columns with spaces or dashes in their
+names go in backticks, e.g. ```PHITSGSfacies-dep` * Bulkvolume``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+
+import dask.dataframe as dd
+import pandas as pd
+from dask.base import tokenize
+
+
+def add_derived_properties(
+    geomodel: dd.DataFrame,
+    properties: Mapping[str, str],
+    constants: Mapping[str, float] | None = None,
+    cache_dir: str | Path | None = None,
+) -> dd.DataFrame:
+    """Add derived properties to a geomodel, computed when the geomodel is.
+
+    With a cache_dir, each partition is saved as parquet as it is computed, in a
+    folder named after a hash of the geomodel (which changes with its source files),
+    the expressions and the constants. Once every partition has been saved, later
+    calls read the cache instead of parsing the model and evaluating the expressions.
+
+    Args:
+        geomodel (dd.DataFrame): geomodel, as from ``load_from_petrel``
+        properties (Mapping[str, str]): names and expressions of the new columns, in
+            order. An expression can use the properties before it.
+        constants (Mapping[str, float] | None, optional): values for names in the
+            expressions that aren't columns, such as a formation volume factor.
+            Defaults to None.
+        cache_dir (str | Path | None, optional): folder to keep computed partitions in.
+            Defaults to None, which doesn't cache.
+
+    Returns:
+        dd.DataFrame: the geomodel with the derived properties as extra columns
+
+    """
+    properties = dict(properties)
+    constants = dict(constants or {})
+    meta = derive(geomodel._meta, properties, constants)
+    if cache_dir is None:
+        return geomodel.map_partitions(derive, properties, constants, meta=meta)
+
+    cache = Path(cache_dir) / f"derived-{tokenize(geomodel, properties, constants)}"
+    files = [cache / f"part.{i}.parquet" for i in range(geomodel.npartitions)]
+    if all(fname.exists() for fname in files):
+        return dd.read_parquet([str(fname) for fname in files])
+    cache.mkdir(parents=True, exist_ok=True)
+    return geomodel.map_partitions(
+        _derive_and_cache, properties, constants, cache, meta=meta
+    )
+
+
+def derive(
+    cells: pd.DataFrame,
+    properties: Mapping[str, str],
+    constants: Mapping[str, float] | None = None,
+) -> pd.DataFrame:
+    """Evaluate derived properties on a table of cells.
+
+    Args:
+        cells (pd.DataFrame): geomodel cells, or one partition of a geomodel
+        properties (Mapping[str, str]): names and expressions of the new columns
+        constants (Mapping[str, float] | None, optional): values for names in the
+            expressions that aren't columns. Defaults to None.
+
+    Returns:
+        pd.DataFrame: a copy of cells with the new columns
+
+    """
+    cells = cells.copy()
+    resolvers = (dict(constants or {}),)
+    for name, expression in properties.items():
+        try:
+            cells[name] = cells.eval(expression, resolvers=resolvers)
+        except (NameError, SyntaxError) as e:
+            msg = f"can't derive {name} from {expression!r}: {e}"
+            raise ValueError(msg) from e
+    return cells
+
+
+def _derive_and_cache(
+    cells: pd.DataFrame,
+    properties: Mapping[str, str],
+    constants: Mapping[str, float],
+    cache: Path,
+    partition_info: dict | None = None,
+) -> pd.DataFrame:
+    cells = derive(cells, properties, constants)
+    if partition_info is not None:
+        fname = cache / f"part.{partition_info['number']}.parquet"
+        tmp_file = fname.with_name(fname.name + ".tmp")
+        cells.to_parquet(tmp_file)
+        tmp_file.replace(fname)
+    return cells
@@ -3,21 +3,54 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple, Union
 
+import dask
 import dask.dataframe as dd
 import fastparquet
 import numpy as np
 import pandas as pd
 from scipy.spatial import cKDTree
 
-
-def load_from_petrel(fin: Path | str, npartitions=60) -> dd.DataFrame:
+from petrelpy import sketch
+from petrelpy.compression import compression_of, open_text
+from petrelpy.petrel import write_blocks
+from petrelpy.progress import Progress, dask_progress
+
+
+def load_from_petrel(
+    fin: Path | str,
+    npartitions=60,
+    bbox: tuple[float, float, float, float] | None = None,
+    i_range: tuple[int | None, int | None] | None = None,
+    j_range: tuple[int | None, int | None] | None = None,
+    k_range: tuple[int | None, int | None] | None = None,
+    polygon: Sequence[tuple[float, float]] | None = None,
+) -> dd.DataFrame:
     """Load GSLIB geomodel file.
 
+    The subsetting options are applied to each block of the file as soon as it is
+    parsed, so cells outside the area of interest never pile up in memory and later
+    computations only see the cells that were kept.
+
     Args:
         fin (Path | str): gslib Petrel output
         npartitions (int, optional): number of partitions for dask dataframe. Defaults to 60.
+        bbox (tuple[float, float, float, float] | None, optional): keep cells with
+            x_coord and y_coord within (xmin, ymin, xmax, ymax). Defaults to None.
+        i_range (tuple[int | None, int | None] | None, optional): keep cells with
+            i_index from the first to the second value, inclusive. None leaves that end
+            open. Defaults to None.
+        j_range (tuple[int | None, int | None] | None, optional): same, for j_index.
+            Defaults to None.
+        k_range (tuple[int | None, int | None] | None, optional): same, for k_index, to
+            pick layers. Defaults to None.
+        polygon (Sequence[tuple[float, float]] | None, optional): keep cells whose x_coord
+            and y_coord fall inside this polygon, given as (x, y) vertices.
+            Defaults to None.
 
     Returns:
         dd.DataFrame: lazy-evaluated dataframe with geomodel properties
@@ -31,10 +64,286 @@ def load_from_petrel(fin: Path | str, npartitions=60) -> dd.DataFrame:
         header=numprops + 1,
         na_values=-999,
         names=list(head[0]),
+        # compressed files can't be split, so each is read as one block
+        blocksize=None if compression_of(fin) else "default",
     )
+    ranges = {
+        column: limits
+        for column, limits in zip(
+            ["i_index", "j_index", "k_index"], [i_range, j_range, k_range]
+        )
+        if limits is not None
+    }
+    if bbox is not None or ranges or polygon is not None:
+        needed = list(ranges)
+        if bbox is not None or polygon is not None:
+            needed += ["x_coord", "y_coord"]
+        missing = sorted(set(needed) - set(geomodel.columns))
+        if missing:
+            msg = f"{fin} has no {', '.join(missing)} column to subset by"
+            raise ValueError(msg)
+        geomodel = geomodel.map_partitions(
+            subset_cells,
+            bbox=bbox,
+            ranges=ranges,
+            polygon=polygon,
+            meta=geomodel._meta,
+        )
     return geomodel.repartition(npartitions=npartitions)
 
 
+def subset_cells(
+    cells: pd.DataFrame,
+    bbox: tuple[float, float, float, float] | None = None,
+    ranges: dict[str, tuple[float | None, float | None]] | None = None,
+    polygon: Sequence[tuple[float, float]] | None = None,
+) -> pd.DataFrame:
+    """Keep the geomodel cells inside a bounding box, index ranges and polygon.
+
+    Args:
+        cells (pd.DataFrame): geomodel cells with x_coord and y_coord columns
+        bbox (tuple[float, float, float, float] | None, optional): (xmin, ymin, xmax,
+            ymax) of the cells to keep. Defaults to None.
+        ranges (dict[str, tuple[float | None, float | None]] | None, optional): inclusive
+            (low, high) limits by column, e.g. {"k_index": (3, 5)}. Defaults to None.
+        polygon (Sequence[tuple[float, float]] | None, optional): (x, y) vertices of the
+            area to keep. Defaults to None.
+
+    Returns:
+        pd.DataFrame: cells that pass every filter given
+
+    """
+    keep = np.ones(len(cells), dtype=bool)
+    for column, (low, high) in (ranges or {}).items():
+        if low is not None:
+            keep &= (cells[column] >= low).to_numpy()
+        if high is not None:
+            keep &= (cells[column] <= high).to_numpy()
+    if bbox is not None:
+        xmin, ymin, xmax, ymax = bbox
+        keep &= cells["x_coord"].between(xmin, xmax).to_numpy()
+        keep &= cells["y_coord"].between(ymin, ymax).to_numpy()
+    if polygon is not None:
+        vertices = np.asarray(polygon, dtype=float)
+        (xmin, ymin), (xmax, ymax) = vertices.min(axis=0), vertices.max(axis=0)
+        keep &= cells["x_coord"].between(xmin, xmax).to_numpy()
+        keep &= cells["y_coord"].between(ymin, ymax).to_numpy()
+        candidates = np.flatnonzero(keep)
+        keep[candidates] = _points_in_polygon(
+            cells["x_coord"].to_numpy()[candidates],
+            cells["y_coord"].to_numpy()[candidates],
+            vertices,
+        )
+    return cells[keep]
+
+
+def _points_in_polygon(
+    x: np.ndarray, y: np.ndarray, vertices: np.ndarray
+) -> np.ndarray:
+    """Even-odd ray casting test, vectorized over the points."""
+    inside = np.zeros(len(x), dtype=bool)
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        crosses = (y1 > y) != (y2 > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def write_gslib(
+    geomodel: pd.DataFrame | dd.DataFrame,
+    fname: Path | str,
+    title: str = "PETREL: Properties",
+    decimals: int | Mapping[str, int] = 6,
+    na_rep: str = "-999",
+    progress: bool = False,
+) -> Path:
+    """Write a geomodel to a GSLIB file that Petrel can import.
+
+    The header has the title, the number of properties and one line per property,
+    then each cell is a line of space-separated values. A dask geomodel is written a
+    partition at a time, computing the next partition while the last is written, so
+    only two partitions are in memory at once. Values are formatted a column at a
+    time with numpy string operations and written in blocks of lines. A file ending in
+    .gz or .zst is compressed.
+
+    Args:
+        geomodel (pd.DataFrame | dd.DataFrame): cells, one column per property, like
+            the output of ``load_from_petrel``. The index is not written.
+        fname (Path | str): gslib file to write
+        title (str, optional): first line of the file. Defaults to "PETREL: Properties".
+        decimals (int | Mapping[str, int], optional): decimal places floats are rounded
+            to, for all columns or by column name, trailing zeros dropped. Defaults to 6.
+        na_rep (str, optional): value for missing data. Defaults to "-999".
+        progress (bool, optional): whether to log the partitions written and the rate.
+            Defaults to False.
+
+    Returns:
+        Path: the gslib file
+
+    """
+    parts = geomodel.to_delayed() if isinstance(geomodel, dd.DataFrame) else [geomodel]
+    fname = Path(fname)
+    with (
+        open_text(fname, "w") as f,
+        ThreadPoolExecutor(1) as pool,
+        Progress(
+            f"writing {fname}", total=len(parts), unit="partitions", enabled=progress
+        ) as tracker,
+    ):
+        f.write(f"{title}\n{len(geomodel.columns)}\n")
+        f.writelines(f"{col} unit1 scale1\n" for col in geomodel.columns)
+        write_blocks(
+            f,
+            _gslib_blocks(parts, pool, tracker),
+            lambda _, cells: _format_gslib_block(cells, decimals, na_rep).decode(),
+            chunksize=1,
+        )
+    return fname
+
+
+def _gslib_blocks(
+    parts: list, pool: ThreadPoolExecutor, tracker: Progress
+) -> Iterator[tuple[int, pd.DataFrame]]:
+    """Split partitions into blocks of rows, computing the next partitions meanwhile.
+
+    Partitions are computed a few at a time, so partitions cut from the same block of
+    a file share its parsing.
+    """
+    groups = [
+        parts[i : i + _GSLIB_PARTITIONS_PER_COMPUTE]
+        for i in range(0, len(parts), _GSLIB_PARTITIONS_PER_COMPUTE)
+    ]
+    upcoming = pool.submit(_compute, groups[0]) if groups else None
+    for i in range(len(groups)):
+        computed = upcoming.result()
+        if i + 1 < len(groups):
+            upcoming = pool.submit(_compute, groups[i + 1])
+        for part in computed:
+            for start in range(0, len(part), _GSLIB_WRITE_ROWS):
+                yield start, part.iloc[start : start + _GSLIB_WRITE_ROWS]
+            tracker.update()
+
+
+def _compute(parts: list) -> tuple[pd.DataFrame, ...]:
+    return dask.compute(*parts)
+
+
+_GSLIB_WRITE_ROWS = 100_000
+_GSLIB_PARTITIONS_PER_COMPUTE = 4
+
+
+def _format_gslib_block(
+    cells: pd.DataFrame, decimals: int | Mapping[str, int], na_rep: str
+) -> bytes:
+    """Format cells as lines of space-separated values.
+
+    Each column becomes a matrix of characters, one row per cell, with a mask of the
+    characters to keep, so the whole block is formatted by numpy array operations.
+    """
+    n = len(cells)
+    chars, keep = [], []
+    for name, column in cells.items():
+        places = decimals.get(name, 6) if isinstance(decimals, Mapping) else decimals
+        column_chars, column_keep = _column_chars(column, places, na_rep)
+        chars += [column_chars, np.full((n, 1), ord(" "), dtype=np.uint8)]
+        keep += [column_keep, np.ones((n, 1), dtype=bool)]
+    if chars:
+        chars[-1][:] = ord("\n")
+    chars = np.concatenate(chars, axis=1) if chars else np.empty((n, 0), np.uint8)
+    keep = np.concatenate(keep, axis=1) if keep else np.empty((n, 0), bool)
+    return chars[keep].tobytes()
+
+
+def _column_chars(
+    column: pd.Series, decimals: int, na_rep: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Characters of a column's values, right-aligned, and the mask of those to keep."""
+    missing = column.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(column) and not missing.any():
+        column = column.astype(np.int8)
+    if pd.api.types.is_integer_dtype(column) and not missing.any():
+        values = column.to_numpy(dtype=np.int64)
+        blocks = [_sign_chars(values < 0), _digit_chars(np.abs(values))]
+    elif pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+        missing = missing | ~np.isfinite(values)
+        scale = 10**decimals
+        scaled = np.round(np.where(missing, 0, np.abs(values)) * scale)
+        if scaled.max(initial=0) >= 2**62:
+            # too big for fixed point in int64, format with python instead
+            text = [f"{v:.{decimals}f}" for v in values]
+            return _column_chars(pd.Series(text).mask(missing), decimals, na_rep)
+        scaled = scaled.astype(np.int64)
+        whole, fraction = np.divmod(scaled, scale)
+        blocks = [_sign_chars((values < 0) & (scaled > 0)), _digit_chars(whole)]
+        if decimals > 0:
+            blocks.append(_fraction_chars(fraction, decimals))
+    else:
+        encoded = column.astype(str).str.encode("utf-8").to_numpy().astype(bytes)
+        width = encoded.dtype.itemsize
+        chars = encoded.view(np.uint8).reshape(len(encoded), width)
+        keep = np.arange(width) < np.char.str_len(encoded)[:, None]
+        blocks = [(chars, keep)]
+
+    na_chars = np.frombuffer(na_rep.encode(), dtype=np.uint8)
+    blocks.append(
+        (
+            np.broadcast_to(na_chars, (len(missing), len(na_chars))),
+            np.broadcast_to(missing[:, None], (len(missing), len(na_chars))),
+        )
+    )
+    chars = np.concatenate([chars for chars, _ in blocks], axis=1)
+    keep = np.concatenate([keep for _, keep in blocks], axis=1)
+    keep[missing, : keep.shape[1] - len(na_chars)] = False
+    return chars, keep
+
+
+def _sign_chars(negative: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return np.full((len(negative), 1), ord("-"), dtype=np.uint8), negative[:, None]
+
+
+def _digit_chars(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Decimal digits of non-negative integers, keeping all but leading zeros."""
+    width = len(str(values.max(initial=0)))
+    chars = _digits(values, width)
+    n_digits = np.ones(len(values), dtype=np.int8)
+    power = 10
+    for _ in range(width - 1):
+        n_digits += values >= power
+        power *= 10
+    return chars, np.arange(width) >= width - n_digits[:, None]
+
+
+def _fraction_chars(
+    fraction: np.ndarray, decimals: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Format the decimal point and the digits after it, dropping trailing zeros."""
+    chars = np.empty((len(fraction), decimals + 1), dtype=np.uint8)
+    chars[:, 0] = ord(".")
+    chars[:, 1:] = _digits(fraction, decimals)
+    # the last significant digit is the last one that isn't a zero
+    nonzero = chars[:, 1:] != ord("0")
+    significant = np.where(
+        nonzero.any(axis=1), decimals - np.argmax(nonzero[:, ::-1], axis=1), 0
+    )
+    keep = np.empty(chars.shape, dtype=bool)
+    keep[:, 0] = significant > 0
+    keep[:, 1:] = np.arange(decimals) < significant[:, None]
+    return chars, keep
+
+
+def _digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Zero-padded decimal digits of non-negative integers, as ASCII codes."""
+    chars = np.empty((len(values), width), dtype=np.uint8)
+    remaining = values.copy()
+    for j in range(width - 1, -1, -1):
+        remaining, digit = np.divmod(remaining, 10)
+        chars[:, j] = digit
+    chars += ord("0")
+    return chars
+
+
 def get_midpoint_cell_columns(geomodel: dd.DataFrame, dir_out: str):
     """Find cell columns where UWI-index exists in the geomodel.
 
@@ -61,16 +370,17 @@ def get_midpoint_cell_columns(geomodel: dd.DataFrame, dir_out: str):
     idx = pd.IndexSlice
     df_ij = []
     pf = fastparquet.ParquetFile(dir_out)
-    n = 1
-    for dfp in pf.iter_row_groups():
-        df_ij.append(
-            dfp.dropna(thresh=3)
-            .set_index(["i_index", "j_index", "k_index"])
-            .sort_index()
-            .loc[idx[df_midpoints["i_index"], df_midpoints["j_index"], :],]
-        )
-        logging.info(n, "row groups down")
-        n += 1
+    with Progress(
+        "reading cell columns", total=len(pf.row_groups), unit="row groups"
+    ) as progress:
+        for dfp in pf.iter_row_groups():
+            df_ij.append(
+                dfp.dropna(thresh=3)
+                .set_index(["i_index", "j_index", "k_index"])
+                .sort_index()
+                .loc[idx[df_midpoints["i_index"], df_midpoints["j_index"], :],]
+            )
+            progress.update()
     df_ij = pd.concat(df_ij)
     return df_ij
 
@@ -109,7 +419,7 @@ def _limit_column_height(
 
 def _get_header(fin: Path | str) -> list[str]:
     """Extract gslib header."""
-    with Path(fin).open() as f:
+    with open_text(fin) as f:
         header_lines = []
         in_header = False
         for line in f:
@@ -127,7 +437,7 @@ def load_petrel_tops_file(tops_file: Path | str):
     """Load in petrel tops file and return pandas dataframe."""
     colnames = _get_header(tops_file)
     header_rows = 1
-    with Path(tops_file).open() as f:
+    with open_text(tops_file) as f:
         for line in f:
             header_rows += 1
             if line.strip() == "END HEADER":
@@ -161,7 +471,7 @@ def match_well_to_cell(
         distance_upper_bound=distance_upper_bound,
         n_jobs=4,
     )
-    logging.warning((~np.isfinite(dist)).sum(), "wells could not get matches")
+    logging.warning("%d wells could not get matches", (~np.isfinite(dist)).sum())
 
     # make output dataframe
     well_cell = midpoints.loc[:, ["Well", "X", "Y", "Z"]]
@@ -245,22 +555,279 @@ def aggregate_well_properties(
     return well_properties
 
 
-def get_facies_stats(df, zonename="Mainzones", faciesname="Facies", attrs=None):
-    """Get aggregated statistics for different facies and zones."""
+def get_facies_stats(
+    df, zonename="Mainzones", faciesname="Facies", attrs=None, progress=False
+):
+    """Get aggregated statistics for different facies and zones.
+
+    attrs maps columns to aggregations that dask groupby computes exactly. For
+    percentiles over large models, use ``get_facies_quantiles``.
+    Set progress to log the tasks finished and the rate while computing.
+    """
     df_out = df.groupby([zonename, faciesname])[list(attrs.keys())]
-    df_out = df_out.agg(attrs).compute()
+    with dask_progress("computing facies stats", enabled=progress):
+        df_out = df_out.agg(attrs).compute()
     return df_out
 
 
+def get_facies_quantiles(
+    geomodel: dd.DataFrame,
+    zone_name: str = "Mainzones",
+    facies_name: str = "Facies",
+    properties: list[str] | None = None,
+    quantiles: tuple[float, ...] = (0.1, 0.5, 0.9),
+    relative_accuracy: float = sketch.DEFAULT_RELATIVE_ACCURACY,
+    progress: bool = False,
+) -> pd.DataFrame:
+    """Get percentiles and moments of properties by zone and facies in one pass.
+
+    Each partition is summarized into exact counts, sums, means, variances, minima and
+    maxima plus a quantile sketch (see ``petrelpy.sketch``), and the summaries are
+    merged in a tree, so memory use doesn't grow with the size of the model.
+
+    Args:
+        geomodel (dd.DataFrame): geocellular model with zone, facies, properties
+        zone_name (str, optional): column naming the zone. Defaults to "Mainzones".
+        facies_name (str, optional): column naming the facies. Defaults to "Facies".
+        properties (list[str] | None, optional): columns to summarize.
+            Defaults to ["Phi", "Sw"].
+        quantiles (tuple[float, ...], optional): quantiles to estimate.
+            Defaults to (0.1, 0.5, 0.9).
+        relative_accuracy (float, optional): each percentile is within this fraction of
+            the exact value of its rank. Defaults to 0.01.
+        progress (bool, optional): whether to log the tasks finished and the rate.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: one row per zone and facies, with columns for each property of
+            count, sum, mean, var, min and max, then the percentiles named like P10 for
+            quantile 0.1. P10 is the value 10% of the cells fall below, which is P90 in
+            the exceedance convention of reserves reporting.
+
+    """
+    if properties is None:
+        properties = ["Phi", "Sw"]
+    by = [zone_name, facies_name]
+    summary = _reduce_partitions(
+        geomodel.to_delayed(),
+        sketch.summarize,
+        sketch.merge,
+        by,
+        properties,
+        relative_accuracy,
+    )
+    with dask_progress("computing facies quantiles", enabled=progress):
+        (summary,) = dask.compute(summary)
+
+    stats = summary.moments.drop(columns="m2")
+    stats.insert(
+        3,
+        "var",
+        summary.moments["m2"] / (summary.moments["count"] - 1).replace(0, np.nan),
+    )
+    estimates = sketch.quantiles(summary, list(quantiles), relative_accuracy)
+    estimates.columns = [f"P{100 * q:g}" for q in quantiles]
+    table = stats.join(estimates).unstack("property")  # noqa: PD010
+    return (
+        table.swaplevel(axis=1)
+        .reindex(columns=properties, level=0)
+        .sort_index(axis=1, level=0, sort_remaining=False)
+        .rename_axis(columns=["Property", "Statistic"])
+    )
+
+
+def _reduce_partitions(parts: list, func, merge, *args, split_every=8):
+    """Apply func to each delayed partition, then merge the results in a tree."""
+    partials = [dask.delayed(func)(part, *args) for part in parts]
+    while len(partials) > 1:
+        partials = [
+            dask.delayed(merge)(*partials[i : i + split_every])
+            for i in range(0, len(partials), split_every)
+        ]
+    return partials[0]
+
+
+Bins = Union[int, Sequence[float], Mapping[str, Union[int, Sequence[float]]]]
+
+
+class HistogramCubes(NamedTuple):
+    """Dense histograms by zone and facies.
+
+    ``cubes`` maps each property to an array of summed weights with shape
+    (len(zones), len(facies), number of bins), whose bin edges are in ``edges``.
+    """
+
+    zones: np.ndarray
+    facies: np.ndarray
+    edges: dict[str, np.ndarray]
+    cubes: dict[str, np.ndarray]
+
+
+def _needs_max(bins: Bins, properties: list[str]) -> list[str]:
+    """Properties whose bins are a count, so their edges depend on the maximum."""
+    if isinstance(bins, Mapping):
+        return [p for p in properties if isinstance(bins.get(p, 100), int)]
+    return list(properties) if isinstance(bins, int) else []
+
+
+def _bin_edges(
+    bins: Bins, properties: list[str], prop_max: pd.Series | None = None
+) -> dict[str, np.ndarray]:
+    edges = {}
+    for p in properties:
+        spec = bins.get(p, 100) if isinstance(bins, Mapping) else bins
+        if isinstance(spec, int):
+            edges[p] = np.linspace(0.0, prop_max[p], spec + 1)
+        else:
+            edges[p] = np.asarray(spec, dtype=float)
+            if (
+                edges[p].ndim != 1
+                or len(edges[p]) < 2
+                or np.any(np.diff(edges[p]) <= 0)
+            ):
+                msg = f"bin edges for {p} must be increasing, with at least two edges"
+                raise ValueError(msg)
+    return edges
+
+
+def _partition_cubes(
+    part: pd.DataFrame,
+    by: list[str],
+    properties: list[str],
+    weight_name: str | None,
+    edges: dict[str, np.ndarray],
+) -> HistogramCubes:
+    """Histogram each property of a partition by zone and facies with np.bincount."""
+    zone_codes, zones = pd.factorize(part[by[0]], sort=True)
+    facies_codes, facies = pd.factorize(part[by[1]], sort=True)
+    valid = (zone_codes >= 0) & (facies_codes >= 0)
+    weights = None
+    if weight_name is not None:
+        weights = part[weight_name].to_numpy(dtype=float, na_value=np.nan)
+        valid &= ~np.isnan(weights)
+    cubes = {}
+    for p in properties:
+        values = part[p].to_numpy(dtype=float, na_value=np.nan)
+        n_bins = len(edges[p]) - 1
+        # bins are closed on the left, and the last one on the right too
+        bins = np.searchsorted(edges[p], values, side="right") - 1
+        bins[values == edges[p][-1]] = n_bins - 1
+        keep = valid & (bins >= 0) & (bins < n_bins)  # NaN sorts past the last edge
+        flat = (zone_codes[keep] * len(facies) + facies_codes[keep]) * n_bins
+        cubes[p] = np.bincount(
+            flat + bins[keep],
+            weights=None if weights is None else weights[keep],
+            minlength=len(zones) * len(facies) * n_bins,
+        ).astype(float)
+        cubes[p] = cubes[p].reshape(len(zones), len(facies), n_bins)
+    return HistogramCubes(zones.to_numpy(), facies.to_numpy(), edges, cubes)
+
+
+def _merge_cubes(*partials: HistogramCubes) -> HistogramCubes:
+    zones = pd.Index(partials[0].zones)
+    facies = pd.Index(partials[0].facies)
+    for partial in partials[1:]:
+        zones = zones.union(partial.zones)
+        facies = facies.union(partial.facies)
+    edges = partials[0].edges
+    cubes = {
+        p: np.zeros((len(zones), len(facies), len(e) - 1)) for p, e in edges.items()
+    }
+    for partial in partials:
+        rows = np.ix_(
+            zones.get_indexer(partial.zones), facies.get_indexer(partial.facies)
+        )
+        for p, cube in partial.cubes.items():
+            cubes[p][rows] += cube
+    return HistogramCubes(zones.to_numpy(), facies.to_numpy(), edges, cubes)
+
+
+def _histogram_tables(histograms: HistogramCubes) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Lay out histogram cubes as one column per zone, facies and property."""
+    tables = []
+    for p, cube in histograms.cubes.items():
+        columns = pd.MultiIndex.from_product(
+            [histograms.zones, histograms.facies, [p]],
+            names=["Zone", "Facies", "Property"],
+        )
+        flat = cube.reshape(-1, cube.shape[-1]).T
+        tables.append(pd.DataFrame(flat, columns=columns))
+    ooip_splits = pd.concat(tables, axis=1).sort_index(axis=1)
+    # provide translation from index to x values (left bin edges) for histogram
+    index_conversion = pd.DataFrame(
+        {p: pd.Series(e[:-1]) for p, e in histograms.edges.items()},
+        index=ooip_splits.index,
+    )
+    return ooip_splits, index_conversion
+
+
+def get_facies_histogram_cubes(
+    geomodel: dd.DataFrame,
+    zone_name: str = "Mainzones",
+    facies_name: str = "Facies",
+    properties: list[str] | None = None,
+    weight_name: str | None = "OOIP",
+    bins: Bins = 100,
+    progress: bool = False,
+) -> HistogramCubes:
+    """Calculate weighted histograms of properties by zone and facies as dense arrays.
+
+    Args:
+        geomodel (dd.DataFrame): geocellular model with zone, facies, properties
+        zone_name (str, optional): column naming the zone. Defaults to "Mainzones".
+        facies_name (str, optional): column naming the facies. Defaults to "Facies".
+        properties (list[str] | None, optional): columns to compute histograms over.
+            Defaults to ["Phi", "Sw"].
+        weight_name (str | None, optional): column to sum in each bin, such as OOIP or
+            Bulkvolume. Defaults to "OOIP". None counts cells.
+        bins (int | Sequence[float] | Mapping, optional): a number of equal bins from 0
+            to each property's maximum, or increasing bin edges, or a mapping from
+            properties to either (100 bins for those left out). The maximum value falls
+            in the last bin. When every property has edges, the geomodel is read once;
+            otherwise the maxima take an extra pass. Defaults to 100.
+        progress (bool, optional): whether to log the tasks finished and the rate.
+            Defaults to False.
+
+    Returns:
+        HistogramCubes: zone and facies labels, bin edges and one array per property
+
+    """
+    if properties is None:
+        properties = ["Phi", "Sw"]
+    prop_max = None
+    needs_max = _needs_max(bins, properties)
+    if needs_max:
+        with dask_progress("computing property maxima", enabled=progress):
+            prop_max = geomodel[needs_max].max().compute()
+    edges = _bin_edges(bins, properties, prop_max)
+    histograms = _reduce_partitions(
+        geomodel.to_delayed(),
+        _partition_cubes,
+        _merge_cubes,
+        [zone_name, facies_name],
+        properties,
+        weight_name,
+        edges,
+    )
+    with dask_progress("computing facies histograms", enabled=progress):
+        return histograms.compute()
+
+
 def get_facies_histograms(
     geomodel: dd.DataFrame,
     zone_name: str = "Mainzones",
     facies_name: str = "Facies",
     properties: list[str] | None = None,
-    ooip_name: str = "OOIP",
+    ooip_name: str | None = "OOIP",
+    progress: bool = False,
+    bins: Bins = 100,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """Calculate histogram of original oil in place for geomodel by zone, facies, properties.
 
+    By default bins are percentages of each property's maximum. For large models,
+    ``get_facies_histogram_cubes`` returns the same histograms as arrays, without
+    building the wide tables.
+
     Args:
         geomodel (dd.DataFrame): geocellular model with zone, facies, properties
         zone_name (str, optional): column naming the zone. Defaults to "Mainzones".
@@ -268,44 +835,140 @@ def get_facies_histograms(
         properties (list[str], optional): columns holding properties to compute histogram over.
             Defaults to ["Phi", "Sw"].
 
-        ooip_name (str, optional): Property to calculate the histogram over. Defaults to "OOIP".
+        ooip_name (str | None, optional): column summed in each bin, e.g. OOIP or
+            Bulkvolume. Defaults to "OOIP". None counts cells.
+        progress (bool, optional): whether to log the tasks finished and the rate.
+            Defaults to False.
+        bins (int | Sequence[float] | Mapping, optional): number of bins or bin edges,
+            see ``get_facies_histogram_cubes``. Defaults to 100.
 
     Returns:
-        tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: ooip_splits, index_conversion, and
-            max property values
+        tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: ooip_splits, index_conversion
+            (left bin edges), and max property values
 
     """
     if properties is None:
         properties = ["Phi", "Sw"]
-    zones = geomodel[zone_name].unique().compute()
-    facies = geomodel[facies_name].unique().compute()
+    summary = summarize_facies(
+        {"geomodel": geomodel},
+        zone_name,
+        facies_name,
+        properties,
+        ooip_name,
+        attrs={},
+        progress=progress,
+        bins=bins,
+    )["geomodel"]
+    return summary.ooip_splits, summary.index_conversion, summary.prop_max
+
+
+class FaciesSummary(NamedTuple):
+    """Statistics, OOIP histograms and property maxima of one geomodel."""
+
+    stats: pd.DataFrame
+    ooip_splits: pd.DataFrame
+    index_conversion: pd.DataFrame
+    prop_max: pd.Series
+    histograms: HistogramCubes
+
+
+def summarize_facies(
+    geomodels: Mapping[str, dd.DataFrame],
+    zone_name: str = "Mainzones",
+    facies_name: str = "Facies",
+    properties: list[str] | None = None,
+    ooip_name: str | None = "OOIP",
+    attrs: dict | None = None,
+    progress: bool = False,
+    bins: Bins = 100,
+) -> dict[str, FaciesSummary]:
+    """Get facies statistics, OOIP histograms and property maxima of several geomodels.
+
+    All geomodels are computed together. With bin edges given for every property,
+    that takes one pass over the data. Otherwise it takes two: the first gets the
+    statistics and the property maxima, the second the histograms, whose bins depend
+    on the maxima. With a ``dask.distributed`` client active, e.g. on a
+    ``LocalCluster``, the realizations of an uncertainty study run concurrently on
+    its workers.
 
-    ooip_splits = pd.DataFrame(
-        columns=pd.MultiIndex.from_product(
-            [zones.to_numpy(), facies.to_numpy(), properties],
-            names=["Zone", "Facies", "Property"],
+    Args:
+        geomodels (Mapping[str, dd.DataFrame]): geocellular models by name, for example
+            one per realization, each with zone, facies, properties and OOIP columns
+        zone_name (str, optional): column naming the zone. Defaults to "Mainzones".
+        facies_name (str, optional): column naming the facies. Defaults to "Facies".
+        properties (list[str] | None, optional): columns to compute histograms over.
+            Defaults to ["Phi", "Sw"].
+        ooip_name (str | None, optional): column summed in the histograms, e.g. OOIP or
+            Bulkvolume. Defaults to "OOIP". None counts cells.
+        attrs (dict | None, optional): aggregations for the statistics, as in
+            ``get_facies_stats``. Defaults to None, which sums OOIP and averages the
+            properties. An empty dict skips the statistics.
+        progress (bool, optional): whether to log the tasks finished and the rate.
+            Only works with the local dask schedulers. Defaults to False.
+        bins (int | Sequence[float] | Mapping, optional): number of bins or bin edges,
+            see ``get_facies_histogram_cubes``. Defaults to 100.
+
+    Returns:
+        dict[str, FaciesSummary]: summaries by geomodel name. The histogram tables are
+            laid out as returned by ``get_facies_histograms``.
+
+    """
+    if properties is None:
+        properties = ["Phi", "Sw"]
+    if attrs is None:
+        attrs = dict.fromkeys(properties, "mean")
+        if ooip_name is not None:
+            attrs = {ooip_name: "sum", **attrs}
+    by = [zone_name, facies_name]
+    fixed_edges = not _needs_max(bins, properties)
+    edges = _bin_edges(bins, properties) if fixed_edges else None
+
+    def histograms(parts: list, edges: dict[str, np.ndarray]):
+        return _reduce_partitions(
+            parts, _partition_cubes, _merge_cubes, by, properties, ooip_name, edges
         )
-    ).sort_index(level="columns")
-
-    # percentage of max for each property done over zone, facies
-    prop_max = geomodel[properties].max().compute()
-    for z in zones:
-        for face in facies:
-            df_slice = geomodel[
-                (geomodel[zone_name] == z) & (geomodel[facies_name] == face)
-            ]
-            for p in properties:
-                df_slice[p + "_"] = (
-                    (df_slice[p] // (prop_max[p] / 100.0)).dropna().astype(int)
-                )
-                split = df_slice.groupby(p + "_")[ooip_name].sum().compute()
-                ooip_splits.loc[:, (z, face, p)] = split
-                logging.info(f"finished zone {z}, facies {face}, property {p}")
-
-    ooip_splits = ooip_splits.sort_index()
-    # provide translation from index to x values for histogram
-    index_conversion = pd.DataFrame(columns=properties, index=ooip_splits.index)
-    for p in properties:
-        index_conversion[p] = prop_max[p] * index_conversion.index / 100.0
 
-    return ooip_splits, index_conversion, prop_max
+    first_pass = {}
+    for name, geomodel in geomodels.items():
+        # build every result from the same partitions, so each is read once per pass
+        parts = geomodel.to_delayed()
+        shared = dd.from_delayed(parts, meta=geomodel._meta, verify_meta=False)
+        stats = None
+        if attrs:
+            stats = dask.delayed(pd.concat)(
+                shared.groupby(by)[list(attrs)].agg(attrs).to_delayed()
+            )
+        first_pass[name] = (
+            stats,
+            shared[properties].max().to_delayed()[0],
+            histograms(parts, edges) if fixed_edges else None,
+        )
+    with dask_progress("computing facies stats and maxima", enabled=progress):
+        (first_pass,) = dask.compute(first_pass)
+
+    if not fixed_edges:
+        second_pass = {
+            name: histograms(
+                geomodel.to_delayed(),
+                _bin_edges(bins, properties, first_pass[name][1]),
+            )
+            for name, geomodel in geomodels.items()
+        }
+        with dask_progress("computing facies histograms", enabled=progress):
+            (second_pass,) = dask.compute(second_pass)
+        first_pass = {
+            name: (stats, prop_max, second_pass[name])
+            for name, (stats, prop_max, _) in first_pass.items()
+        }
+
+    summaries = {}
+    for name, (stats, prop_max, cubes) in first_pass.items():
+        ooip_splits, index_conversion = _histogram_tables(cubes)
+        summaries[name] = FaciesSummary(
+            stats.sort_index() if stats is not None else pd.DataFrame(),
+            ooip_splits,
+            index_conversion,
+            prop_max,
+            cubes,
+        )
+    return summaries
@@ -2,10 +2,54 @@
 
 from __future__ import annotations
 
+import fnmatch
+import hashlib
+import io
+import json
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
+from typing import IO, Any
+from zipfile import ZipFile
 
+import numpy as np
 import pandas as pd
 
+from petrelpy.compression import compression_of, open_text, uncompressed_suffix
+from petrelpy.progress import Progress
+
+PETREL_DATE_FORMAT = "%m.%d.%Y"
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M:%S",
+    PETREL_DATE_FORMAT,
+    "%Y%m%d",
+    "%d-%b-%Y",
+    "%b %d, %Y",
+)
+EV_COLUMNS = [
+    "API",
+    "Date",
+    "Event",
+    "start_depth",
+    "stop_depth",
+    "diameter",
+    "skin",
+]
+VOL_COLUMN_NAMES = {"OIL": "Liquid", "WATER": "Water", "GAS": "Gas"}
+# workbooks openpyxl can stream, other excel formats go through pd.read_excel
+OPENPYXL_SUFFIXES = {".xlsx", ".xlsm"}
+_READ_ALL = 1_000_000
+
+logger = logging.getLogger(__name__)
+
 
 def write_header(df, fname, fill_na=-999):
     """Write header information to a Petrel-readable header file.
@@ -21,9 +65,9 @@ VERSION 1
 BEGIN HEADER
 """ + "\n".join(df.columns) + "\nEND HEADER\n"
     body = df.fillna(fill_na).to_csv(
-        header=False, index=False, quoting=2, sep=" ", line_terminator="\n"
+        header=False, index=False, quoting=2, sep=" ", lineterminator="\n"
     )
-    with Path(fname).open("w") as f:
+    with open_text(fname, "w") as f:
         f.write(header_head + body)
 
 
@@ -32,32 +76,94 @@ def read_header(fname: str) -> pd.DataFrame:
     return read_petrel_tops(fname)
 
 
-def collect_perfs(df_perf: pd.DataFrame) -> pd.DataFrame:
-    """Group perforations by well.
+def collect_perfs(
+    df_perf: pd.DataFrame, date_format: str | None = None
+) -> pd.DataFrame:
+    """Gather perforations by well, ready for grouping.
+
+    The input frame is left untouched.
 
     Args:
         df_perf (pd.DataFrame):
-            Well completion data. Expected columns include "Date Completion",
-            "Date First Report", "Depth Top", "Depth Base" and "UWI"
+            Well completion data, indexed by well. Expected columns include
+            "Date Completion", "Date First Report", "Depth Top" and "Depth Base"
+        date_format (str | None, optional): strptime format of the date columns.
+            Defaults to None, which detects the format(s) in use.
 
     Returns:
-        pd.DataFrame: Perforations grouped by well
+        pd.DataFrame: Perforations sorted by well with "Depth Top", "Depth Base" and
+            Petrel-formatted "Date" columns, so ``.groupby(level=0, sort=False)`` is cheap
 
     """
-    # gather dates
-    df_perf["Date"] = df_perf["Date Completion"]
-    df_perf.loc[df_perf.Date.isna(), "Date"] = df_perf["Date First Report"]
-    df_perf["Date"] = pd.to_datetime(df_perf["Date"])
-
+    dates = df_perf["Date Completion"].fillna(df_perf["Date First Report"])
     out_df = (
-        df_perf[["Depth Top", "Depth Base", "Date"]]
+        df_perf[["Depth Top", "Depth Base"]]
+        .assign(Date=parse_dates(dates, date_format))
         .dropna()
-        .assign(Date=lambda x: x.Date.dt.strftime("%m.%d.%Y"))
-        .groupby(level=[0])
+        .sort_index(kind="stable")
     )
+    out_df["Date"] = format_petrel_dates(out_df["Date"])
     return out_df
 
 
+def parse_dates(dates: pd.Series, date_format: str | None = None) -> pd.Series:
+    """Convert dates to datetime64, parsing each distinct date string once.
+
+    Args:
+        dates (pd.Series): dates as strings, datetimes, or a mix of the two
+        date_format (str | None, optional): strptime format for the dates. Defaults to None,
+            which tries each of ``DATE_FORMATS`` in turn before falling back to
+            per-element inference for whatever is left.
+
+    Returns:
+        pd.Series: datetime64 dates with the index of ``dates``
+
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    codes, uniques = pd.factorize(dates)
+    parsed = _parse_unique_dates(pd.Series(uniques, dtype=object), date_format)
+    # missing dates have code -1, which picks up the trailing NaT
+    values = np.append(parsed.to_numpy(), np.datetime64("NaT"))[codes]
+    return pd.Series(values, index=dates.index, name=dates.name)
+
+
+def format_petrel_dates(dates: pd.Series, date_format: str | None = None) -> pd.Series:
+    """Write dates as Petrel event-file date strings (``MM.DD.YYYY``).
+
+    Args:
+        dates (pd.Series): dates as strings or datetimes
+        date_format (str | None, optional): strptime format for string dates,
+            passed to ``parse_dates``. Defaults to None.
+
+    Returns:
+        pd.Series: date strings, with missing dates left as NaN
+
+    """
+    codes, uniques = pd.factorize(parse_dates(dates, date_format))
+    formatted = pd.DatetimeIndex(uniques).strftime(PETREL_DATE_FORMAT).to_numpy()
+    values = np.append(formatted.astype(object), np.nan)[codes]
+    return pd.Series(values, index=dates.index, name=dates.name, dtype=object)
+
+
+def _parse_unique_dates(uniques: pd.Series, date_format: str | None) -> pd.Series:
+    """Parse distinct date values with explicit formats, inferring only as a last resort."""
+    if date_format is not None:
+        return pd.to_datetime(uniques, format=date_format)
+    strings = uniques.astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype="datetime64[ns]")
+    todo = pd.Series(True, index=uniques.index)
+    for fmt in DATE_FORMATS:
+        attempt = pd.to_datetime(strings[todo], format=fmt, errors="coerce")
+        matched = attempt.notna()
+        parsed[attempt.index[matched]] = attempt[matched]
+        todo[attempt.index[matched]] = False
+        if not todo.any():
+            return parsed
+    parsed[todo] = pd.to_datetime(strings[todo], format="mixed")
+    return parsed
+
+
 # def export_perfs(out_df: pd.DataFrame, out_fname: str, header=None):
 #     if not header:
 #         header = """UNITS FIELD\n"""
@@ -72,7 +178,10 @@ def collect_perfs(df_perf: pd.DataFrame) -> pd.DataFrame:
 
 
 def export_perfs_ev(
-    perfs: pd.DataFrame, output: Path, header: str = "UNITS FIELD\n"
+    perfs: pd.DataFrame,
+    output: Path,
+    header: str = "UNITS FIELD\n",
+    progress: bool = False,
 ) -> None:
     """Export perforations in ev (event file) format.
 
@@ -80,27 +189,35 @@ def export_perfs_ev(
         perfs (pd.DataFrame): contains perfs in columns for API,start_depth,stop_depth
         output (Path): prn file to write to
         header (str): first line for file, probably explaining units
+        progress (bool): whether to log the wells written and the rate
 
     """
     wells = perfs.groupby(level=0)  # group by well
-    with Path(output).open("w") as f:
+    with (
+        open_text(output, "w") as f,
+        Progress(
+            f"writing {output}", total=wells.ngroups, unit="wells", enabled=progress
+        ) as tracker,
+    ):
         f.write(header)
-        for api, well in wells:
-            f.write(f"\nWELLNAME {api}\n")
-            for _, vals in well.iterrows():
-                f.write(
-                    "{} perforation {} {} 1 0\n".format(
-                        *vals[["Date", "start_depth", "stop_depth"]]
-                    )
-                )
+        write_blocks(f, wells, _ev_block, tracker)
+
+
+def _ev_block(api, well: pd.DataFrame) -> str:
+    """Format one well's WELLNAME block for a perforation event file."""
+    rows = zip(well["Date"], well["start_depth"], well["stop_depth"])
+    return f"\nWELLNAME {api}\n" + "".join(
+        f"{date} perforation {start} {stop} 1 0\n" for date, start, stop in rows
+    )
 
 
-def export_perfs_prn(perfs: pd.DataFrame, output: Path) -> None:
+def export_perfs_prn(perfs: pd.DataFrame, output: Path, progress: bool = False) -> None:
     """Export perforations in prn (fixed) format.
 
     Args:
         perfs (pd.DataFrame): contains perfs in columns for API,start_depth,stop_depth
         output (Path): prn file to write to
+        progress (bool): whether to log the wells written and the rate
 
     """
     prn_frame = (
@@ -111,31 +228,101 @@ def export_perfs_prn(perfs: pd.DataFrame, output: Path) -> None:
         .assign(Perf=1)
         .sort_values("UWI")
     )
-    with output.open("w") as f:
+    wells = prn_frame.groupby("UWI")
+    with (
+        open_text(output, "w") as f,
+        Progress(
+            f"writing {output}", total=wells.ngroups, unit="wells", enabled=progress
+        ) as tracker,
+    ):
         f.write("UWI             Top    Bottom  Perf\n")
-        for uwi, w in prn_frame.groupby("UWI"):
-            old_bottom_location = 0
-            for _, x in w.iterrows():
-                top_location, bottom_location = x[["Top", "Bottom"]]
-                if top_location <= old_bottom_location:
-                    top_location = old_bottom_location + 1
-                    if bottom_location < top_location:
-                        bottom_location = top_location
-                old_bottom_location = bottom_location
-                f.write(f"{uwi:<14}  {top_location:<6.0f} {bottom_location:<6.0f}  1\n")
+        write_blocks(f, wells, _prn_block, tracker)
+
+
+def _prn_block(uwi, well: pd.DataFrame) -> str:
+    """Format one well's perforations for a prn file, moving overlapping ones down."""
+    lines = []
+    old_bottom_location = 0
+    for top, bottom in zip(well["Top"], well["Bottom"]):
+        top_location, bottom_location = top, bottom
+        if top_location <= old_bottom_location:
+            top_location = old_bottom_location + 1
+            if bottom_location < top_location:
+                bottom_location = top_location
+        old_bottom_location = bottom_location
+        lines.append(f"{uwi:<14}  {top_location:<6.0f} {bottom_location:<6.0f}  1\n")
+    return "".join(lines)
+
+
+def read_perfs_ev(
+    fname: str | Path,
+    chunksize: int | None = None,
+    date_format: str = PETREL_DATE_FORMAT,
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Read an ev (event file), such as one written by ``export_perfs_ev``.
+
+    Args:
+        fname (str | Path): event file to read
+        chunksize (int | None, optional): number of events per DataFrame. Defaults to None,
+            which reads the whole file into one DataFrame.
+        date_format (str, optional): strptime format of the event dates.
+            Defaults to ``PETREL_DATE_FORMAT``.
+
+    Returns:
+        pd.DataFrame | Iterator[pd.DataFrame]: events with columns API (categorical),
+            Date (datetime64), Event, start_depth, stop_depth, diameter and skin (float32).
+            If chunksize is given, an iterator over DataFrames of at most chunksize events.
+
+    """
+    chunks = _iter_event_chunks(fname, chunksize or _READ_ALL, date_format)
+    return chunks if chunksize else _concat_chunks(chunks, EV_COLUMNS)
+
+
+def _iter_event_chunks(
+    fname: str | Path, chunksize: int, date_format: str
+) -> Iterator[pd.DataFrame]:
+    wells: list[str] = []
+    rows: list[str] = []
+    wellname = None
+    with open_text(fname) as f:
+        for line in f:
+            if line.startswith("WELLNAME"):
+                wellname = line[len("WELLNAME") :].strip().strip("'\"")
+            elif wellname is None or not line.strip():
+                continue  # file header or blank line
+            else:
+                wells.append(wellname)
+                rows.append(line)
+                if len(rows) >= chunksize:
+                    yield _event_frame(wells, rows, date_format)
+                    wells, rows = [], []
+    if rows:
+        yield _event_frame(wells, rows, date_format)
+
+
+def _event_frame(wells: list[str], rows: list[str], date_format: str) -> pd.DataFrame:
+    events = pd.read_csv(
+        io.StringIO("".join(rows)),
+        sep="\\s+",
+        header=None,
+        names=EV_COLUMNS[1:],
+        dtype={"Date": str, "Event": str},
+    )
+    events["Date"] = parse_dates(events["Date"], date_format)
+    events.insert(0, "API", pd.Categorical(wells))
+    return events.astype(dict.fromkeys(EV_COLUMNS[3:], "float32"))
 
 
 def read_production(infile: str | tuple[str], yearly=False):
     """Get raw data from infile (even if infile is several files)."""
     # read in data and group by well
-    if yearly:
-        sheetname = "Annual Production"
-        cols = ["Annual Liquid", "Annual Water", "Annual Gas"]
-    else:
-        sheetname = "Monthly Production"
-        cols = ["Liquid", "Water", "Gas"]
+    sheetname, cols = _production_layout(yearly)
 
     def readfile(fname):
+        if _is_excel(fname):
+            return pd.read_excel(
+                fname, sheet_name=sheetname, converters={"Year": str, "API": str}
+            )
         try:
             raw_df = pd.read_csv(fname, converters={"Year": str, "API": str})
         except ValueError:
@@ -150,16 +337,104 @@ def read_production(infile: str | tuple[str], yearly=False):
     else:
         raw_df = readfile(infile)
 
+    wells = _sum_production(raw_df, yearly, cols).reset_index()
+    return wells
+
+
+def read_production_zip(
+    archive: str | Path,
+    yearly: bool = False,
+    pattern: str | None = None,
+    max_workers: int | None = None,
+    chunksize: int = 500_000,
+) -> pd.DataFrame:
+    """Read and aggregate production from the members of a zip archive.
+
+    Members are streamed straight out of the archive (nothing is extracted to disk), several
+    at a time, and csv members are summed chunk by chunk so that only per-well, per-date
+    totals are held in memory.
+
+    Args:
+        archive (str | Path): zip file with IHS production csv or excel spreadsheets
+        yearly (bool, optional): whether the spreadsheets hold annual production.
+            Defaults to False.
+        pattern (str | None, optional): glob pattern for the member names to read.
+            Defaults to None, which matches "*Monthly Production.*" or
+            "*Yearly Production.*".
+        max_workers (int | None, optional): number of members to decompress and parse at
+            once. Defaults to None, which lets ``ThreadPoolExecutor`` decide.
+        chunksize (int, optional): rows per csv chunk. Defaults to 500_000.
+
+    Returns:
+        pd.DataFrame: production with columns API,Date and the summed volumes, like
+            ``read_production``
+
+    """
+    sheetname, cols = _production_layout(yearly)
+    if pattern is None:
+        pattern = f"*{'Yearly' if yearly else 'Monthly'} Production.*"
+    with ZipFile(archive) as zf:
+        members = [name for name in zf.namelist() if fnmatch.fnmatch(name, pattern)]
+    if not members:
+        msg = f"No members of {archive} match {pattern}"
+        raise FileNotFoundError(msg)
+
+    def read_member(member: str) -> pd.DataFrame:
+        # each thread opens the archive itself, as ZipFile handles are not thread-safe
+        with ZipFile(archive) as zf, zf.open(member) as f:
+            if _is_excel(member):
+                raw_df = pd.read_excel(
+                    f, sheet_name=sheetname, converters={"Year": str, "API": str}
+                )
+                return _sum_production(raw_df, yearly, cols)
+            chunks = pd.read_csv(
+                f, converters={"Year": str, "API": str}, chunksize=chunksize
+            )
+            return _merge_production(
+                [_sum_production(chunk, yearly, cols) for chunk in chunks]
+            )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        partial_sums = list(pool.map(read_member, members))
+    return _merge_production(partial_sums).reset_index()
+
+
+def _production_layout(yearly: bool) -> tuple[str, list[str]]:
+    """Get the excel sheet name and volume columns for IHS production spreadsheets."""
     if yearly:
-        raw_df["Date"] = pd.to_datetime(raw_df.Year, format="%Y")
+        return "Annual Production", ["Annual Liquid", "Annual Water", "Annual Gas"]
+    return "Monthly Production", ["Liquid", "Water", "Gas"]
+
+
+def _sum_production(
+    raw_df: pd.DataFrame, yearly: bool, cols: list[str]
+) -> pd.DataFrame:
+    """Sum raw IHS production rows by API and date."""
+    if yearly:
+        dates = pd.to_datetime(raw_df.Year, format="%Y")
     else:
-        raw_df["Date"] = pd.to_datetime(raw_df.Month + raw_df.Year, format="%b%Y")
+        dates = pd.to_datetime(raw_df.Month + raw_df.Year, format="%b%Y")
+    return raw_df.assign(Date=dates).groupby(["API", "Date"])[cols].sum()
 
-    wells = raw_df.groupby(["API", "Date"]).agg(dict.fromkeys(cols, sum)).reset_index()
-    return wells
+
+def _merge_production(partial_sums: list[pd.DataFrame]) -> pd.DataFrame:
+    """Combine production summed over separate pieces of the input."""
+    return pd.concat(partial_sums).groupby(level=["API", "Date"]).sum()
+
+
+def _is_excel(fname) -> bool:
+    """Check whether a file name (or named file object) looks like an excel workbook."""
+    name = fname if isinstance(fname, (str, Path)) else getattr(fname, "name", "")
+    return ".xls" in Path(str(name)).suffix
 
 
-def export_vol(wells: pd.DataFrame, outfile: str | Path, header: str | None = None):
+def export_vol(
+    wells: pd.DataFrame,
+    outfile: str | Path,
+    header: str | None = None,
+    incremental: bool = False,
+    progress: bool = False,
+):
     """Export production volumes to Petrel-readable .vol format file.
 
     Args:
@@ -167,6 +442,11 @@ def export_vol(wells: pd.DataFrame, outfile: str | Path, header: str | None = No
             Expected columns are API,Date,Liquid,Water,Gas.
         outfile (str | Path): vol file to save to
         header (str | None, optional): Units and column names. Defaults to None.
+        incremental (bool, optional): reuse the *NAME blocks of wells whose rows have not
+            changed since the last incremental export to outfile, only formatting new or
+            changed wells. Keeps a digest sidecar next to outfile. Defaults to False.
+        progress (bool, optional): whether to log the wells written and the rate.
+            Defaults to False.
 
     """
     if any(wells.columns.to_series().str.startswith("Annual")):
@@ -182,20 +462,107 @@ def export_vol(wells: pd.DataFrame, outfile: str | Path, header: str | None = No
             "*DAY *MONTH *YEAR *OIL *WATER *GAS\n"
         )
 
-    # export data
-    with Path(outfile).open("w") as f:
+    tracker = Progress(
+        f"writing {outfile}",
+        total=wells["API"].nunique(),
+        unit="wells",
+        enabled=progress,
+    )
+    if incremental:
+        if compression_of(outfile):
+            msg = f"incremental export copies blocks of a plain vol file, not {outfile}"
+            raise ValueError(msg)
+        with tracker:
+            _export_vol_incremental(wells, Path(outfile), header, tracker)
+        return
+
+    # a full export leaves the sidecar of an earlier incremental one describing the
+    # wrong file
+    _vol_sidecar(Path(outfile)).unlink(missing_ok=True)
+    with open_text(outfile, "w") as f, tracker:
         f.write(header)
-        for uwi, production in wells.groupby("API"):
-            f.write(f"\n*NAME {uwi}\n")
-            for _, vals in production.sort_values("Date").fillna(0).iterrows():
-                f.write(
-                    f"01 {vals.Date.month:02} {vals.Date.year}   "
-                    f"{vals.Liquid:<6.2f} {vals.Water:<6.2f} {vals.Gas:<6.2f}\n"
-                )
+        write_blocks(f, wells.groupby("API"), _vol_block, tracker)
     return
 
 
-def export_injection_vol(wells, outfile, header=None):
+def _vol_block(uwi, production: pd.DataFrame) -> str:
+    """Format one well's *NAME block for a production vol file."""
+    production = production.sort_values("Date").fillna(0)
+    dates = production["Date"]
+    rows = zip(
+        dates.dt.month,
+        dates.dt.year,
+        production["Liquid"],
+        production["Water"],
+        production["Gas"],
+    )
+    return f"\n*NAME {uwi}\n" + "".join(
+        f"01 {month:02} {year}   {liquid:<6.2f} {water:<6.2f} {gas:<6.2f}\n"
+        for month, year, liquid, water, gas in rows
+    )
+
+
+def _export_vol_incremental(
+    wells: pd.DataFrame, outfile: Path, header: str, tracker: Progress
+) -> None:
+    """Write a vol file, copying unchanged well blocks from the previous export.
+
+    The sidecar ``<outfile>.digest.json`` records, for each well, a digest of the rows it
+    was written from and the byte range of its block in outfile. It also records the
+    size and modification time of outfile, and is ignored if outfile has changed since.
+    """
+    sidecar = _vol_sidecar(outfile)
+    previous = {}
+    if sidecar.exists() and outfile.exists():
+        with sidecar.open() as f:
+            state = json.load(f)
+        if state.get("header") == header and state.get("file") == _file_stamp(outfile):
+            previous = state["wells"]
+
+    wells = wells.sort_values(["API", "Date"], kind="stable")
+    row_hashes = pd.util.hash_pandas_object(
+        wells[["Date", "Liquid", "Water", "Gas"]], index=False
+    ).to_numpy()
+    blocks = {}
+    tmp_file = outfile.with_name(outfile.name + ".tmp")
+    with tmp_file.open("wb") as f_out, ExitStack() as stack:
+        f_old = stack.enter_context(outfile.open("rb")) if previous else None
+        f_out.write(header.encode())
+        for uwi, rows in sorted(wells.groupby("API").indices.items()):
+            digest = hashlib.blake2b(
+                row_hashes[rows].tobytes(), digest_size=16
+            ).hexdigest()
+            old_digest, old_offset, old_length = previous.get(str(uwi), (None, 0, 0))
+            block = None
+            if digest == old_digest:
+                f_old.seek(old_offset)
+                block = f_old.read(old_length)
+                if not block.startswith(f"\n*NAME {uwi}\n".encode()):
+                    block = None
+            if block is None:
+                block = _vol_block(uwi, wells.iloc[rows]).encode()
+            blocks[str(uwi)] = (digest, f_out.tell(), len(block))
+            f_out.write(block)
+            tracker.update()
+    tmp_file.replace(outfile)
+    tmp_sidecar = sidecar.with_name(sidecar.name + ".tmp")
+    with tmp_sidecar.open("w") as f:
+        json.dump({"header": header, "file": _file_stamp(outfile), "wells": blocks}, f)
+    tmp_sidecar.replace(sidecar)
+
+
+def _vol_sidecar(outfile: Path) -> Path:
+    """Get the digest sidecar of an incrementally exported vol file."""
+    return outfile.with_name(outfile.name + ".digest.json")
+
+
+def _file_stamp(fname: Path) -> list[int]:
+    """Get the size and modification time of a file, to tell if it was rewritten."""
+    stat = fname.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def export_injection_vol(wells, outfile, header=None, progress=False):
     """Export injection volumes to Petrel-readable .vol format file.
 
     Args:
@@ -203,6 +570,8 @@ def export_injection_vol(wells, outfile, header=None):
             Expected columns are API,Date,Water,Gas.
         outfile (str | Path): vol file to save to
         header (str | None, optional): Units and column names. Defaults to None.
+        progress (bool, optional): whether to log the wells written and the rate.
+            Defaults to False.
 
     """
     if not header:
@@ -211,18 +580,151 @@ def export_injection_vol(wells, outfile, header=None):
 *MONTHLY
 *DAY *MONTH *YEAR *WATER *GAS
 """
-    with Path(outfile).open("w") as f:
+    groups = wells.groupby("API")
+    with (
+        open_text(outfile, "w") as f,
+        Progress(
+            f"writing {outfile}", total=groups.ngroups, unit="wells", enabled=progress
+        ) as tracker,
+    ):
         f.write(header)
-        for uwi, production in wells.groupby("API"):
-            f.write(f"\n*NAME {uwi}\n")
-            for _, vals in production.sort_values("Date").fillna(0).iterrows():
-                f.write(
-                    f"1 {vals.Date.month:<2d} {vals.Date.year}   "
-                    f"{vals.Water:<6.0f} {vals.Gas:<6.0f}\n"
-                )
+        write_blocks(f, groups, _injection_vol_block, tracker)
     return
 
 
+def _injection_vol_block(uwi, injection: pd.DataFrame) -> str:
+    """Format one well's *NAME block for an injection vol file."""
+    injection = injection.sort_values("Date").fillna(0)
+    dates = injection["Date"]
+    rows = zip(dates.dt.month, dates.dt.year, injection["Water"], injection["Gas"])
+    return f"\n*NAME {uwi}\n" + "".join(
+        f"1 {month:<2d} {year}   {water:<6.0f} {gas:<6.0f}\n"
+        for month, year, water, gas in rows
+    )
+
+
+def write_blocks(
+    f: IO[str],
+    groups: Iterable[tuple[Any, pd.DataFrame]],
+    format_block: Callable[[Any, pd.DataFrame], str],
+    tracker: Progress | None = None,
+    chunksize: int = 256,
+    max_pending: int = 8,
+) -> None:
+    """Write the blocks of a text export, formatting them while another thread writes.
+
+    Groups are formatted chunksize at a time in the calling thread and handed to a
+    writer thread through a queue of at most max_pending chunks. Formatting holds the
+    GIL, so one thread does it; writing to disk and compressing release it, so those
+    overlap with formatting, and no more than max_pending chunks are held in memory.
+
+    Args:
+        f (IO[str]): open file to write to
+        groups (Iterable[tuple[Any, pd.DataFrame]]): (key, rows) pairs, like a groupby
+        format_block (Callable[[Any, pd.DataFrame], str]): turns a key and its rows into
+            the text for that block
+        tracker (Progress | None, optional): counts the groups written. Defaults to None.
+        chunksize (int, optional): groups per chunk. Defaults to 256.
+        max_pending (int, optional): chunks formatted but not yet written. Defaults to 8.
+
+    """
+    pending: queue.Queue = queue.Queue(maxsize=max_pending)
+    errors: list[BaseException] = []
+
+    def drain() -> None:
+        while (item := pending.get()) is not None:
+            if errors:
+                continue  # keep taking chunks so the formatter isn't blocked
+            text, n_groups = item
+            try:
+                f.write(text)
+            except BaseException as err:
+                errors.append(err)
+            if tracker is not None:
+                tracker.update(n_groups)
+
+    writer = threading.Thread(target=drain, name="petrelpy-writer")
+    groups = iter(groups)
+    writer.start()
+    try:
+        while not errors and (chunk := list(islice(groups, chunksize))):
+            text = "".join(format_block(key, rows) for key, rows in chunk)
+            pending.put((text, len(chunk)))
+    finally:
+        pending.put(None)
+        writer.join()
+    if errors:
+        raise errors[0]
+
+
+def read_vol(
+    fname: str | Path, chunksize: int | None = None
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Read a vol (production volume) file, such as one written by ``export_vol``.
+
+    Args:
+        fname (str | Path): vol file to read
+        chunksize (int | None, optional): number of rows per DataFrame. Defaults to None,
+            which reads the whole file into one DataFrame.
+
+    Returns:
+        pd.DataFrame | Iterator[pd.DataFrame]: volumes with columns API (categorical),
+            Date (datetime64), then one float32 column per volume in the file. Volume names
+            follow ``export_vol``, so *OIL becomes Liquid, *WATER Water and *GAS Gas.
+            If chunksize is given, an iterator over DataFrames of at most chunksize rows.
+
+    """
+    chunks = _iter_vol_chunks(fname, chunksize or _READ_ALL)
+    return chunks if chunksize else _concat_chunks(chunks, ["API", "Date"])
+
+
+def _iter_vol_chunks(fname: str | Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    wells: list[str] = []
+    rows: list[str] = []
+    wellname = None
+    columns = ["DAY", "MONTH", "YEAR", "OIL", "WATER", "GAS"]
+    with open_text(fname) as f:
+        for line in f:
+            if line.startswith("*"):
+                keywords = line.split()
+                if keywords[0].upper() == "*NAME":
+                    wellname = line.split(maxsplit=1)[1].strip().strip("'\"")
+                elif "*DAY" in (k.upper() for k in keywords):
+                    columns = [k.lstrip("*").upper() for k in keywords]
+            elif wellname is None or not line.strip():
+                continue  # file header or blank line
+            else:
+                wells.append(wellname)
+                rows.append(line)
+                if len(rows) >= chunksize:
+                    yield _vol_frame(wells, rows, columns)
+                    wells, rows = [], []
+    if rows:
+        yield _vol_frame(wells, rows, columns)
+
+
+def _vol_frame(wells: list[str], rows: list[str], columns: list[str]) -> pd.DataFrame:
+    raw = pd.read_csv(
+        io.StringIO("".join(rows)), sep="\\s+", header=None, names=columns
+    )
+    volumes = raw.drop(columns=["DAY", "MONTH", "YEAR"]).astype("float32")
+    volumes.columns = [VOL_COLUMN_NAMES.get(c, c.title()) for c in volumes.columns]
+    dates = pd.to_datetime(
+        raw[["YEAR", "MONTH", "DAY"]].set_axis(["year", "month", "day"], axis=1)
+    )
+    return pd.concat(
+        [pd.DataFrame({"API": pd.Categorical(wells), "Date": dates}), volumes], axis=1
+    )
+
+
+def _concat_chunks(chunks: Iterator[pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+    """Join chunks from a streaming reader, keeping the API column categorical."""
+    frames = list(chunks)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).astype({"API": "category"})
+
+
 def convert_properties_petrel_to_arc(fin, fout, prop):
     """Make Midland basin Petrel gslib file Arc-readable."""
     geomodel = pd.read_csv(
@@ -286,7 +788,7 @@ def read_petrel_tops(fname: str) -> pd.DataFrame:
         pd.DataFrame: Tops, with Well indicating the well, then a column for each surface
 
     """
-    with Path(fname).open() as f:
+    with open_text(fname) as f:
         i = 0
         cols_started = False
         colnames = []
@@ -336,28 +838,127 @@ def write_tops(df, fname, comments="", fill_na=-999):
     """
     header = "BEGIN HEADER\n" + "\n".join(df.columns) + "\nEND HEADER\n"
     body = df.fillna(fill_na).to_csv(
-        header=False, index=False, quoting=2, sep=" ", line_terminator="\n"
+        header=False, index=False, quoting=2, sep=" ", lineterminator="\n"
     )
-    with Path(fname).open("w") as f:
+    with open_text(fname, "w") as f:
         f.write(comments + "\nVERSION 2\n" + header + body)
 
 
-def get_raw_table(fname: str | Path, sheetname: int | str = 0) -> pd.DataFrame:
+def get_raw_table(
+    fname: str | Path, sheetname: int | str = 0, cache: bool = False
+) -> pd.DataFrame:
     """Ingest excel, prn, or csv file.
 
+    Excel workbooks (.xlsx, .xlsm) are streamed in row batches by ``read_excel_sheet``.
+
     Args:
         fname (str): file to read
         sheetname (int | str, optional): sheet to extract if excel. Defaults to 0.
+        cache (bool, optional): keep a parquet copy of an excel sheet next to the workbook,
+            named like ``perfs.xlsx.0.parquet``, and read that instead while it is newer
+            than the workbook. Defaults to False.
 
     Returns:
         pd.DataFrame: table
 
     """
     fname = Path(fname)
-    if ".xls" in fname.suffix:
-        raw_frame = pd.read_excel(fname, sheetname, index_col=0)
-    elif fname.suffix == ".prn":
+    if _is_excel(fname):
+        cache_file = fname.with_name(f"{fname.name}.{sheetname}.parquet")
+        if cache and _is_fresh(cache_file, fname):
+            return pd.read_parquet(cache_file)
+        if fname.suffix.lower() in OPENPYXL_SUFFIXES:
+            raw_frame = read_excel_sheet(fname, sheetname)
+            raw_frame = raw_frame.set_index(raw_frame.columns[0])
+        else:
+            # binary workbooks (.xls, .xlsb) need the engines pandas picks for them
+            raw_frame = pd.read_excel(fname, sheetname, index_col=0)
+        if cache:
+            _write_parquet_cache(raw_frame, cache_file)
+    elif uncompressed_suffix(fname) == ".prn":
         raw_frame = pd.read_csv(fname, sep="\\s+", index_col=0)
     else:
         raw_frame = pd.read_csv(fname, index_col=0)
     return raw_frame
+
+
+def read_excel_sheet(
+    fname: str | Path, sheetname: int | str = 0, chunksize: int | None = None
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Stream a sheet of an .xlsx workbook with openpyxl's read-only mode.
+
+    Only one batch of rows is held as Python objects at a time, which keeps large
+    completion workbooks from taking gigabytes of memory.
+
+    Args:
+        fname (str | Path): workbook to read
+        sheetname (int | str, optional): sheet name or position. Defaults to 0.
+        chunksize (int | None, optional): number of rows per DataFrame. Defaults to None,
+            which reads the whole sheet into one DataFrame.
+
+    Returns:
+        pd.DataFrame | Iterator[pd.DataFrame]: the sheet, with its first row as column
+            names and blank rows dropped. If chunksize is given, an iterator over
+            DataFrames of at most chunksize rows.
+
+    """
+    chunks = _iter_excel_chunks(fname, sheetname, chunksize or _READ_ALL)
+    if chunksize:
+        return chunks
+    frames = list(chunks)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def _iter_excel_chunks(
+    fname: str | Path, sheetname: int | str, chunksize: int
+) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook  # noqa: PLC0415
+
+    workbook = load_workbook(fname, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = (
+            workbook.worksheets[sheetname]
+            if isinstance(sheetname, int)
+            else workbook[sheetname]
+        )
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, ())
+        columns = [
+            f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)
+        ]
+        batch: list[tuple] = []
+        empty = True
+        for row in rows:
+            if any(value is not None for value in row):
+                batch.append(row[: len(columns)])
+                if len(batch) >= chunksize:
+                    yield _excel_frame(batch, columns)
+                    batch, empty = [], False
+        if batch or empty:
+            yield _excel_frame(batch, columns)
+    finally:
+        workbook.close()
+
+
+def _excel_frame(rows: list[tuple], columns: list) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=columns).infer_objects()
+
+
+def _is_fresh(cache_file: Path, source: Path) -> bool:
+    """Check that a cache file exists and was written after its source last changed."""
+    return (
+        cache_file.exists()
+        and cache_file.stat().st_mtime_ns >= source.stat().st_mtime_ns
+    )
+
+
+def _write_parquet_cache(frame: pd.DataFrame, cache_file: Path) -> None:
+    """Write a parquet cache, or just warn if the table has types parquet can't hold."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+    try:
+        frame.to_parquet(tmp_file)
+    except (TypeError, ValueError) as e:
+        logger.warning("not caching %s: %s", cache_file, e)
+        tmp_file.unlink(missing_ok=True)
+    else:
+        tmp_file.replace(cache_file)
@@ -0,0 +1,244 @@
+"""Time the stages of a petrelpy pipeline.
+
+A ``StageProfiler`` records the wall time, rows processed and peak memory of each stage
+run inside ``profiler.stage(name)``. When it is disabled, ``stage`` hands back a shared
+do-nothing context manager, so instrumented code costs next to nothing.
+
+Peak memory is the process's resident set size, sampled by a background thread, so
+measuring it doesn't slow the stages down the way tracing every allocation would.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import importlib.util
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MEMORY_SAMPLE_SECONDS = 0.02
+
+
+def current_rss() -> int | None:
+    """Get the resident set size of this process in bytes, or None if it can't tell."""
+    if importlib.util.find_spec("psutil") is not None:
+        import psutil  # noqa: PLC0415
+
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:  # noqa: PTH123
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """Get the highest resident set size this process has reached, in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _MemorySampler(threading.Thread):
+    """Daemon thread that keeps the highest resident set size seen since a reset."""
+
+    def __init__(self):
+        super().__init__(name="petrelpy-memory-sampler", daemon=True)
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def sample(self) -> None:
+        rss = current_rss()
+        if rss is not None:
+            self.peak = max(self.peak, rss)
+
+    def reset(self) -> None:
+        self.peak = 0
+        self.sample()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(MEMORY_SAMPLE_SECONDS):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class Stage:
+    """Measurements for one stage. Set ``rows`` inside the ``with`` block."""
+
+    def __init__(
+        self, name: str, rows: int | None = None, sampler: _MemorySampler | None = None
+    ):
+        """Start an empty record for the stage."""
+        self.name = name
+        self.rows = rows
+        self.seconds = 0.0
+        self.peak_mb: float | None = None
+        self._start = 0.0
+        self._sampler = sampler
+
+    def __enter__(self) -> Stage:
+        """Start the clock and reset the memory peak."""
+        if self._sampler is not None:
+            self._sampler.reset()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Record the elapsed time and memory peak."""
+        self.seconds = time.perf_counter() - self._start
+        if self._sampler is not None:
+            self._sampler.sample()
+            if self._sampler.peak:
+                self.peak_mb = self._sampler.peak / 2**20
+        if self.peak_mb is None and (peak := peak_rss()) is not None:
+            # without a way to sample, the peak of the whole process so far
+            self.peak_mb = peak / 2**20
+
+
+class _NullStage:
+    """Stand-in for ``Stage`` when profiling is off."""
+
+    rows = None
+
+    def __enter__(self) -> _NullStage:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageProfiler:
+    """Collect stage timings and, optionally, a cProfile or dask profile.
+
+    Args:
+        enabled (bool, optional): whether to record anything. Defaults to False.
+        output (str | Path | None, optional): file for a detailed profile. A ``.html``
+            file gets a dask diagnostics report (the task stream, plus memory use if
+            psutil is installed), anything else gets cProfile statistics readable with
+            ``pstats`` or snakeviz. The cProfile statistics include the threads started
+            while profiling, such as dask's workers and the writer threads: before
+            Python 3.12 each gets a profiler of its own, from 3.12 the one profiler
+            allowed sees every thread.
+            Defaults to None, which only collects stage timings.
+
+    """
+
+    def __init__(self, enabled: bool = False, output: str | Path | None = None):
+        """Set up the profiler, which records nothing until ``start`` is called."""
+        self.enabled = enabled or output is not None
+        self.output = None if output is None else Path(output)
+        self.stages: list[Stage] = []
+        self._profilers: list[Any] = []
+        self._sampler: _MemorySampler | None = None
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, rows: int | None = None) -> Stage | _NullStage:
+        """Context manager that measures the code run inside it as one stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        stage = Stage(name, rows, self._sampler)
+        self.stages.append(stage)
+        return stage
+
+    def start(self) -> None:
+        """Start sampling memory and, if an output file was given, profiling."""
+        if not self.enabled:
+            return
+        if current_rss() is not None:
+            self._sampler = _MemorySampler()
+            self._sampler.start()
+        if self.output is None:
+            return
+        if self.output.suffix == ".html":
+            from dask.diagnostics import (  # noqa: PLC0415
+                Profiler,
+                ResourceProfiler,
+            )
+
+            self._profilers = [Profiler()]
+            if importlib.util.find_spec("psutil") is not None:
+                self._profilers.append(ResourceProfiler(dt=0.25))
+            for profiler in self._profilers:
+                profiler.__enter__()
+        else:
+            self._profilers = [cProfile.Profile()]
+            self._profilers[0].enable()
+            if sys.version_info < (3, 12):
+                # each thread started from now on gets its own profiler, later versions
+                # profile every thread with one and refuse to enable a second
+                threading.setprofile(self._profile_thread)
+
+    def _profile_thread(self, *_args) -> None:
+        """Profile function for new threads, replaced by a profiler of their own."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler is active, so leave this thread unprofiled rather than
+            # raising and killing it before it runs
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._profilers.append(profiler)
+
+    def stop(self) -> None:
+        """Stop sampling, and write the detailed profile if one was requested."""
+        if not self.enabled:
+            return
+        if self.output is not None and self.output.suffix == ".html":
+            from dask.diagnostics import visualize  # noqa: PLC0415
+
+            for profiler in self._profilers:
+                profiler.__exit__(None, None, None)
+            visualize(self._profilers, filename=str(self.output), show=False, save=True)
+        elif self._profilers:
+            if sys.version_info < (3, 12):
+                threading.setprofile(None)
+            self._profilers[0].disable()
+            with self._lock:
+                stats = pstats.Stats(*self._profilers)
+            stats.dump_stats(self.output)
+        self._profilers = []
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+
+    def summary(self) -> str:
+        """Format the stage measurements as a table."""
+        lines = [
+            f"{'stage':<20} {'seconds':>10} {'rows':>14} {'rows/s':>14} {'peak RSS MB':>12}"
+        ]
+        for stage in self.stages:
+            rows = "" if stage.rows is None else f"{stage.rows:,}"
+            rate = (
+                f"{stage.rows / stage.seconds:,.0f}"
+                if stage.rows is not None and stage.seconds > 0
+                else ""
+            )
+            peak = "" if stage.peak_mb is None else f"{stage.peak_mb:.1f}"
+            lines.append(
+                f"{stage.name:<20} {stage.seconds:>10.3f} {rows:>14} {rate:>14} {peak:>12}"
+            )
+        total = sum(stage.seconds for stage in self.stages)
+        lines.append(f"{'total':<20} {total:>10.3f}")
+        return "\n".join(lines)
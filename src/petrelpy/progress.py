@@ -0,0 +1,181 @@
+"""Report progress and throughput of long-running reads and writes.
+
+Progress is logged through the ``petrelpy`` logger at INFO level, at most once every few
+seconds, as the amount done, the rate and (when the total is known) the time remaining.
+Streaming parsers report the bytes read so far, dask computations report finished tasks.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+from petrelpy.compression import compression_of
+
+logger = logging.getLogger("petrelpy")
+# lines between checks of a file's position in track_lines
+TELL_EVERY_LINES = 256
+
+
+class Progress:
+    """Count work done and log the throughput now and then.
+
+    Args:
+        desc (str): what is being done, starts each log line
+        total (float | None, optional): total amount of work, for percentages and time
+            remaining. Defaults to None.
+        unit (str, optional): unit of work. "B" is shown as megabytes. Defaults to "rows".
+        interval (float, optional): minimum seconds between log lines. Defaults to 2.
+        enabled (bool, optional): whether to log anything. Defaults to True.
+
+    """
+
+    def __init__(
+        self,
+        desc: str,
+        total: float | None = None,
+        unit: str = "rows",
+        interval: float = 2.0,
+        enabled: bool = True,
+    ):
+        """Start counting."""
+        self.desc = desc
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.enabled = enabled
+        self.done = 0.0
+        self._start = self._last = time.perf_counter()
+
+    def __enter__(self) -> Progress:
+        """Restart the clock."""
+        self._start = self._last = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Log the final count."""
+        self.close()
+
+    def update(self, n: float = 1) -> None:
+        """Add n to the work done, logging if it has been a while since the last line."""
+        if not self.enabled:
+            return
+        self.done += n
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            logger.info(self._message(now))
+
+    def close(self) -> None:
+        """Log the total work done and the average rate."""
+        if self.enabled:
+            logger.info(self._message(time.perf_counter(), final=True))
+
+    def _message(self, now: float, final: bool = False) -> str:
+        elapsed = max(now - self._start, 1e-9)
+        rate = self.done / elapsed
+        message = f"{self.desc}: {self._format(self.done)}"
+        if self.total and not final:
+            message += f" of {self._format(self.total)} ({self.done / self.total:.0%})"
+        message += f", {self._format(rate)}/s"
+        if final:
+            message += f", done in {_format_seconds(elapsed)}"
+        elif self.total and rate > 0:
+            message += f", {_format_seconds((self.total - self.done) / rate)} left"
+        return message
+
+    def _format(self, amount: float) -> str:
+        if self.unit == "B":
+            return f"{amount / 2**20:,.1f} MB"
+        return f"{amount:,.0f} {self.unit}"
+
+
+def log_to_stderr(level: int = logging.INFO) -> None:
+    """Send petrelpy's log messages, including progress, to stderr."""
+    logger.setLevel(level)
+    if not any(getattr(h, "_petrelpy", False) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%H:%M:%S"))
+        handler._petrelpy = True
+        logger.addHandler(handler)
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def track_lines(
+    lines: Iterable[str], desc: str, fname: str | Path | None = None
+) -> Iterator[str]:
+    """Yield lines from a text file, logging the bytes read and the rate.
+
+    For an open file the bytes are its position, read from the binary buffer under the
+    text, so they match the file's size whatever the newlines and encoding. Compressed
+    files have no total, since their position counts the text read from them, not their
+    size on disk. Other sources of lines are counted as they encode in UTF-8.
+
+    Args:
+        lines (Iterable[str]): open text file, or any other source of lines
+        desc (str): what is being read
+        fname (str | Path | None, optional): the file's path, to get its size for
+            percentages and time remaining. Defaults to None.
+
+    Yields:
+        Iterator[str]: the lines, unchanged
+
+    """
+    total = None
+    if fname is not None and compression_of(fname) is None:
+        total = Path(fname).stat().st_size
+    buffer = getattr(lines, "buffer", None)
+    with Progress(desc, total=total, unit="B") as progress:
+        if buffer is None:
+            for line in lines:
+                progress.update(len(line) if line.isascii() else len(line.encode()))
+                yield line
+            return
+        done = buffer.tell()
+        progress.update(done)
+        for i, line in enumerate(lines, 1):
+            if i % TELL_EVERY_LINES == 0:
+                position = buffer.tell()
+                progress.update(position - done)
+                done = position
+            yield line
+        progress.update(buffer.tell() - done)
+
+
+def dask_progress(desc: str, enabled: bool = True) -> Any:
+    """Get a context manager that logs the tasks finished by dask computations inside it.
+
+    Args:
+        desc (str): what is being computed
+        enabled (bool, optional): whether to log anything. Defaults to True.
+
+    Returns:
+        a dask ``Callback``, or a do-nothing context manager if not enabled
+
+    """
+    if not enabled:
+        return nullcontext()
+    from dask.callbacks import Callback  # noqa: PLC0415
+
+    progress = Progress(desc, unit="tasks")
+
+    def start_state(_dsk, state) -> None:
+        progress.total = sum(
+            len(state[key]) for key in ("ready", "waiting", "running", "finished")
+        )
+        progress.__enter__()
+
+    return Callback(
+        start_state=start_state,
+        posttask=lambda *_: progress.update(),
+        finish=lambda *_: progress.close(),
+    )
@@ -0,0 +1,156 @@
+"""Mergeable summaries of big columns: exact moments and approximate quantiles.
+
+A summary of one piece of a table holds, for each group and column, the count, sum,
+mean, sum of squared deviations, min and max, plus a quantile sketch. Summaries of
+separate pieces merge into the summary of the whole, so statistics of a geomodel with
+billions of cells come out of one pass over its partitions, holding only small tables.
+
+The quantile sketch buckets values on a logarithmic scale, as in DDSketch (Masson,
+Rim and Lee, 2019). With a relative accuracy a, the value returned for any quantile
+is within a fraction a of the exact value of that rank, whatever the distribution,
+and the number of buckets grows only with the logarithm of the range of the values.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+MOMENTS = ["count", "sum", "mean", "m2", "min", "max"]
+
+
+class Summary(NamedTuple):
+    """Moments and sketch buckets of columns of a table, by group.
+
+    ``moments`` is indexed by the group columns plus ``property`` with the columns in
+    ``MOMENTS``, where m2 is the sum of squared deviations from the mean. ``buckets``
+    is a Series of value counts indexed by the group columns plus ``property``, the
+    sign of the values, and their logarithmic bucket.
+    """
+
+    moments: pd.DataFrame
+    buckets: pd.Series
+
+
+def _log_gamma(relative_accuracy: float) -> float:
+    if not 0 < relative_accuracy < 1:
+        msg = f"relative_accuracy must be between 0 and 1, not {relative_accuracy}"
+        raise ValueError(msg)
+    return np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+
+
+def summarize(
+    frame: pd.DataFrame,
+    by: list[str],
+    columns: list[str],
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> Summary:
+    """Summarize columns of a table by group.
+
+    Args:
+        frame (pd.DataFrame): table, or one partition of a larger one
+        by (list[str]): columns to group by
+        columns (list[str]): numeric columns to summarize. Missing values are skipped.
+        relative_accuracy (float, optional): relative error bound of the quantiles.
+            Defaults to 0.01.
+
+    Returns:
+        Summary: moments and sketch buckets, ready to merge with other summaries
+
+    """
+    log_gamma = _log_gamma(relative_accuracy)
+    moments, buckets = [], []
+    for column in columns:
+        valid = frame[column].notna()
+        values = frame.loc[valid, column].astype(float)
+        groups = [frame.loc[valid, name] for name in by]
+        stats = values.groupby(groups, observed=True).agg(
+            ["count", "sum", "mean", "var", "min", "max"]
+        )
+        stats["m2"] = (stats.pop("var") * (stats["count"] - 1)).fillna(0.0)
+        moments.append(stats.assign(property=column))
+
+        magnitude = values.abs().to_numpy()
+        with np.errstate(divide="ignore"):
+            keys = np.ceil(np.log(magnitude) / log_gamma)
+        keys = np.where(magnitude > 0, keys, 0).astype(np.int64)
+        counts = values.groupby(
+            [*groups, np.sign(values).astype(np.int8).to_numpy(), keys], observed=True
+        ).size()
+        counts.index = counts.index.set_names([*by, "sign", "key"])
+        buckets.append(pd.concat({column: counts}, names=["property"]))
+
+    moments = (
+        pd.concat(moments).set_index("property", append=True)[MOMENTS]
+        if moments
+        else pd.DataFrame(columns=MOMENTS)
+    )
+    buckets = (
+        pd.concat(buckets).reorder_levels([*by, "property", "sign", "key"])
+        if buckets
+        else pd.Series(dtype=np.int64)
+    )
+    return Summary(moments, buckets)
+
+
+def merge(*summaries: Summary) -> Summary:
+    """Combine summaries of separate pieces of a table into a summary of all of them.
+
+    Means and squared deviations combine with the parallel update of Chan, Golub and
+    LeVeque, which avoids the cancellation of a sum of squares.
+    """
+    moments = pd.concat([summary.moments for summary in summaries])
+    levels = list(range(moments.index.nlevels))
+    grouped = moments.groupby(level=levels)
+    total = grouped[["count", "sum"]].sum()
+    total["mean"] = total["sum"] / total["count"]
+    deviation = moments["mean"] - total["mean"].reindex(moments.index).to_numpy()
+    total["m2"] = (
+        (moments["m2"] + moments["count"] * deviation**2).groupby(level=levels).sum()
+    )
+    total["min"] = grouped["min"].min()
+    total["max"] = grouped["max"].max()
+
+    buckets = pd.concat([summary.buckets for summary in summaries])
+    buckets = buckets.groupby(level=list(range(buckets.index.nlevels))).sum()
+    return Summary(total[MOMENTS], buckets)
+
+
+def quantiles(
+    summary: Summary,
+    qs: list[float],
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> pd.DataFrame:
+    """Estimate quantiles from a summary.
+
+    Args:
+        summary (Summary): summary from ``summarize`` or ``merge``
+        qs (list[float]): quantiles to estimate, between 0 and 1
+        relative_accuracy (float, optional): the accuracy the summary was made with.
+            Defaults to 0.01.
+
+    Returns:
+        pd.DataFrame: one column per quantile, indexed like ``summary.moments``
+
+    """
+    gamma = np.exp(_log_gamma(relative_accuracy))
+    groups = summary.moments.index.names
+    buckets = summary.buckets.rename("count").reset_index()
+    # negative values sort by decreasing magnitude, then zeros, then positive values
+    buckets["order"] = buckets["sign"] * buckets["key"]
+    buckets = buckets.sort_values([*groups, "sign", "order"])
+    buckets["value"] = buckets["sign"] * 2 * gamma ** buckets["key"] / (gamma + 1)
+    keys = [buckets[name] for name in groups]
+    cumulative = buckets["count"].groupby(keys).cumsum()
+    total = buckets["count"].groupby(keys).transform("sum")
+
+    estimates = pd.DataFrame(index=summary.moments.index)
+    for q in qs:
+        reached = buckets[cumulative > q * (total - 1)]
+        first = reached.groupby(groups)["value"].first()
+        estimates[q] = first.reindex(estimates.index)
+    # the extremes are known exactly
+    return estimates.clip(summary.moments["min"], summary.moments["max"], axis=0)
@@ -0,0 +1,228 @@
+"""Spacing between well laterals, for spacing and parent-child studies.
+
+Each lateral is represented by the midpoints of its cells in a well connection file.
+All the points of all the wells go in one 3D KD-tree, which is queried in batches for
+each point's nearest points on other wells, so the work grows with the number of points
+times its logarithm instead of with the square of the number of wells.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from petrelpy.progress import track_lines
+from petrelpy.wellconnection import (
+    COL_NAMES_TRAJECTORY,
+    GEOMETRY_COLUMNS,
+    get_trajectory,
+    get_trajectory_geomodel_columns,
+    get_well,
+    get_wellname,
+    select_lateral,
+)
+
+POINT_COLUMNS = ["X", "Y", "Z"]
+
+
+def lateral_points(
+    well_connection_file: str | Path,
+    wellname_to_heel: pd.DataFrame | None = None,
+    col_names: list[str] | None = None,
+    progress: bool = False,
+) -> pd.DataFrame:
+    """Get the midpoints of the lateral cells of every well in a well connection file.
+
+    Only the measured depths and the entry and exit points of the cells are parsed.
+
+    Args:
+        well_connection_file (str | Path): Eclipse well connection file exported from
+            Petrel
+        wellname_to_heel (pd.DataFrame | None, optional): DataFrame containing Name and
+            Depth_heel for each well. Wells not in it are treated as vertical and have
+            all their cells included. Defaults to None, which includes every cell.
+        col_names (list[str] | None, optional): columns for the trajectory. Defaults to
+            None, which reads them from the file's TRAJECTORY_COLUMN_ORDER.
+        progress (bool, optional): whether to log the bytes parsed and the parsing rate.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: Name, MD, X, Y and Z of the middle of each lateral cell
+
+    """
+    if col_names is None:
+        col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(
+            well_connection_file
+        )
+    heels = {}
+    if wellname_to_heel is not None:
+        first = wellname_to_heel.drop_duplicates("Name")
+        heels = dict(zip(first["Name"], first["Depth_heel"]))
+
+    names, lengths, laterals = [], [], []
+    with Path(well_connection_file).open() as f:
+        lines = (
+            track_lines(f, f"parsing {well_connection_file}", well_connection_file)
+            if progress
+            else f
+        )
+        for well_string in get_well(lines):
+            trajectory = get_trajectory(well_string, col_names, GEOMETRY_COLUMNS)
+            if trajectory.empty:
+                continue
+            wellname = get_wellname(well_string)
+            lateral = select_lateral(trajectory, heels.get(wellname, 0))
+            names.append(wellname)
+            lengths.append(len(lateral))
+            laterals.append(lateral[GEOMETRY_COLUMNS].to_numpy(float))
+
+    cells = np.concatenate(laterals) if laterals else np.empty((0, 8))
+    # columns are MD, X, Y, Z at the entry followed by the same at the exit
+    entry, exit_ = cells[:, [0, 2, 3, 4]], cells[:, [1, 5, 6, 7]]
+    points = pd.DataFrame((entry + exit_) / 2, columns=["MD", *POINT_COLUMNS])
+    points.insert(0, "Name", np.repeat(np.array(names, dtype=object), lengths))
+    return points
+
+
+def well_spacing(
+    points: pd.DataFrame,
+    k: int = 3,
+    max_distance: float | None = None,
+    batch_size: int = 100_000,
+    workers: int = -1,
+) -> pd.DataFrame:
+    """Find each well's nearest offset wells, and how far away they are.
+
+    Every point of a well gets the nearest point of each of its k nearest other wells.
+    A well's offsets are ranked by their closest approach over all its points, which
+    is exact: at the point of closest approach, the offset is among the k nearest. The
+    mean separation and vertical offset average over the points that have the offset
+    among their k nearest, which for roughly parallel laterals is all of them.
+
+    Args:
+        points (pd.DataFrame): Name, X, Y and Z of points along each lateral, as from
+            ``lateral_points``
+        k (int, optional): offset wells to find for each well. Defaults to 3.
+        max_distance (float | None, optional): ignore offsets farther away than this.
+            Defaults to None, which has no limit.
+        batch_size (int, optional): points to query at once, which bounds the memory
+            used. Defaults to 100,000.
+        workers (int, optional): threads for each query, -1 for one per CPU. Defaults
+            to -1.
+
+    Returns:
+        pd.DataFrame: indexed by Name and rank, 1 for the nearest offset, with the
+            OFFSET well, its MIN_SEPARATION and MEAN_SEPARATION, the mean
+            VERTICAL_OFFSET of its nearest points (their Z minus the well's) and the
+            number of POINTS these are over. Wells without offsets within max_distance
+            are left out.
+
+    """
+    points = points.dropna(subset=POINT_COLUMNS)
+    codes, names = pd.factorize(points["Name"])
+    xyz = points[POINT_COLUMNS].to_numpy(float)
+    k = min(k, len(names) - 1)
+    columns = ["OFFSET", "MIN_SEPARATION", "MEAN_SEPARATION", "VERTICAL_OFFSET"]
+    if k < 1:
+        index = pd.MultiIndex.from_arrays([[], []], names=["Name", "rank"])
+        return pd.DataFrame(columns=[*columns, "POINTS"], index=index)
+
+    tree = cKDTree(xyz)
+    upper = np.inf if max_distance is None else max_distance
+    parts = [
+        _nearest_offsets(
+            tree,
+            codes,
+            np.arange(start, min(start + batch_size, len(xyz))),
+            k,
+            upper,
+            workers,
+        )
+        for start in range(0, len(xyz), batch_size)
+    ]
+    # a well's points can fall in two batches, so combine their sums
+    pairs = (
+        pd.concat(parts)
+        .groupby(["well", "offset"])
+        .agg(
+            MIN_SEPARATION=("min", "min"),
+            distance=("distance", "sum"),
+            dz=("dz", "sum"),
+            POINTS=("POINTS", "sum"),
+        )
+    )
+    pairs["MEAN_SEPARATION"] = pairs["distance"] / pairs["POINTS"]
+    pairs["VERTICAL_OFFSET"] = pairs["dz"] / pairs["POINTS"]
+    pairs = pairs.reset_index().sort_values(["well", "MIN_SEPARATION"], kind="stable")
+    pairs["rank"] = pairs.groupby("well").cumcount() + 1
+    pairs = pairs[pairs["rank"] <= k]
+    pairs["Name"] = names[pairs["well"].to_numpy()]
+    pairs["OFFSET"] = names[pairs["offset"].to_numpy()]
+    return pairs.set_index(["Name", "rank"])[[*columns, "POINTS"]]
+
+
+def _nearest_offsets(
+    tree: cKDTree,
+    codes: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    upper: float,
+    workers: int,
+) -> pd.DataFrame:
+    """Sum the distances from a batch of points to their k nearest other wells.
+
+    A point's nearest neighbours are mostly on its own well, so points that don't reach
+    k other wells are queried again with four times the neighbours, until they do, run
+    out of neighbours within upper, or have every point as a neighbour.
+    """
+    xyz, n = tree.data, tree.n
+    n_neighbours = min(n, 8 * (k + 1))
+    found_offsets = []
+    while len(query):
+        dist, idx = tree.query(
+            xyz[query], k=n_neighbours, distance_upper_bound=upper, workers=workers
+        )
+        dist, idx = dist.reshape(len(query), -1), idx.reshape(len(query), -1)
+        found = idx < n
+        offset = np.where(found, codes[np.minimum(idx, n - 1)], -1)
+        row, col = np.nonzero(found & (offset != codes[query][:, None]))
+
+        # neighbours are in order of distance, so the first of each well is its nearest
+        _, first = np.unique(
+            row * (codes.max() + 1) + offset[row, col], return_index=True
+        )
+        row, col = row[first], col[first]
+        order = np.lexsort((dist[row, col], row))
+        row, col = row[order], col[order]
+        rank = np.arange(len(row)) - np.searchsorted(row, row)
+        n_offsets = np.bincount(row, minlength=len(query))
+        retry = (n_offsets < k) & found[:, -1] & (n_neighbours < n)
+
+        keep = (rank < k) & ~retry[row]
+        row, col = row[keep], col[keep]
+        found_offsets.append(
+            pd.DataFrame(
+                {
+                    "well": codes[query[row]],
+                    "offset": offset[row, col],
+                    "distance": dist[row, col],
+                    "dz": xyz[idx[row, col], 2] - xyz[query[row], 2],
+                }
+            )
+        )
+        query = query[retry]
+        n_neighbours = min(n, 4 * n_neighbours)
+
+    return (
+        pd.concat(found_offsets)
+        .groupby(["well", "offset"])
+        .agg(
+            min=("distance", "min"),
+            distance=("distance", "sum"),
+            dz=("dz", "sum"),
+            POINTS=("distance", "size"),
+        )
+    )
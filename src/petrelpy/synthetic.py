@@ -0,0 +1,415 @@
+"""Write synthetic Petrel, Eclipse, and IHS files for testing and benchmarking.
+
+Every generator is seeded, so the same arguments always give the same file, and streams
+its output in blocks, so memory use stays flat however large the file is. Each block has
+its own random numbers, seeded by the seed and the block's number, so changing the block
+size changes the random values in the file.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GSLIB_COLUMNS = [
+    "i_index",
+    "j_index",
+    "k_index",
+    "x_coord",
+    "y_coord",
+    "z_coord",
+    "UWI-index",
+    "Mainzones",
+    "Facies",
+    "Porosity",
+    "Sw",
+    "Bulkvolume",
+    "OOIP",
+]
+WELL_CONNECTION_PROPERTIES = [
+    "Facies",
+    "Porosity - total",
+    "Water saturation",
+    "Bulk volume",
+    "Zones (hierarchy)",
+]
+HORIZONS = ["Spraberry", "Dean", "Wolfcamp A", "Wolfcamp B", "Strawn"]
+# mean porosity of each facies, so porosity and facies are correlated
+_FACIES_POROSITY = np.array([0.02, 0.04, 0.06, 0.08, 0.10, 0.12])
+
+
+def write_gslib_model(
+    fname: str | Path,
+    shape: tuple[int, int, int] = (100, 100, 10),
+    n_wells: int = 10,
+    n_zones: int = 3,
+    n_facies: int = 4,
+    cell_size: tuple[float, float, float] = (200.0, 200.0, 10.0),
+    seed: int = 0,
+    block_rows: int = 1_000_000,
+) -> Path:
+    """Write a GSLIB geomodel, as exported from Petrel, with wells, zones, and facies.
+
+    Cells are written with i varying fastest, then j, then k. Zones are bands of k-layers,
+    porosity depends on facies, and OOIP is derived from the bulk volume, porosity and
+    water saturation. Cells containing a well midpoint have a UWI-index, all others -999.
+
+    Args:
+        fname (str | Path): gslib file to write
+        shape (tuple[int, int, int], optional): number of cells in i, j, and k.
+            Defaults to (100, 100, 10).
+        n_wells (int, optional): number of wells with a UWI-index. Defaults to 10.
+        n_zones (int, optional): number of zones. Defaults to 3.
+        n_facies (int, optional): number of facies, at most 6. Defaults to 4.
+        cell_size (tuple[float, float, float], optional): cell size in x, y, and z.
+            Defaults to (200.0, 200.0, 10.0).
+        seed (int, optional): random seed. Defaults to 0.
+        block_rows (int, optional): cells generated and written at a time. Defaults to
+            1_000_000.
+
+    Returns:
+        Path: the gslib file
+
+    """
+    ni, nj, nk = shape
+    n_cells = ni * nj * nk
+    rng = np.random.default_rng(seed)
+    well_cells = np.sort(rng.choice(n_cells, size=min(n_wells, n_cells), replace=False))
+
+    fname = Path(fname)
+    with fname.open("w") as f:
+        f.write(f"PETREL: Properties\n{len(GSLIB_COLUMNS)}\n")
+        f.writelines(f"{col} unit1 scale1\n" for col in GSLIB_COLUMNS)
+        for block, start in enumerate(range(0, n_cells, block_rows)):
+            block_rng = np.random.default_rng([seed, block])
+            cells = np.arange(start, min(start + block_rows, n_cells))
+            _gslib_block(
+                cells, shape, well_cells, n_zones, n_facies, cell_size, block_rng
+            ).to_csv(f, sep=" ", header=False, index=False, na_rep="-999")
+    return fname
+
+
+def _gslib_block(
+    cells: np.ndarray,
+    shape: tuple[int, int, int],
+    well_cells: np.ndarray,
+    n_zones: int,
+    n_facies: int,
+    cell_size: tuple[float, float, float],
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    ni, nj, nk = shape
+    dx, dy, dz = cell_size
+    i = cells % ni
+    j = cells // ni % nj
+    k = cells // (ni * nj)
+    n = len(cells)
+    facies = rng.integers(0, n_facies, n)
+    porosity = np.clip(_FACIES_POROSITY[facies] + rng.normal(0, 0.01, n), 0, None)
+    sw = rng.uniform(0.1, 1.0, n)
+    bulk_volume = dx * dy * dz * rng.uniform(0.9, 1.1, n)
+    uwi_index = np.where(
+        np.isin(cells, well_cells), np.searchsorted(well_cells, cells) + 1, np.nan
+    )
+    return pd.DataFrame(
+        {
+            "i_index": i + 1,
+            "j_index": j + 1,
+            "k_index": k + 1,
+            "x_coord": 1.7e6 + dx * i,
+            "y_coord": 4.1e5 + dy * j,
+            "z_coord": -4000.0 - dz * k - 0.01 * dx * i,
+            "UWI-index": uwi_index,
+            "Mainzones": k * n_zones // nk + 1,
+            "Facies": facies + 1,
+            "Porosity": porosity.round(6),
+            "Sw": sw.round(6),
+            "Bulkvolume": bulk_volume.round(2),
+            "OOIP": (bulk_volume * porosity * (1 - sw) / 1.2 / 5.615).round(2),
+        }
+    )
+
+
+def write_well_connection_file(
+    fname: str | Path,
+    n_wells: int = 10,
+    cells_per_well: int = 50,
+    vertical_cells: int = 5,
+    properties: list[str] | None = None,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Write an Eclipse well connection file, as exported from Petrel.
+
+    Each well has a vertical section of a few cells followed by a lateral heading east.
+    The laterals are parallel and 660 ft apart, like a development unit.
+
+    Args:
+        fname (str | Path): well connection file to write
+        n_wells (int, optional): number of wells. Defaults to 10.
+        cells_per_well (int, optional): trajectory cells per lateral. Defaults to 50.
+        vertical_cells (int, optional): trajectory cells above the heel. Defaults to 5.
+        properties (list[str] | None, optional): geomodel properties along the
+            trajectories. Defaults to None, which uses ``WELL_CONNECTION_PROPERTIES``.
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: UWI, Name and Depth_heel for each well, as expected by
+            ``process_well_connection_file``
+
+    """
+    if properties is None:
+        properties = WELL_CONNECTION_PROPERTIES
+    heels = []
+    with Path(fname).open("w") as f:
+        f.write(
+            "\n-- Well connection data\n--\nUNITS FEET\n\nMAPUNITS FEET\n\n"
+            "TRAJECTORY_COLUMN_ORDER\n"
+            "MD_ENTRY GRID_I GRID_J GRID_K WELL_ENTRY ENTRY_FACE MD_EXIT WELL_EXIT EXIT_FACE"
+            "  " + "  ".join(properties) + "\n\n"
+        )
+        for well in range(n_wells):
+            rng = np.random.default_rng([seed, well])
+            name = f"SYNTHETIC {well + 1}"
+            trajectory, heel = _well_trajectory(
+                well, cells_per_well, vertical_cells, properties, rng
+            )
+            f.write(
+                f"\nGLOBAL\n\nWELLNAME  {name}\nWELLHEAD_I  {trajectory.iloc[0, 1]}\n"
+                f"WELLHEAD_J  {trajectory.iloc[0, 2]}\nTRAJECTORY\n"
+            )
+            trajectory.to_csv(f, sep=" ", header=False, index=False)
+            last = trajectory.iloc[-1]
+            f.write(
+                f"END_TRAJECTORY {last.iloc[8]:.6f} {last.iloc[9]:.6f} "
+                f"{last.iloc[10]:.6f} {last.iloc[11]:.6f}\n"
+            )
+            heels.append((42_000_000_000_000 + 100 * (well + 1), name, heel))
+    return pd.DataFrame(heels, columns=["UWI", "Name", "Depth_heel"])
+
+
+def _well_trajectory(
+    well: int,
+    cells_per_well: int,
+    vertical_cells: int,
+    properties: list[str],
+    rng: np.random.Generator,
+) -> tuple[pd.DataFrame, float]:
+    """Make one well's trajectory cells and its heel measured depth.
+
+    Wells are drilled in units of 50 side by side, 660 ft (three cells) apart in y,
+    and each unit starts ten cells east of the toes of the one before, so no two
+    laterals overlap.
+    """
+    dx, dy, dz = 200.0, 220.0, 10.0
+    unit, slot = divmod(well, 50)
+    i0, j0 = 1 + (cells_per_well + 10) * unit, 1 + 3 * slot
+    x0, y0 = 6.0e4 + dx * (i0 - 1), 1.9e5 + dy * (j0 - 1)
+    heel_md = 7000.0 + rng.uniform(-500, 500)
+    tvd = heel_md - 3400.0
+
+    vertical_md = np.linspace(1000.0, heel_md, vertical_cells, endpoint=False)
+    vertical = pd.DataFrame(
+        {
+            "MD_ENTRY": vertical_md,
+            "GRID_I": i0,
+            "GRID_J": j0,
+            "GRID_K": (vertical_md // dz).astype(int),
+            "WELL_ENTRY_X": x0,
+            "WELL_ENTRY_Y": y0,
+            "WELL_ENTRY_Z": vertical_md - 3400.0,
+            "ENTRY_FACE": "Z-",
+            "MD_EXIT": vertical_md + dz,
+            "WELL_EXIT_X": x0,
+            "WELL_EXIT_Y": y0,
+            "WELL_EXIT_Z": vertical_md - 3400.0 + dz,
+            "EXIT_FACE": "Z+",
+        }
+    )
+    lateral_md = heel_md + dx * np.arange(cells_per_well)
+    lateral_z = tvd + np.cumsum(rng.normal(0, 2, cells_per_well))
+    lateral = pd.DataFrame(
+        {
+            "MD_ENTRY": lateral_md,
+            "GRID_I": i0 + np.arange(cells_per_well),
+            "GRID_J": j0,
+            "GRID_K": int(heel_md // dz),
+            "WELL_ENTRY_X": x0 + dx * np.arange(cells_per_well),
+            "WELL_ENTRY_Y": y0,
+            "WELL_ENTRY_Z": lateral_z,
+            "ENTRY_FACE": "X-",
+            "MD_EXIT": lateral_md + dx,
+            "WELL_EXIT_X": x0 + dx * np.arange(1, cells_per_well + 1),
+            "WELL_EXIT_Y": y0,
+            "WELL_EXIT_Z": lateral_z,
+            "EXIT_FACE": "X+",
+        }
+    )
+    trajectory = pd.concat([vertical, lateral], ignore_index=True).round(2)
+    n = len(trajectory)
+    facies = rng.integers(0, 6, n)
+    known = {
+        "Facies": facies + 1.0,
+        "Porosity - total": np.clip(
+            _FACIES_POROSITY[facies] + rng.normal(0, 0.01, n), 0, None
+        ),
+        "Water saturation": rng.uniform(0.1, 1.0, n),
+        "Bulk volume": rng.uniform(0.9e7, 1.1e7, n),
+        "Zones (hierarchy)": np.minimum(trajectory["GRID_K"] // 100, 16) + 1.0,
+    }
+    for p, name in enumerate(properties):
+        values = known[name] if name in known else rng.uniform(0, 1, n)
+        trajectory[f"property_{p}"] = np.round(values, 8)
+    return trajectory, round(heel_md, 2)
+
+
+def write_production_csv(
+    fname: str | Path,
+    n_wells: int = 100,
+    n_months: int = 120,
+    yearly: bool = False,
+    seed: int = 0,
+    block_wells: int = 10_000,
+) -> Path:
+    """Write an IHS-style production table with declining rates for each well.
+
+    Args:
+        fname (str | Path): csv file to write
+        n_wells (int, optional): number of wells. Defaults to 100.
+        n_months (int, optional): months on production for each well. Defaults to 120.
+        yearly (bool, optional): write annual production (API,Year,Annual Liquid,...)
+            instead of monthly (API,Month,Year,Liquid,...). Defaults to False.
+        seed (int, optional): random seed. Defaults to 0.
+        block_wells (int, optional): wells generated and written at a time.
+            Defaults to 10_000.
+
+    Returns:
+        Path: the csv file
+
+    """
+    dates = pd.date_range("2010-01-01", periods=n_months, freq="MS")
+    fname = Path(fname)
+    with fname.open("w") as f:
+        for block, start in enumerate(range(0, n_wells, block_wells)):
+            rng = np.random.default_rng([seed, block])
+            wells = np.arange(start, min(start + block_wells, n_wells))
+            production = _production_block(wells, dates, rng)
+            if yearly:
+                production = (
+                    production.assign(Year=dates.year[production.pop("month")])
+                    .groupby(["API", "Year"], as_index=False)
+                    .sum()
+                    .rename(
+                        columns=lambda c: c if c in ("API", "Year") else f"Annual {c}"
+                    )
+                )
+            else:
+                month = production.pop("month")
+                production.insert(1, "Month", dates.strftime("%b").str.upper()[month])
+                production.insert(2, "Year", dates.year[month])
+            production.round(2).to_csv(f, header=block == 0, index=False)
+    return fname
+
+
+def _production_block(
+    wells: np.ndarray, dates: pd.DatetimeIndex, rng: np.random.Generator
+) -> pd.DataFrame:
+    """Make hyperbolic-decline production for a block of wells."""
+    n_months = len(dates)
+    initial_rate = rng.lognormal(np.log(600), 0.5, (len(wells), 1))
+    decline = rng.uniform(0.05, 0.2, (len(wells), 1))
+    months = np.arange(n_months)
+    liquid = initial_rate / (1 + 0.9 * decline * months) ** (1 / 0.9)
+    noise = rng.lognormal(0, 0.1, (3, len(wells), n_months))
+    return pd.DataFrame(
+        {
+            "API": np.repeat(42_000_000_000_000 + 100 * (wells + 1), n_months).astype(
+                str
+            ),
+            "month": np.tile(months, len(wells)),
+            "Liquid": (liquid * noise[0]).ravel(),
+            "Water": (liquid * rng.uniform(0.5, 3, (len(wells), 1)) * noise[1]).ravel(),
+            "Gas": (liquid * rng.uniform(1, 4, (len(wells), 1)) * noise[2]).ravel(),
+        }
+    )
+
+
+def write_perforations_csv(
+    fname: str | Path,
+    n_perforations: int = 1000,
+    perforations_per_well: int = 10,
+    seed: int = 0,
+    block_rows: int = 1_000_000,
+) -> Path:
+    """Write a completions table with columns API,Treatment Start Date,start_depth,stop_depth.
+
+    Args:
+        fname (str | Path): csv file to write
+        n_perforations (int, optional): number of perforated intervals. Defaults to 1000.
+        perforations_per_well (int, optional): average intervals per well. Defaults to 10.
+        seed (int, optional): random seed. Defaults to 0.
+        block_rows (int, optional): rows generated and written at a time.
+            Defaults to 1_000_000.
+
+    Returns:
+        Path: the csv file
+
+    """
+    n_wells = max(n_perforations // perforations_per_well, 1)
+    start_date = np.datetime64("2010-01-01")
+    fname = Path(fname)
+    with fname.open("w") as f:
+        for block, start in enumerate(range(0, n_perforations, block_rows)):
+            rng = np.random.default_rng([seed, block])
+            n = min(block_rows, n_perforations - start)
+            top = rng.uniform(5000, 9000, n).round()
+            pd.DataFrame(
+                {
+                    "API": 42_000_000_000_000 + 100 * (rng.integers(0, n_wells, n) + 1),
+                    "Treatment Start Date": start_date
+                    + rng.integers(0, 5000, n).astype("timedelta64[D]"),
+                    "start_depth": top,
+                    "stop_depth": top + rng.uniform(10, 200, n).round(),
+                }
+            ).to_csv(f, header=block == 0, index=False)
+    return fname
+
+
+def write_tops_file(
+    fname: str | Path,
+    n_wells: int = 1000,
+    horizons: list[str] | None = None,
+    seed: int = 0,
+    block_rows: int = 1_000_000,
+) -> Path:
+    """Write a Petrel well tops file with a depth for each horizon in each well.
+
+    Args:
+        fname (str | Path): tops file to write
+        n_wells (int, optional): number of wells. Defaults to 1000.
+        horizons (list[str] | None, optional): horizon names, shallowest first.
+            Defaults to None, which uses ``HORIZONS``.
+        seed (int, optional): random seed. Defaults to 0.
+        block_rows (int, optional): wells generated and written at a time.
+            Defaults to 1_000_000.
+
+    Returns:
+        Path: the tops file
+
+    """
+    if horizons is None:
+        horizons = HORIZONS
+    fname = Path(fname)
+    with fname.open("w") as f:
+        f.write(
+            "\nVERSION 2\nBEGIN HEADER\nWell\n" + "\n".join(horizons) + "\nEND HEADER\n"
+        )
+        for block, start in enumerate(range(0, n_wells, block_rows)):
+            rng = np.random.default_rng([seed, block])
+            n = min(block_rows, n_wells - start)
+            depths = 5000 + np.cumsum(rng.uniform(50, 800, (n, len(horizons))), axis=1)
+            tops = pd.DataFrame(depths.round(1), columns=horizons)
+            tops.insert(0, "Well", [f"W{w + 1}" for w in range(start, start + n)])
+            tops.to_csv(f, sep=" ", header=False, index=False, quoting=2)
+    return fname
@@ -5,14 +5,25 @@ These are a handy export from Petrel that can get you well-specific properties.
 
 from __future__ import annotations
 
+import hashlib
 import io
+import json
+import shutil
+import zlib
 from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pandas as pd
 
+from petrelpy.progress import track_lines
+
+if TYPE_CHECKING:
+    import dask.dataframe as dd
+
 COL_NAMES_TRAJECTORY = [
     "MD_ENTRY",
     "GRID_I",
@@ -28,12 +39,29 @@ COL_NAMES_TRAJECTORY = [
     "WELL_EXIT_Z",
     "EXIT_FACE",
 ]
+# always parsed, to find the lateral and describe the well's path through the grid
+PROJECTED_TRAJECTORY_COLUMNS = ["MD_ENTRY", "GRID_I", "GRID_J", "GRID_K"]
+WELL_INDEX_COLUMNS = ["Name", "offset", "length"]
+FACE_COLUMNS = ["ENTRY_FACE", "EXIT_FACE"]
+# written inside a trajectory dataset, hidden from parquet readers by the underscore
+TRAJECTORY_DATASET_INFO = "_trajectories.json"
 TRAJECTORY_AGG = {
     "MD_ENTRY": "min",
     "GRID_I": "std",
     "GRID_J": "std",
     "GRID_K": "std",
 }
+# parsed to measure the laterals, see lateral_geometry
+GEOMETRY_COLUMNS = [
+    "MD_ENTRY",
+    "MD_EXIT",
+    "WELL_ENTRY_X",
+    "WELL_ENTRY_Y",
+    "WELL_ENTRY_Z",
+    "WELL_EXIT_X",
+    "WELL_EXIT_Y",
+    "WELL_EXIT_Z",
+]
 
 
 def process_well_connection_file(
@@ -41,6 +69,13 @@ def process_well_connection_file(
     wellname_to_heel: pd.DataFrame,
     property_aggregates: dict[str, Any] | None = None,
     col_names: list[str] | None = None,
+    progress: bool = False,
+    wellnames: list[str] | None = None,
+    max_workers: int | None = None,
+    properties: list[str] | None = None,
+    incremental: bool = False,
+    geometry: bool = False,
+    zone_column: str | None = None,
 ) -> pd.DataFrame:
     """Get average properties along the laterals for a well connection file.
 
@@ -55,6 +90,23 @@ def process_well_connection_file(
             the first few are usually ['MD_ENTRY', 'GRID_I', 'GRID_J', 'GRID_K','WELL_ENTRY_X',
             'WELL_ENTRY_Y','WELL_ENTRY_Z','ENTRY_FACE','MD_EXIT','WELL_EXIT_X','WELL_EXIT_Y',
             'WELL_EXIT_Z','EXIT_FACE',]
+        progress (bool): whether to log the bytes parsed and the parsing rate
+        wellnames (list[str] | None): only process these wells, reading them directly
+            through the file's well index (see ``get_well_index``). Defaults to None,
+            which processes every well.
+        max_workers (int | None): number of processes to split the wells between, by
+            byte range of the file. Defaults to None, which processes them in this one.
+        properties (list[str] | None): only parse and aggregate these geomodel
+            properties, see ``process_well_lateral``. Defaults to None.
+        incremental (bool): only aggregate wells that are new or changed since the last
+            incremental run, reusing the rows of the rest from the sidecar
+            ``<well_connection_file>.aggregates.json``. Can't be combined with wellnames
+            or max_workers. Defaults to False.
+        geometry (bool): also measure each lateral, adding the columns of
+            ``lateral_geometry``. The laterals' cells are collected as the file is
+            parsed and measured together at the end. Defaults to False.
+        zone_column (str | None): with geometry, the geomodel property holding zones,
+            to count the zones each lateral crosses. Defaults to None.
 
     Output: pd.DataFrame
         DataFrame indexed by UWI, with columns that are the keys of property_aggregates
@@ -63,20 +115,382 @@ def process_well_connection_file(
         as vertical and have their wellname as their index
 
     """
+    args = (wellname_to_heel, property_aggregates, col_names, properties)
+    geometry_columns = None
+    if geometry:
+        geometry_columns = [*GEOMETRY_COLUMNS, *([zone_column] if zone_column else [])]
+        if col_names is not None and zone_column not in (None, *col_names):
+            msg = f"{zone_column} not among the trajectory columns {col_names}"
+            raise ValueError(msg)
+    measure = (geometry_columns, zone_column)
+    if incremental:
+        if wellnames is not None or max_workers:
+            msg = "incremental processing reads the whole file in this process"
+            raise ValueError(msg)
+        return _process_wells_incremental(
+            Path(well_connection_file), args, progress, *measure
+        )
+    if wellnames is None and not max_workers:
+        with Path(well_connection_file).open() as f:
+            lines = (
+                track_lines(f, f"parsing {well_connection_file}", well_connection_file)
+                if progress
+                else f
+            )
+            return _aggregate_wells(get_well(lines), args, *measure)
+
+    index = get_well_index(well_connection_file)
+    if wellnames is not None:
+        index = index[index["Name"].isin(wellnames)]
+    if not max_workers:
+        return _process_wells(well_connection_file, index, args, *measure)
+    with ProcessPoolExecutor(max_workers) as executor:
+        parts = executor.map(
+            _process_wells,
+            repeat(well_connection_file),
+            partition_well_index(index, max_workers),
+            repeat(args),
+            *(repeat(arg) for arg in measure),
+        )
+        return pd.concat(list(parts))
+
+
+def _process_wells(
+    well_connection_file: str | Path,
+    index: pd.DataFrame,
+    args: tuple,
+    geometry_columns: list[str] | None = None,
+    zone_column: str | None = None,
+) -> pd.DataFrame:
+    """Process the wells listed in part of a well index."""
+    return _aggregate_wells(
+        read_wells(well_connection_file, index), args, geometry_columns, zone_column
+    )
+
+
+def _aggregate_wells(
+    well_strings: Iterator[str],
+    args: tuple,
+    geometry_columns: list[str] | None = None,
+    zone_column: str | None = None,
+) -> pd.DataFrame:
+    """Aggregate each well's lateral, and measure the laterals if asked to."""
+    if geometry_columns is None:
+        return pd.DataFrame([process_well_lateral(ws, *args) for ws in well_strings])
+    rows, laterals = [], []
+    for well_string in well_strings:
+        row, lateral = _process_lateral(well_string, *args, geometry_columns)
+        rows.append(row)
+        laterals.append(lateral)
+    return _add_geometry(pd.DataFrame(rows), laterals, zone_column)
+
+
+def _add_geometry(
+    aggregates: pd.DataFrame,
+    laterals: list[pd.DataFrame | None],
+    zone_column: str | None = None,
+) -> pd.DataFrame:
+    """Measure the laterals in one grouped pass and put the results in their rows.
+
+    laterals lines up with the rows of aggregates; rows with None keep their values.
+    """
+    measured = {i: lateral for i, lateral in enumerate(laterals) if lateral is not None}
+    if not measured:
+        return aggregates
+    cells = pd.concat(measured, names=["row", None]).reset_index(level="row")
+    geometry = lateral_geometry(cells, by="row", zone_column=zone_column)
+    aggregates = aggregates.copy()
+    positions = pd.RangeIndex(len(aggregates))
+    for col in geometry.columns:
+        values = geometry[col].reindex(positions)
+        if col in aggregates.columns:
+            values = values.where(
+                positions.isin(geometry.index), aggregates[col].to_numpy()
+            )
+        aggregates[col] = values.to_numpy()
+    return aggregates
+
+
+def lateral_geometry(
+    cells: pd.DataFrame, by: str = "Name", zone_column: str | None = None
+) -> pd.DataFrame:
+    """Measure wells from their trajectory cells, with grouped reductions over all wells.
+
+    The heel is the entry of the cell with the least MD_ENTRY and the toe the exit of
+    the cell with the greatest MD_EXIT. The columns are:
+
+    - LATERAL_LENGTH: measured depth from the heel to the toe
+    - TVD_MIN, TVD_MAX and TVD_RANGE: extremes of the entry and exit Z, and their
+      difference
+    - AZIMUTH: direction from the heel to the toe in degrees clockwise from grid north
+    - ZONES_CROSSED: number of distinct values of zone_column, when it is given
+
+    Args:
+        cells (pd.DataFrame): trajectory cells of any number of wells, with the
+            ``GEOMETRY_COLUMNS``, e.g. from ``load_trajectories``
+        by (str, optional): column naming the well of each cell. Defaults to "Name".
+        zone_column (str | None, optional): geomodel property holding zones. Defaults
+            to None.
+
+    Returns:
+        pd.DataFrame: one row per well, indexed by the values of by
+
+    """
+    cells = cells.reset_index(drop=True)
+    grouped = cells.groupby(by, sort=False)
+    heel = grouped["MD_ENTRY"].idxmin().to_numpy()
+    toe_labels = grouped["MD_EXIT"].idxmax()
+    toe = toe_labels.to_numpy()
+    tvd_min = np.fmin(grouped["WELL_ENTRY_Z"].min(), grouped["WELL_EXIT_Z"].min())
+    tvd_max = np.fmax(grouped["WELL_ENTRY_Z"].max(), grouped["WELL_EXIT_Z"].max())
+    east = cells["WELL_EXIT_X"].to_numpy()[toe] - cells["WELL_ENTRY_X"].to_numpy()[heel]
+    north = (
+        cells["WELL_EXIT_Y"].to_numpy()[toe] - cells["WELL_ENTRY_Y"].to_numpy()[heel]
+    )
+    geometry = pd.DataFrame(
+        {
+            "LATERAL_LENGTH": cells["MD_EXIT"].to_numpy()[toe]
+            - cells["MD_ENTRY"].to_numpy()[heel],
+            "TVD_MIN": tvd_min,
+            "TVD_MAX": tvd_max,
+            "TVD_RANGE": tvd_max - tvd_min,
+            "AZIMUTH": np.degrees(np.arctan2(east, north)) % 360,
+        },
+        index=toe_labels.index,
+    )
+    if zone_column is not None:
+        geometry["ZONES_CROSSED"] = grouped[zone_column].nunique()
+    return geometry
+
+
+def export_trajectories(
+    well_connection_file: str | Path,
+    output_dir: str | Path,
+    col_names: list[str] | None = None,
+    n_buckets: int = 16,
+    batch_rows: int = 1_000_000,
+    progress: bool = False,
+) -> Path:
+    """Write every cell of every well trajectory to a partitioned parquet dataset.
+
+    The file is streamed a well at a time and written in batches, so memory use is set
+    by batch_rows rather than the size of the file. Each well's cells go to the
+    partition ``bucket=<crc32 of the name mod n_buckets>``, so one well is always read
+    from one partition (see ``load_trajectories``). GRID columns are stored as integers,
+    the faces as strings and everything else as floats, with -999 as missing.
+
+    Args:
+        well_connection_file (str | Path): Eclipse well connection file exported from
+            Petrel
+        output_dir (str | Path): folder for the dataset, replaced if it holds an earlier
+            export
+        col_names (list[str] | None, optional): columns for the trajectory. Defaults to
+            None, which reads them from the file's TRAJECTORY_COLUMN_ORDER.
+        n_buckets (int, optional): number of partitions. Defaults to 16.
+        batch_rows (int, optional): cells to collect before writing. Defaults to 1e6.
+        progress (bool, optional): whether to log the bytes parsed and the parsing rate.
+            Defaults to False.
+
+    Returns:
+        Path: the dataset folder
+
+    Raises:
+        FileExistsError: if output_dir exists and is not a trajectory dataset
+
+    """
+    output_dir = Path(output_dir)
+    if output_dir.exists() and not (output_dir / TRAJECTORY_DATASET_INFO).is_file():
+        msg = f"{output_dir} exists and is not a trajectory dataset, not replacing it"
+        raise FileExistsError(msg)
+    if col_names is None:
+        col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(
+            well_connection_file
+        )
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    def write(batch: list[pd.DataFrame]) -> None:
+        # each batch adds its own files to the partitions, named by the batch number
+        cells = _typed_trajectory(pd.concat(batch, ignore_index=True))
+        cells.to_parquet(
+            tmp_dir,
+            engine="pyarrow",
+            partition_cols=["bucket"],
+            index=False,
+            basename_template=f"part-{n_batches}-{{i}}.parquet",
+        )
+
+    batch, rows, n_batches = [], 0, 0
     with Path(well_connection_file).open() as f:
-        property_frame = pd.DataFrame(
-            [
-                process_well_lateral(
-                    ws, wellname_to_heel, property_aggregates, col_names
-                )
-                for ws in get_well(f)
-            ]
+        lines = (
+            track_lines(f, f"exporting {well_connection_file}", well_connection_file)
+            if progress
+            else f
+        )
+        for well_string in get_well(lines):
+            trajectory = get_trajectory(well_string, col_names)
+            if trajectory.empty:
+                continue
+            wellname = get_wellname(well_string)
+            bucket = zlib.crc32(wellname.encode()) % n_buckets
+            batch.append(trajectory.assign(Name=wellname, bucket=bucket))
+            rows += len(trajectory)
+            if rows >= batch_rows:
+                write(batch)
+                batch, rows, n_batches = [], 0, n_batches + 1
+    if batch:
+        write(batch)
+    with (tmp_dir / TRAJECTORY_DATASET_INFO).open("w") as f:
+        json.dump({"n_buckets": n_buckets, "columns": col_names}, f)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    tmp_dir.replace(output_dir)
+    return output_dir
+
+
+def _typed_trajectory(cells: pd.DataFrame) -> pd.DataFrame:
+    """Give trajectory cells the same types whatever values a batch happens to hold."""
+    types = {
+        col: (
+            str
+            if col in ("Name", *FACE_COLUMNS)
+            else "int32" if col.startswith("GRID_") or col == "bucket" else "float64"
         )
-    return property_frame
+        for col in cells.columns
+    }
+    return cells[["Name", *cells.columns.drop("Name")]].astype(types)
+
 
+def load_trajectories(
+    dataset: str | Path,
+    wellnames: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> dd.DataFrame:
+    """Load trajectory cells written by ``export_trajectories``.
+
+    Args:
+        dataset (str | Path): folder written by ``export_trajectories``
+        wellnames (list[str] | None, optional): only load these wells, reading just
+            the partitions they hash to. Defaults to None, which loads every well.
+        columns (list[str] | None, optional): columns to load besides Name. Defaults
+            to None, which loads every column.
+
+    Returns:
+        dd.DataFrame: one row per trajectory cell
+
+    """
+    import dask.dataframe as dd  # noqa: PLC0415
+
+    filters = None
+    if wellnames is not None:
+        with (Path(dataset) / TRAJECTORY_DATASET_INFO).open() as f:
+            n_buckets = json.load(f)["n_buckets"]
+        buckets = sorted({zlib.crc32(name.encode()) % n_buckets for name in wellnames})
+        filters = [("bucket", "in", buckets)]
+    if columns is not None:
+        columns = ["Name", *(col for col in columns if col != "Name")]
+    cells = dd.read_parquet(dataset, columns=columns, filters=filters)
+    if wellnames is not None:
+        cells = cells[cells["Name"].isin(wellnames)]
+    return cells
+
+
+def _process_wells_incremental(
+    well_connection_file: Path,
+    args: tuple,
+    progress: bool,
+    geometry_columns: list[str] | None = None,
+    zone_column: str | None = None,
+) -> pd.DataFrame:
+    """Process a well connection file, reusing the rows of wells that have not changed.
 
-def get_wellnames(wc_file: str | Path) -> list[str]:
-    """Get all the well names from a well connection file."""
+    The sidecar records, for each well, a digest of its section of the file and of its
+    row in the heel table, along with its aggregated row. It is only reused if the
+    aggregation settings are the same.
+    """
+    wellname_to_heel, property_aggregates, col_names, properties = args
+    sidecar = well_connection_file.with_name(
+        well_connection_file.name + ".aggregates.json"
+    )
+    settings = json.dumps(
+        [property_aggregates, col_names, properties, geometry_columns],
+        default=_describe_aggregate,
+    )
+    previous = {}
+    if sidecar.exists():
+        with sidecar.open() as f:
+            state = json.load(f)
+        if state.get("settings") == settings:
+            previous = state["wells"]
+
+    heels = wellname_to_heel.drop_duplicates("Name")
+    heel_hashes = dict(
+        zip(heels["Name"], pd.util.hash_pandas_object(heels, index=False).to_numpy())
+    )
+    rows, laterals, digests = [], [], []
+    with well_connection_file.open() as f:
+        lines = (
+            track_lines(f, f"parsing {well_connection_file}", well_connection_file)
+            if progress
+            else f
+        )
+        for well_string in get_well(lines):
+            wellname = get_wellname(well_string)
+            digest = hashlib.blake2b(well_string.encode(), digest_size=16)
+            digest.update(str(heel_hashes.get(wellname)).encode())
+            digest = digest.hexdigest()
+            cached = previous.get(wellname)
+            lateral = None
+            if cached is not None and cached["digest"] == digest:
+                row = pd.Series(cached["row"], name=cached["uwi"])
+            elif geometry_columns is None:
+                row = process_well_lateral(well_string, *args)
+            else:
+                row, lateral = _process_lateral(well_string, *args, geometry_columns)
+            digests.append((wellname, digest))
+            rows.append(row)
+            laterals.append(lateral)
+
+    aggregates = pd.DataFrame(rows)
+    if geometry_columns is not None:
+        aggregates = _add_geometry(aggregates, laterals, zone_column)
+        rows = [row for _, row in aggregates.iterrows()]
+    wells = {
+        wellname: {
+            "digest": digest,
+            "uwi": _plain(row.name),
+            "row": {key: _plain(value) for key, value in row.items()},
+        }
+        for (wellname, digest), row in zip(digests, rows)
+    }
+
+    tmp_file = sidecar.with_name(sidecar.name + ".tmp")
+    with tmp_file.open("w") as f:
+        json.dump({"settings": settings, "wells": wells}, f)
+    tmp_file.replace(sidecar)
+    return aggregates
+
+
+def _describe_aggregate(aggregate: Any) -> str:
+    """Name an aggregation function the same way from one run to the next."""
+    module = getattr(aggregate, "__module__", "")
+    return f"{module}.{getattr(aggregate, '__qualname__', aggregate)}"
+
+
+def _plain(value: Any) -> Any:
+    """Turn numpy scalars into the python values json can hold."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def get_wellnames(wc_file: str | Path, use_index: bool = False) -> list[str]:
+    """Get all the well names from a well connection file.
+
+    With use_index, the names come from the file's well index (see ``get_well_index``),
+    which is built on the first call and makes later calls instant.
+    """
+    if use_index:
+        return get_well_index(wc_file)["Name"].tolist()
     with Path(wc_file).open() as f:
         wellnames = [
             row.replace("WELLNAME", "").strip()
@@ -86,6 +500,104 @@ def get_wellnames(wc_file: str | Path) -> list[str]:
     return wellnames
 
 
+def get_well_index(wc_file: str | Path, rebuild: bool = False) -> pd.DataFrame:
+    """Get the byte offset and length of each well in a well connection file.
+
+    The index is built in one pass over the file and saved next to it as
+    ``<wc_file>.index.json``, along with the file's size, modification time and a hash
+    of its first and last megabyte. Later calls load the saved index unless the file
+    has changed.
+
+    Args:
+        wc_file (str | Path): Eclipse well connection file exported from Petrel
+        rebuild (bool, optional): rebuild the index even if the saved one is current.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: Name, offset and length of each well's section, in file order
+
+    """
+    wc_file = Path(wc_file)
+    sidecar = wc_file.with_name(wc_file.name + ".index.json")
+    fingerprint = _fingerprint(wc_file)
+    if sidecar.exists() and not rebuild:
+        with sidecar.open() as f:
+            saved = json.load(f)
+        if saved.get("fingerprint") == fingerprint:
+            return pd.DataFrame(saved["wells"], columns=WELL_INDEX_COLUMNS)
+
+    wells = []
+    start = wellname = None
+    offset = 0
+    with wc_file.open("rb") as f:
+        for row in f:
+            if row.startswith(b"WELLNAME"):
+                start = offset
+                wellname = row[len(b"WELLNAME") :].strip().decode()
+            elif row.startswith(b"END_TRAJECTORY") and start is not None:
+                wells.append((wellname, start, offset + len(row) - start))
+                start = None
+            offset += len(row)
+
+    tmp_file = sidecar.with_name(sidecar.name + ".tmp")
+    with tmp_file.open("w") as f:
+        json.dump({"fingerprint": fingerprint, "wells": wells}, f)
+    tmp_file.replace(sidecar)
+    return pd.DataFrame(wells, columns=WELL_INDEX_COLUMNS)
+
+
+def _fingerprint(fname: Path, sample: int = 2**20) -> dict[str, Any]:
+    """Identify a version of a file without reading all of it."""
+    stat = fname.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    with fname.open("rb") as f:
+        digest.update(f.read(sample))
+        f.seek(max(stat.st_size - sample, 0))
+        digest.update(f.read(sample))
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "digest": digest.hexdigest(),
+    }
+
+
+def read_wells(wc_file: str | Path, index: pd.DataFrame) -> Iterator[str]:
+    """Read the sections of the wells in (part of) a well index, seeking to each one.
+
+    Args:
+        wc_file (str | Path): Eclipse well connection file exported from Petrel
+        index (pd.DataFrame): rows of ``get_well_index(wc_file)`` for the wells to read
+
+    Yields:
+        Iterator[str]: string containing well properties, as from ``get_well``
+
+    """
+    with Path(wc_file).open("rb") as f:
+        for offset, length in index[["offset", "length"]].itertuples(index=False):
+            f.seek(offset)
+            yield f.read(length).decode().replace("\r\n", "\n")
+
+
+def partition_well_index(index: pd.DataFrame, n: int) -> list[pd.DataFrame]:
+    """Split a well index into n runs of consecutive wells with about equal bytes.
+
+    Args:
+        index (pd.DataFrame): well index from ``get_well_index``
+        n (int): number of parts, e.g. one per worker
+
+    Returns:
+        list[pd.DataFrame]: the parts, in file order. Some are empty if there are fewer
+            wells than parts.
+
+    """
+    end = index["length"].cumsum().to_numpy()
+    total = end[-1] if len(end) else 0
+    # each well goes to the part its midpoint falls in
+    middle = end - index["length"].to_numpy() / 2
+    part = np.minimum((middle * n // max(total, 1)).astype(int), n - 1)
+    return [index[part == i] for i in range(n)]
+
+
 def get_trajectory_geomodel_columns(fname: str | Path) -> list[str]:
     """Get columns used for well trajectory."""
     with Path(fname).open() as f:
@@ -110,46 +622,74 @@ def process_well_lateral(
     wellname_to_heel: pd.DataFrame,
     property_aggregates: dict[str, Any] | None = None,
     col_names: list[str] | None = None,
+    properties: list[str] | None = None,
 ) -> pd.Series:
     """Get average properties along the well lateral from the geomodel.
 
+    When col_names is given, only MD_ENTRY, the GRID columns and the properties needed
+    are parsed: the keys of property_aggregates, or else the given properties.
+
     Args:
         well_string (str): portion of well connection file containing one well
         wellname_to_heel (pd.DataFrame): DataFrame containing UWI,Name,Depth_heel for each well
             in the connection file
         property_aggregates (dict): mapping from properties to aggregation methods
         col_names (list[str]): columns for the well trajectory
+        properties (list[str] | None): properties to aggregate with the default methods,
+            when property_aggregates is not given. Defaults to None, which aggregates
+            every property.
 
     Returns:
         pd.Series: average properties along the well's lateral
 
     """
+    return _process_lateral(
+        well_string, wellname_to_heel, property_aggregates, col_names, properties
+    )[0]
+
+
+def _process_lateral(
+    well_string: str,
+    wellname_to_heel: pd.DataFrame,
+    property_aggregates: dict[str, Any] | None = None,
+    col_names: list[str] | None = None,
+    properties: list[str] | None = None,
+    geometry_columns: list[str] | None = None,
+) -> tuple[pd.Series, pd.DataFrame | None]:
+    """Aggregate a well's lateral, also returning its cells in geometry_columns."""
     wellname = get_wellname(well_string)
-    trajectory = get_trajectory(well_string, col_names)
+    usecols = None
+    geometry_only = []
+    if col_names is not None:
+        needed = property_aggregates if property_aggregates is not None else properties
+        if needed is not None:
+            usecols = [*PROJECTED_TRAJECTORY_COLUMNS, *needed]
+            if geometry_columns is not None:
+                geometry_only = [col for col in geometry_columns if col not in usecols]
+                usecols += geometry_only
+    trajectory = get_trajectory(well_string, col_names, usecols)
     try:
         uwi_heel = wellname_to_heel[wellname_to_heel["Name"] == wellname].iloc[0]
     except IndexError:
         uwi_heel = pd.Series({"UWI": wellname, "Depth_heel": 0})
-    if trajectory.MD_ENTRY.max() < uwi_heel["Depth_heel"]:
-        lateral = trajectory.iloc[[-1]]
-    else:
-        lateral = trajectory[uwi_heel["Depth_heel"] <= trajectory.MD_ENTRY]
+    lateral = select_lateral(trajectory, uwi_heel["Depth_heel"])
+    cells = None if geometry_columns is None else lateral[geometry_columns]
 
     def mode(series):
         return series.mode().iloc[0]
 
     if property_aggregates is None:
+        # columns only parsed for the geometry aren't aggregated
+        skipped = COL_NAMES_TRAJECTORY + geometry_only
         numeric_cols = trajectory.select_dtypes(include=["number"]).columns.difference(
-            COL_NAMES_TRAJECTORY
+            skipped
         )
         property_aggregates = {
             col: "mean" if all(trajectory[col] != np.round(trajectory[col])) else mode
             for col in numeric_cols
         }
         property_aggregates.update(TRAJECTORY_AGG)
-        for col in lateral.columns.difference(numeric_cols).difference(
-            COL_NAMES_TRAJECTORY
-        ):
+        for col in lateral.columns.difference(numeric_cols).difference(skipped):
             property_aggregates[col] = mode
     properties = lateral.agg(property_aggregates)
     if properties.shape[0] == 0:
@@ -158,27 +698,61 @@ def process_well_lateral(
         properties = properties.iloc[0].rename(uwi_heel["UWI"])
     except AttributeError:
         properties = properties.rename(uwi_heel["UWI"])
-    return properties
+    return properties, cells
+
+
+def select_lateral(trajectory: pd.DataFrame, depth_heel: float) -> pd.DataFrame:
+    """Get the cells of a trajectory from the heel on.
+
+    Args:
+        trajectory (pd.DataFrame): a well's trajectory, as from ``get_trajectory``
+        depth_heel (float): measured depth of the heel, 0 for vertical wells
+
+    Returns:
+        pd.DataFrame: cells entered at or below the heel, or the last cell when the
+            trajectory ends above the heel
+
+    """
+    if trajectory.MD_ENTRY.max() < depth_heel:
+        return trajectory.iloc[[-1]]
+    return trajectory[depth_heel <= trajectory.MD_ENTRY]
 
 
 def get_trajectory(
-    well_string: str, col_names: list[str] | None = None
+    well_string: str,
+    col_names: list[str] | None = None,
+    usecols: list[str] | None = None,
 ) -> pd.DataFrame:
     """Get trajectory for a well from the well connection file.
 
     Args:
         well_string (str): well connection file portion
         col_names (list[str]): columns for the trajectory
+        usecols (list[str] | None): only parse these of col_names. Defaults to None,
+            which parses every column.
 
     Returns:
         pd.DataFrame: properties along the trajectory
 
     """
+    if usecols is not None:
+        if col_names is None:
+            msg = "usecols needs col_names to know where the columns are"
+            raise ValueError(msg)
+        missing = [col for col in usecols if col not in col_names]
+        if missing:
+            msg = f"{', '.join(missing)} not among the trajectory columns {col_names}"
+            raise ValueError(msg)
+        usecols = list(dict.fromkeys(usecols))
     trajectory = well_string.split("TRAJECTORY")[1]
     if "END_" in trajectory:
         trajectory = trajectory.split("END_")[0]
     out_frame = pd.read_csv(
-        io.StringIO(trajectory), sep="\\s+", names=col_names, na_values=["-999"]
+        io.StringIO(trajectory),
+        sep="\\s+",
+        names=col_names,
+        usecols=usecols,
+        na_values=["-999"],
     )
     if col_names is None:
         n_extra_cols = len(out_frame.columns) - len(COL_NAMES_TRAJECTORY)
@@ -0,0 +1,220 @@
+"""Test geomodel statistics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from petrelpy import sketch, synthetic
+from petrelpy.cli import cli
+from petrelpy.derived import add_derived_properties
+from petrelpy.gslib import (
+    get_facies_histogram_cubes,
+    get_facies_quantiles,
+    load_from_petrel,
+    summarize_facies,
+    write_gslib,
+)
+
+
+@pytest.fixture(scope="module")
+def geomodel(tmp_path_factory):
+    fname = tmp_path_factory.mktemp("gslib") / "model.gslib"
+    synthetic.write_gslib_model(fname, shape=(30, 20, 10), n_wells=5)
+    return load_from_petrel(fname, npartitions=7)
+
+
+def test_load_from_petrel_subset(tmp_path):
+    fname = synthetic.write_gslib_model(tmp_path / "model.gslib", shape=(10, 8, 5))
+    cells = load_from_petrel(fname).compute()
+    x0, y0 = cells["x_coord"].min(), cells["y_coord"].min()
+
+    subset = load_from_petrel(
+        fname, bbox=(x0, y0, x0 + 1000, y0 + 600), k_range=(2, None)
+    ).compute()
+    expected = cells[
+        (cells["x_coord"] <= x0 + 1000)
+        & (cells["y_coord"] <= y0 + 600)
+        & (cells["k_index"] >= 2)
+    ]
+    pd.testing.assert_frame_equal(subset, expected)
+
+    # triangle over the lower left half of the grid, diagonal excluded
+    width = cells["x_coord"].max() - x0 + 1
+    triangle = [(x0 - 1, y0 - 1), (x0 + width, y0 - 1), (x0 - 1, y0 + width)]
+    subset = load_from_petrel(fname, polygon=triangle).compute()
+    dx, dy = cells["x_coord"] - x0, cells["y_coord"] - y0
+    pd.testing.assert_frame_equal(subset, cells[dx + dy < width - 2])
+
+
+def test_get_facies_quantiles(geomodel):
+    properties = ["Porosity", "Sw"]
+    stats = get_facies_quantiles(geomodel, properties=properties, quantiles=(0.1, 0.9))
+    exact = geomodel.compute().groupby(["Mainzones", "Facies"])
+
+    for p in properties:
+        pd.testing.assert_series_equal(
+            stats[(p, "mean")], exact[p].mean(), check_names=False
+        )
+        pd.testing.assert_series_equal(
+            stats[(p, "var")], exact[p].var(), check_names=False
+        )
+        for q in (0.1, 0.9):
+            estimate = stats[(p, f"P{100 * q:g}")]
+            low = exact[p].quantile(q, interpolation="lower")
+            high = exact[p].quantile(q, interpolation="higher")
+            accuracy = sketch.DEFAULT_RELATIVE_ACCURACY
+            assert (estimate >= low * (1 - accuracy) - 1e-12).all()
+            assert (estimate <= high * (1 + accuracy) + 1e-12).all()
+
+
+def test_sketch_merge_matches_whole():
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        {"zone": rng.integers(0, 3, 5000), "value": rng.normal(0, 10, 5000)}
+    )
+    whole = sketch.summarize(frame, ["zone"], ["value"])
+    parts = sketch.merge(
+        *(
+            sketch.summarize(frame.iloc[i : i + 700], ["zone"], ["value"])
+            for i in range(0, 5000, 700)
+        )
+    )
+    pd.testing.assert_frame_equal(parts.moments, whole.moments, check_dtype=False)
+    pd.testing.assert_series_equal(parts.buckets, whole.buckets, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        sketch.quantiles(parts, [0.5]), sketch.quantiles(whole, [0.5])
+    )
+
+
+def test_summarize_facies(geomodel):
+    properties = ["Porosity", "Sw"]
+    summaries = summarize_facies(
+        {"a": geomodel, "b": geomodel[geomodel["Mainzones"] == 1]},
+        properties=properties,
+    )
+    cells = geomodel.compute()
+    a = summaries["a"]
+    pd.testing.assert_series_equal(
+        a.stats["OOIP"],
+        cells.groupby(["Mainzones", "Facies"])["OOIP"].sum(),
+        check_names=False,
+    )
+    pd.testing.assert_series_equal(a.prop_max, cells[properties].max())
+
+    # each column holds the OOIP of a zone and facies, binned by percent of max
+    zone, face = 2, 3
+    cut = cells[(cells["Mainzones"] == zone) & (cells["Facies"] == face)]
+    expected, edges = np.histogram(
+        cut["Sw"], np.linspace(0, a.prop_max["Sw"], 101), weights=cut["OOIP"]
+    )
+    np.testing.assert_allclose(a.ooip_splits[(zone, face, "Sw")], expected)
+    np.testing.assert_allclose(a.index_conversion["Sw"], edges[:-1])
+    assert set(summaries["b"].ooip_splits.columns.unique("Zone")) == {1}
+
+
+def test_get_facies_histogram_cubes(geomodel):
+    edges = [0, 0.05, 0.1, 0.2]
+    cubes = get_facies_histogram_cubes(
+        geomodel,
+        properties=["Porosity", "Sw"],
+        weight_name=None,
+        bins={"Porosity": edges, "Sw": 4},
+    )
+    cells = geomodel.compute()
+    assert cubes.cubes["Porosity"].shape == (3, 4, 3)
+    assert cubes.cubes["Sw"].shape == (3, 4, 4)
+    # cell counts, with the maximum in the last bin
+    assert cubes.cubes["Sw"].sum() == cells["Sw"].notna().sum()
+    in_range = cells["Porosity"].between(0, 0.2)
+    assert cubes.cubes["Porosity"].sum() == in_range.sum()
+    np.testing.assert_array_equal(cubes.edges["Porosity"], edges)
+
+
+def test_cli_facies(tmp_path):
+    models = []
+    for realization in range(2):
+        models.append(tmp_path / f"realization{realization}.gslib")
+        synthetic.write_gslib_model(models[-1], shape=(8, 6, 4), seed=realization)
+    args = ["facies", *map(str, models), "-p", "Porosity", "-o", f"{tmp_path}"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    for realization in range(2):
+        for suffix in ["summary", "hist", "hist_converter", "property_maxes"]:
+            assert (tmp_path / f"realization{realization}_{suffix}.csv").exists()
+
+
+def test_add_derived_properties(tmp_path, geomodel):
+    properties = {
+        "HCPV": "Bulkvolume * Porosity * (1 - Sw)",
+        "OOIP_derived": "HCPV / Bo / 5.615",
+        "net": "Porosity >= cutoff",
+    }
+    constants = {"Bo": 1.2, "cutoff": 0.05}
+    cells = geomodel.compute()
+    hcpv = cells["Bulkvolume"] * cells["Porosity"] * (1 - cells["Sw"])
+
+    for _ in range(2):  # computes and caches, then reads the cache
+        derived = add_derived_properties(
+            geomodel, properties, constants, cache_dir=tmp_path
+        ).compute()
+        pd.testing.assert_series_equal(derived["HCPV"], hcpv, check_names=False)
+        np.testing.assert_allclose(
+            derived["OOIP_derived"], cells["OOIP"], rtol=0.01, atol=0.01
+        )
+        assert derived["net"].sum() == (cells["Porosity"] >= 0.05).sum()
+    (cache,) = tmp_path.iterdir()
+    assert len(list(cache.glob("part.*.parquet"))) == geomodel.npartitions
+
+    with pytest.raises(ValueError, match="Bogus"):
+        add_derived_properties(geomodel, {"x": "Bogus * 2"})
+
+
+def test_cli_facies_derived(tmp_path):
+    model = synthetic.write_gslib_model(tmp_path / "model.gslib", shape=(8, 6, 4))
+    args = ["facies", f"{model}", "-o", f"{tmp_path}", "-p", "Porosity"]
+    args += ["-e", "HCPV=Bulkvolume*Porosity*(1-Sw)", "-e", "STOIIP=HCPV/Bo/5.615"]
+    args += ["-c", "Bo=1.2", "--ooip", "STOIIP", "-a", "STOIIP=sum"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    summary = pd.read_csv(tmp_path / "model_summary.csv")
+    cells = load_from_petrel(model).compute()
+    assert summary["STOIIP"].sum() == pytest.approx(cells["OOIP"].sum(), rel=1e-4)
+
+
+def test_cli_gslib_subset(tmp_path):
+    fname = synthetic.write_gslib_model(tmp_path / "model.gslib", shape=(6, 5, 4))
+    polygon = tmp_path / "polygon.csv"
+    polygon.write_text("x,y\n0,0\n1e9,0\n1e9,1e9\n0,1e9\n")
+    output = tmp_path / "subset.csv"
+    args = ["gslib", f"{fname}", "-o", f"{output}", "--output_format", "csv"]
+    args += ["--k-range", "2", "3", "--polygon", f"{polygon}"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert set(pd.read_csv(output)["k_index"]) == {2, 3}
+
+
+def test_write_gslib(tmp_path, geomodel):
+    fname = write_gslib(geomodel, tmp_path / "model.gslib", decimals=3)
+    cells = geomodel.compute().reset_index(drop=True)
+    written = load_from_petrel(fname).compute().reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        written, cells, check_dtype=False, rtol=0, atol=5.001e-4
+    )
+
+    frame = pd.DataFrame(
+        {"i": [1, 20], "x": [-0.25, np.nan], "zone": ["a", None], "w": [True, False]}
+    )
+    lines = write_gslib(frame, tmp_path / "small.gslib").read_text().splitlines()
+    assert lines[:3] == ["PETREL: Properties", "4", "i unit1 scale1"]
+    assert lines[6:] == ["1 -0.25 a 1", "20 -999 -999 0"]
+
+    # back from parquet through the cli
+    geomodel.to_parquet(tmp_path / "model.parquet", write_index=False)
+    output = tmp_path / "from_parquet.gslib"
+    args = ["to-gslib", f"{tmp_path / 'model.parquet'}", "-o", f"{output}", "-d", "3"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert output.read_text() == fname.read_text()
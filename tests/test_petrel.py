@@ -2,13 +2,38 @@
 
 from __future__ import annotations
 
+import gzip
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+import time
 from pathlib import Path
+from zipfile import ZipFile
 
 import pandas as pd
 import pytest
 from click.testing import CliRunner
 
-from petrelpy.cli import cli
+from petrelpy import petrel, progress, synthetic
+from petrelpy.cli import _read_heels, cli
+from petrelpy.compression import open_text
+from petrelpy.gslib import load_from_petrel
+from petrelpy.petrel import (
+    collect_perfs,
+    export_vol,
+    format_petrel_dates,
+    get_raw_table,
+    read_excel_sheet,
+    read_perfs_ev,
+    read_petrel_tops,
+    read_production,
+    read_vol,
+    write_blocks,
+    write_tops,
+)
 from petrelpy.wellconnection import (
     COL_NAMES_TRAJECTORY,
     get_trajectory_geomodel_columns,
@@ -40,6 +65,106 @@ def test_cli_production(yearly):
             assert test_output == output_vol
 
 
+def test_cli_production_zip(tmp_path):
+    data = Path(__file__).parent / "data"
+    raw = pd.read_csv(data / "test_monthly_prod.csv", dtype=str)
+    raw.iloc[:2].to_excel(
+        tmp_path / "a_Monthly Production.xlsx",
+        sheet_name="Monthly Production",
+        index=False,
+    )
+    archive = tmp_path / "prod.zip"
+    with ZipFile(archive, "w") as zf:
+        zf.write(tmp_path / "a_Monthly Production.xlsx", "a_Monthly Production.xlsx")
+        zf.writestr("b_Monthly Production.csv", raw.iloc[2:].to_csv(index=False))
+        zf.writestr("b_Yearly Production.csv", "not,production\n")
+    out_file = tmp_path / "prod.vol"
+    result = CliRunner().invoke(
+        cli, ["production", f"{archive}", "--zip", "-o", f"{out_file}"]
+    )
+    assert result.exit_code == 0, result.output
+    assert out_file.read_text() == (data / "test_monthly_prod.vol").read_text()
+
+
+def test_cli_profile(tmp_path):
+    input_csv = Path(__file__).parent / "data/test_monthly_prod.csv"
+    profile_file = tmp_path / "production.prof"
+    args = ["--profile", "--profile-output", f"{profile_file}", "production"]
+    args += [f"{input_csv}", "-o", f"{tmp_path / 'prod.vol'}"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0
+    stages = [line.split()[0] for line in result.stderr.splitlines()[1:]]
+    assert stages == ["read", "write", "total"]
+    data = Path(__file__).parent / "data"
+    expected = (data / "test_monthly_prod.vol").read_text()
+    assert (tmp_path / "prod.vol").read_text() == expected
+    functions = {name for _, _, name in pstats.Stats(str(profile_file)).stats}
+    assert "_vol_block" in functions
+    # the writer thread is profiled too
+    assert "drain" in functions
+
+
+def test_cli_progress(tmp_path, caplog):
+    input_csv = Path(__file__).parent / "data/test_monthly_prod.csv"
+    args = ["--progress", "production", f"{input_csv}"]
+    args += ["-o", f"{tmp_path / 'prod.vol'}"]
+    with caplog.at_level("INFO", logger="petrelpy"):
+        result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0
+    assert "writing " in caplog.text
+    assert "wells/s, done in" in caplog.text
+
+
+def test_track_lines(tmp_path, monkeypatch):
+    # windows line endings, which reading translates to one character
+    data = "naïve ✓ 42\r\nplain 7\r\n".encode() * 1000
+    plain = tmp_path / "lines.txt"
+    plain.write_bytes(data)
+    compressed = tmp_path / "lines.txt.gz"
+    with gzip.open(compressed, "wb") as f:
+        f.write(data)
+
+    trackers = []
+
+    class Recording(progress.Progress):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            trackers.append(self)
+
+    monkeypatch.setattr(progress, "Progress", Recording)
+    text = data.decode().replace("\r\n", "\n")
+    for fname in (plain, compressed):
+        with open_text(fname, encoding="utf-8") as f:
+            assert "".join(progress.track_lines(f, "reading", fname)) == text
+    # bytes of the file, not characters, and no total for the compressed size
+    assert trackers[0].done == trackers[0].total == len(data)
+    assert trackers[1].done == len(data)
+    assert trackers[1].total is None
+    assert list(progress.track_lines(["é\n"], "reading")) == ["é\n"]
+    assert trackers[2].done == 3
+
+
+def test_cli_startup():
+    code = (
+        "import sys, petrelpy.cli; "
+        "print(*sorted({m.split('.')[0] for m in sys.modules} & "
+        "{'pandas', 'dask', 'numpy', 'scipy', 'fastparquet', 'trogon'}))"
+    )
+    heavy = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert heavy == []
+
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "from petrelpy.cli import cli; cli(['--help'])"],
+        capture_output=True,
+        check=True,
+    )
+    # generous budget for slow CI machines; importing pandas and dask alone takes ~2 s
+    assert time.perf_counter() - start < 1.5
+
+
 def test_cli_wellconnection():
     runner = CliRunner()
     with runner.isolated_filesystem() as td:
@@ -61,6 +186,57 @@ def test_cli_wellconnection():
             assert f_output.read() == f_benchmark.read()
 
 
+def test_cli_batch(tmp_path):
+    data = Path(__file__).parent / "data"
+    jobs = [
+        {"command": "production", "input": f"{data / 'test_monthly_prod.csv'}"},
+        {"command": "perforation", "input": [f"{data / 'test_perf.csv'}"]},
+    ]
+    jobs[0]["output"] = f"{tmp_path / 'prod.vol'}"
+    jobs[1]["output"] = f"{tmp_path / 'perf.ev'}"
+    for name in ["a", "b"]:
+        jobs.append(
+            {
+                "command": "connection",
+                "input": f"{data / 'test_wcf.wcf'}",
+                "heel": f"{data / 'test_heels.csv'}",
+                "output": f"{tmp_path / name}.csv",
+            }
+        )
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"jobs": jobs}))
+
+    _read_heels.cache_clear()
+    result = CliRunner().invoke(cli, ["batch", f"{manifest}", "--workers", "2"])
+    assert result.exit_code == 0, result.output
+    assert _read_heels.cache_info().misses == 1
+    assert (tmp_path / "prod.vol").read_text() == (
+        data / "test_monthly_prod.vol"
+    ).read_text()
+    for name in ["a", "b"]:
+        assert (tmp_path / f"{name}.csv").read_text() == (
+            data / "test_wcf.csv"
+        ).read_text()
+
+    manifest.write_text(json.dumps([{"command": "production", "yearly": "maybe"}]))
+    result = CliRunner().invoke(cli, ["batch", f"{manifest}"])
+    assert result.exit_code != 0
+
+    # options go by their long names, as on the command line
+    model = synthetic.write_gslib_model(tmp_path / "model.gslib", shape=(4, 3, 2))
+    job = {"command": "facies", "models": f"{model}", "output-dir": f"{tmp_path}"}
+    manifest.write_text(json.dumps([{**job, "property": ["Porosity", "Sw"]}]))
+    result = CliRunner().invoke(cli, ["batch", f"{manifest}"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "model_summary.csv").exists()
+
+    # profiles of jobs running at once would mix together
+    args = ["--profile", "batch", f"{manifest}", "--workers", "2"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 2
+    assert "--workers" in result.output
+
+
 @pytest.mark.parametrize("output_format", ["ev", "prn"])
 @pytest.mark.parametrize("input_format", ["csv", "xlsx", "prn"])
 def test_cli_perforations(input_format, output_format):
@@ -90,6 +266,39 @@ def test_cli_perforations(input_format, output_format):
             assert f_output.read() == f_benchmark.read()
 
 
+def test_get_raw_table_excel_cache(tmp_path, monkeypatch):
+    perfs = pd.read_csv(Path(__file__).parent / "data/test_perf.csv")
+    workbook = tmp_path / "perfs.xlsx"
+    perfs.to_excel(workbook, index=False)
+    expected = pd.read_excel(workbook, index_col=0)
+
+    chunks = list(read_excel_sheet(workbook, chunksize=2))
+    assert [len(chunk) for chunk in chunks[:-1]] == [2] * (len(chunks) - 1)
+    pd.testing.assert_frame_equal(get_raw_table(workbook), expected)
+
+    table = get_raw_table(workbook, cache=True)
+    cache_file = tmp_path / "perfs.xlsx.0.parquet"
+    assert cache_file.exists()
+    cached = pd.read_parquet(cache_file).assign(stop_depth=0)
+    cached.to_parquet(cache_file)
+    pd.testing.assert_frame_equal(get_raw_table(workbook, cache=True), cached)
+
+    # a workbook saved after the cache replaces it
+    stale = cache_file.stat().st_mtime_ns - 10**9
+    os.utime(cache_file, ns=(stale, stale))
+    pd.testing.assert_frame_equal(get_raw_table(workbook, cache=True), table)
+
+    # binary workbooks are left to pandas, which picks pyxlsb or xlrd
+    read = []
+    monkeypatch.setattr(
+        pd, "read_excel", lambda fname, *_args, **_kwargs: read.append(fname) or table
+    )
+    binary = tmp_path / "perfs.xlsb"
+    binary.write_bytes(b"")
+    pd.testing.assert_frame_equal(get_raw_table(binary), table)
+    assert read == [binary]
+
+
 @pytest.mark.parametrize("output_format", ["csv", "parquet"])
 def test_cli_gslib(output_format):
     runner = CliRunner()
@@ -137,3 +346,152 @@ def test_double_trajectory_columns():
         .rename_axis(index="UWI")
     )
     assert "General_1" in aggregates.columns
+
+
+def test_collect_perfs():
+    completions = pd.DataFrame(
+        {
+            "Date Completion": ["2020-03-07", None, "07/04/2021"],
+            "Date First Report": [None, "2019-01-02", None],
+            "Depth Top": [100, 135, 1000],
+            "Depth Base": [110, 144, 2000],
+        },
+        index=pd.Index([45, 30, 30], name="UWI"),
+    )
+    original = completions.copy()
+    perfs = collect_perfs(completions)
+    pd.testing.assert_frame_equal(completions, original)
+    assert list(perfs.index) == [30, 30, 45]
+    assert list(perfs["Date"]) == ["01.02.2019", "07.04.2021", "03.07.2020"]
+
+
+def test_format_petrel_dates():
+    dates = pd.Series(["2020-03-07", None, "2020-03-07", "Jan 5, 2001"])
+    formatted = format_petrel_dates(dates)
+    assert list(formatted[[0, 2, 3]]) == ["03.07.2020", "03.07.2020", "01.05.2001"]
+    assert pd.isna(formatted[1])
+
+
+def test_read_vol():
+    data = Path(__file__).parent / "data"
+    wells = read_vol(data / "test_monthly_prod.vol")
+    assert isinstance(wells["API"].dtype, pd.CategoricalDtype)
+    assert (wells[["Liquid", "Water", "Gas"]].dtypes == "float32").all()
+    production = read_production(data / "test_monthly_prod.csv")
+    assert list(wells["Date"]) == list(production["Date"])
+    assert pytest.approx(production["Liquid"].to_numpy()) == wells["Liquid"].to_numpy()
+    chunks = list(read_vol(data / "test.vol", chunksize=4))
+    assert [len(c) for c in chunks] == [4, 3]
+    assert list(chunks[-1]["Winj"]) == [0, 1000, 1120]
+
+
+def test_read_perfs_ev():
+    perfs = read_perfs_ev(Path(__file__).parent / "data/test_perf.ev")
+    assert list(perfs["API"]) == ["30", "30", "45"]
+    assert list(perfs["start_depth"]) == [100, 135, 1000]
+    assert perfs["Date"].iloc[-1] == pd.Timestamp("2023-05-03")
+
+
+def test_export_vol_incremental(tmp_path, monkeypatch):
+    data = Path(__file__).parent / "data"
+    wells = read_production(data / "test_monthly_prod.csv")
+    second_well = wells.assign(API="42201202460000")
+    outfile = tmp_path / "prod.vol"
+    export_vol(wells, outfile, incremental=True)
+    assert outfile.read_text() == (data / "test_monthly_prod.vol").read_text()
+
+    changed = pd.concat([wells.assign(Gas=wells["Gas"] + 1), second_well])
+    export_vol(changed, outfile, incremental=True)
+    export_vol(changed, tmp_path / "full.vol")
+    assert outfile.read_text() == (tmp_path / "full.vol").read_text()
+
+    # unchanged wells are copied from the previous file rather than re-formatted
+    formatted = []
+
+    def counting(uwi, production):
+        formatted.append(uwi)
+        return original(uwi, production)
+
+    original = petrel._vol_block
+    monkeypatch.setattr(petrel, "_vol_block", counting)
+    export_vol(changed, outfile, incremental=True)
+    assert formatted == []
+
+
+def test_export_vol_incremental_after_full_export(tmp_path):
+    data = Path(__file__).parent / "data"
+    wells = read_production(data / "test_monthly_prod.csv")
+    both = pd.concat([wells, wells.assign(API="42201202460000")])
+    outfile = tmp_path / "prod.vol"
+    export_vol(both, outfile, incremental=True)
+
+    # a full export of other data, then an incremental one of the first data again
+    export_vol(wells.assign(Gas=wells["Gas"] * 2), outfile)
+    assert not (tmp_path / "prod.vol.digest.json").exists()
+    export_vol(both, outfile, incremental=True)
+    export_vol(both, tmp_path / "full.vol")
+    assert outfile.read_text() == (tmp_path / "full.vol").read_text()
+
+    # a sidecar left describing another file is ignored
+    sidecar = (tmp_path / "prod.vol.digest.json").read_text()
+    export_vol(wells.assign(API="42201202470000"), outfile)
+    (tmp_path / "prod.vol.digest.json").write_text(sidecar)
+    export_vol(both, outfile, incremental=True)
+    assert outfile.read_text() == (tmp_path / "full.vol").read_text()
+
+
+def test_write_blocks():
+    groups = [(i, pd.DataFrame({"x": [i]})) for i in range(1000)]
+    f = io.StringIO()
+    write_blocks(f, groups, lambda key, rows: f"{key} {rows['x'].sum()}\n", chunksize=7)
+    assert f.getvalue() == "".join(f"{i} {i}\n" for i in range(1000))
+
+    def fail(key, _rows):
+        if key == 500:
+            raise ValueError(key)
+        return ""
+
+    with pytest.raises(ValueError, match="500"):
+        write_blocks(io.StringIO(), groups, fail, chunksize=7, max_pending=2)
+
+    # errors writing stop the formatting too
+    closed = io.StringIO()
+    closed.close()
+    with pytest.raises(ValueError, match="closed"):
+        write_blocks(closed, groups, lambda key, _rows: f"{key}\n", max_pending=2)
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".zst"])
+def test_compressed_files(tmp_path, suffix):
+    if suffix == ".zst":
+        pytest.importorskip("zstandard")
+    data = Path(__file__).parent / "data"
+    wells = read_production(data / "test_monthly_prod.csv")
+    export_vol(wells, tmp_path / f"prod.vol{suffix}")
+    with open_text(tmp_path / f"prod.vol{suffix}") as f:
+        assert f.read() == (data / "test_monthly_prod.vol").read_text()
+    pd.testing.assert_frame_equal(
+        read_vol(tmp_path / f"prod.vol{suffix}"),
+        read_vol(data / "test_monthly_prod.vol"),
+    )
+
+    tops = read_petrel_tops(synthetic.write_tops_file(tmp_path / "tops.txt", n_wells=3))
+    write_tops(tops, tmp_path / f"tops.txt{suffix}")
+    pd.testing.assert_frame_equal(
+        read_petrel_tops(tmp_path / f"tops.txt{suffix}"), tops
+    )
+
+    gslib_file = data / "test_geomodel.gslib"
+    output = tmp_path / f"geomodel.csv{suffix}"
+    args = ["gslib", f"{gslib_file}", "-o", f"{output}", "--output_format", "csv"]
+    assert CliRunner().invoke(cli, args).exit_code == 0
+    with open_text(output) as f:
+        assert f.read() == gslib_file.with_suffix(".csv").read_text()
+
+    compressed = tmp_path / f"geomodel.gslib{suffix}"
+    with open_text(compressed, "w") as f:
+        f.write(gslib_file.read_text())
+    pd.testing.assert_frame_equal(
+        load_from_petrel(compressed).compute().reset_index(drop=True),
+        load_from_petrel(gslib_file).compute().reset_index(drop=True),
+    )
@@ -0,0 +1,77 @@
+"""Test synthetic data generators."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from petrelpy import synthetic
+from petrelpy.gslib import load_from_petrel
+from petrelpy.petrel import read_petrel_tops, read_production
+from petrelpy.spacing import lateral_points, well_spacing
+from petrelpy.wellconnection import (
+    COL_NAMES_TRAJECTORY,
+    get_trajectory_geomodel_columns,
+    process_well_connection_file,
+)
+
+
+def test_write_gslib_model(tmp_path):
+    fname = synthetic.write_gslib_model(
+        tmp_path / "model.gslib", shape=(6, 5, 4), n_wells=3, block_rows=7
+    )
+    geomodel = load_from_petrel(fname, npartitions=2).compute()
+    assert list(geomodel.columns) == synthetic.GSLIB_COLUMNS
+    assert len(geomodel) == 6 * 5 * 4
+    assert geomodel["UWI-index"].notna().sum() == 3
+    assert set(geomodel["Mainzones"]) == {1, 2, 3}
+
+    # seeded, so the same arguments give the same file
+    again = synthetic.write_gslib_model(
+        tmp_path / "again.gslib", shape=(6, 5, 4), n_wells=3, block_rows=7
+    )
+    assert fname.read_text() == again.read_text()
+
+    # the block size only changes the random properties, not the grid or the wells
+    other = synthetic.write_gslib_model(
+        tmp_path / "other.gslib", shape=(6, 5, 4), n_wells=3, block_rows=1000
+    )
+    fixed = synthetic.GSLIB_COLUMNS[:8]
+    pd.testing.assert_frame_equal(
+        load_from_petrel(other, npartitions=2).compute()[fixed], geomodel[fixed]
+    )
+
+
+def test_write_well_connection_file(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=3, cells_per_well=4)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    aggregates = process_well_connection_file(fname, heels, col_names=col_names)
+    assert list(aggregates.index) == list(heels["UWI"])
+    assert (aggregates["GRID_K"] == 0).all()  # laterals stay in one layer
+
+
+def test_synthetic_well_spacing(tmp_path):
+    # two units of full-length laterals, which must not overlap
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=60)
+    spacing = well_spacing(lateral_points(fname, heels), k=1)
+    assert len(spacing) == 60
+    assert spacing["MIN_SEPARATION"].min() >= 660
+
+
+def test_write_production_csv(tmp_path):
+    monthly = synthetic.write_production_csv(
+        tmp_path / "monthly.csv", n_wells=3, n_months=24, block_wells=2
+    )
+    yearly = synthetic.write_production_csv(
+        tmp_path / "yearly.csv", n_wells=3, n_months=24, yearly=True
+    )
+    assert len(read_production(monthly)) == 3 * 24
+    assert len(read_production(yearly, yearly=True)) == 3 * 2
+
+
+def test_write_tops_file(tmp_path):
+    fname = synthetic.write_tops_file(tmp_path / "tops.txt", n_wells=5, block_rows=2)
+    tops = read_petrel_tops(fname)
+    assert list(tops.columns) == ["Well", *synthetic.HORIZONS]
+    assert (tops[synthetic.HORIZONS].diff(axis=1).iloc[:, 1:] > 0).all().all()
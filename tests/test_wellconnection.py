@@ -0,0 +1,271 @@
+"""Test well connection file indexing."""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from petrelpy import synthetic, wellconnection
+from petrelpy.cli import cli
+from petrelpy.spacing import lateral_points, well_spacing
+from petrelpy.wellconnection import (
+    COL_NAMES_TRAJECTORY,
+    export_trajectories,
+    get_trajectory,
+    get_trajectory_geomodel_columns,
+    get_well,
+    get_well_index,
+    get_wellname,
+    get_wellnames,
+    lateral_geometry,
+    load_trajectories,
+    partition_well_index,
+    process_well_connection_file,
+    read_wells,
+)
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_get_well_index(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    shutil.copy(DATA / "test_wcf.wcf", fname)
+    index = get_well_index(fname)
+    assert (tmp_path / "wells.wcf.index.json").exists()
+    assert list(index["Name"]) == get_wellnames(fname)
+    assert get_wellnames(fname, use_index=True) == get_wellnames(fname)
+    with fname.open() as f:
+        assert list(read_wells(fname, index)) == list(get_well(f))
+
+    # a changed file gets a new index
+    with fname.open("a") as f:
+        f.write("WELLNAME  EXTRA\nTRAJECTORY\nEND_TRAJECTORY\n")
+    assert get_well_index(fname)["Name"].iloc[-1] == "EXTRA"
+
+
+def test_process_selected_wells(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=12, cells_per_well=3)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    everything = process_well_connection_file(fname, heels, col_names=col_names)
+
+    wellnames = list(heels["Name"].iloc[[2, 3, 7]])
+    selected = process_well_connection_file(
+        fname, heels, col_names=col_names, wellnames=wellnames
+    )
+    pd.testing.assert_frame_equal(selected, everything.iloc[[2, 3, 7]])
+
+    parallel = process_well_connection_file(
+        fname, heels, col_names=col_names, max_workers=2
+    )
+    pd.testing.assert_frame_equal(parallel, everything)
+
+
+def test_process_selected_properties(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=6, cells_per_well=4)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    everything = process_well_connection_file(fname, heels, col_names=col_names)
+
+    properties = ["Porosity - total", "Facies"]
+    projected = process_well_connection_file(
+        fname, heels, col_names=col_names, properties=properties
+    )
+    assert set(projected.columns) == {
+        *properties,
+        "MD_ENTRY",
+        "GRID_I",
+        "GRID_J",
+        "GRID_K",
+    }
+    pd.testing.assert_frame_equal(projected, everything[projected.columns])
+
+    heel = tmp_path / "heels.csv"
+    heels.to_csv(heel, index=False)
+    args = ["connection", f"{fname}", "-e", f"{heel}", "-p", "Facies", "-p", "Bogus"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 2
+    assert "Bogus" in result.output
+
+
+def test_process_incremental(tmp_path, monkeypatch):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=8, cells_per_well=4)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    first = process_well_connection_file(
+        fname, heels, col_names=col_names, incremental=True
+    )
+    pd.testing.assert_frame_equal(
+        first, process_well_connection_file(fname, heels, col_names=col_names)
+    )
+
+    # re-drill one well: only it is aggregated again
+    text = fname.read_text()
+    wellname = heels["Name"].iloc[5]
+    start = text.index(f"WELLNAME  {wellname}\n")
+    end = text.index("END_TRAJECTORY", start)
+    section = text[start:end]
+    rows = section.split("TRAJECTORY\n")[1].splitlines()
+    fname.write_text(text[:start] + section.replace(rows[-1] + "\n", "") + text[end:])
+
+    processed = []
+    original = wellconnection.process_well_lateral
+
+    def counting(well_string, *args):
+        processed.append(get_wellname(well_string))
+        return original(well_string, *args)
+
+    monkeypatch.setattr(wellconnection, "process_well_lateral", counting)
+    second = process_well_connection_file(
+        fname, heels, col_names=col_names, incremental=True
+    )
+    assert processed == [wellname]
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(
+        second, process_well_connection_file(fname, heels, col_names=col_names)
+    )
+    assert not second.iloc[5].equals(first.iloc[5])
+
+
+def test_lateral_geometry(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=6, cells_per_well=4)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    kwargs = {"col_names": col_names, "geometry": True, "zone_column": "Facies"}
+    measured = process_well_connection_file(fname, heels, **kwargs)
+
+    # the synthetic laterals head east, 200 ft a cell
+    np.testing.assert_allclose(measured["LATERAL_LENGTH"], 800)
+    np.testing.assert_allclose(measured["AZIMUTH"], 90)
+    laterals = []
+    with fname.open() as f:
+        for well_string, heel in zip(get_well(f), heels["Depth_heel"]):
+            trajectory = get_trajectory(well_string, col_names)
+            lateral = trajectory[trajectory["MD_ENTRY"] >= heel]
+            laterals.append(lateral.assign(Name=get_wellname(well_string)))
+    cells = pd.concat(laterals)
+    geometry = lateral_geometry(cells, zone_column="Facies")
+    z = cells.groupby("Name")[["WELL_ENTRY_Z", "WELL_EXIT_Z"]]
+    np.testing.assert_allclose(
+        geometry["TVD_RANGE"], z.max().max(axis=1) - z.min().min(axis=1)
+    )
+    np.testing.assert_array_equal(
+        geometry["ZONES_CROSSED"], cells.groupby("Name")["Facies"].nunique()
+    )
+    pd.testing.assert_frame_equal(
+        measured[geometry.columns], geometry.set_axis(measured.index)
+    )
+    pd.testing.assert_frame_equal(
+        measured.drop(columns=geometry.columns),
+        process_well_connection_file(fname, heels, col_names=col_names),
+    )
+
+    # the same from projected, parallel and incremental runs
+    projected = process_well_connection_file(
+        fname, heels, properties=["Facies"], **kwargs
+    )
+    pd.testing.assert_frame_equal(projected, measured[projected.columns])
+    parallel = process_well_connection_file(fname, heels, max_workers=2, **kwargs)
+    pd.testing.assert_frame_equal(parallel, measured)
+    for _ in range(2):
+        incremental = process_well_connection_file(
+            fname, heels, incremental=True, **kwargs
+        )
+        pd.testing.assert_frame_equal(incremental, measured, check_dtype=False)
+
+
+def test_export_trajectories(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=10, cells_per_well=5)
+    dataset = tmp_path / "cells.parquet"
+    result = CliRunner().invoke(cli, ["trajectories", f"{fname}", "-o", f"{dataset}"])
+    assert result.exit_code == 0, result.output
+
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    with fname.open() as f:
+        expected = {
+            get_wellname(ws): get_trajectory(ws, col_names) for ws in get_well(f)
+        }
+    cells = load_trajectories(dataset).compute()
+    assert len(cells) == sum(len(trajectory) for trajectory in expected.values())
+    assert cells["GRID_I"].dtype == "int32"
+
+    wellname = heels["Name"].iloc[3]
+    well = load_trajectories(dataset, wellnames=[wellname], columns=["MD_ENTRY"])
+    well = well.compute()
+    assert list(well.columns) == ["Name", "MD_ENTRY"]
+    assert sorted(well["MD_ENTRY"]) == sorted(expected[wellname]["MD_ENTRY"])
+
+
+def test_export_trajectories_batches(tmp_path):
+    fname = tmp_path / "wells.wcf"
+    synthetic.write_well_connection_file(fname, n_wells=10, cells_per_well=5)
+    col_names = COL_NAMES_TRAJECTORY + get_trajectory_geomodel_columns(fname)
+    with fname.open() as f:
+        n_cells = sum(len(get_trajectory(ws, col_names)) for ws in get_well(f))
+    dataset = tmp_path / "cells.parquet"
+    export_trajectories(fname, dataset, n_buckets=3, batch_rows=7)
+    assert len(list(dataset.glob("bucket=*/*.parquet"))) > 3
+    assert len(load_trajectories(dataset).compute()) == n_cells
+
+    # an earlier export is replaced, anything else is left alone
+    export_trajectories(fname, dataset, n_buckets=3, batch_rows=20)
+    assert len(load_trajectories(dataset).compute()) == n_cells
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "keep.txt").write_text("keep")
+    with pytest.raises(FileExistsError):
+        export_trajectories(fname, other)
+    assert (other / "keep.txt").exists()
+    result = CliRunner().invoke(cli, ["trajectories", f"{fname}", "-o", f"{other}"])
+    assert result.exit_code == 2
+    assert "not a trajectory dataset" in result.output
+
+
+def test_well_spacing(tmp_path):
+    # parallel laterals 660 ft apart, the third 100 ft deeper
+    x = np.arange(0.0, 2000.0, 100.0)
+    points = pd.concat(
+        pd.DataFrame({"Name": name, "X": x, "Y": y, "Z": z})
+        for name, y, z in [("A", 0, 8000), ("B", 660, 8000), ("C", 1320, 8100)]
+    )
+    spacing = well_spacing(points, k=2, batch_size=7)
+    assert list(spacing.loc["B", "OFFSET"]) == ["A", "C"]
+    assert list(spacing.loc["C", "VERTICAL_OFFSET"]) == [-100, -100]
+    np.testing.assert_allclose(spacing.loc["A", "MIN_SEPARATION"], [660, 1323.78], 1e-5)
+    np.testing.assert_allclose(
+        spacing["MEAN_SEPARATION"], spacing["MIN_SEPARATION"], rtol=1e-12
+    )
+    assert (spacing["POINTS"] == len(x)).all()
+    assert len(well_spacing(points, max_distance=700).loc["A"]) == 1
+
+    fname = tmp_path / "wells.wcf"
+    heels = synthetic.write_well_connection_file(fname, n_wells=4, cells_per_well=5)
+    lateral = lateral_points(fname, heels)
+    assert len(lateral) == 4 * 5
+    np.testing.assert_allclose(lateral["MD"].iloc[0], heels["Depth_heel"][0] + 100)
+    heel = tmp_path / "heels.csv"
+    heels.to_csv(heel, index=False)
+    args = ["spacing", f"{fname}", "-e", f"{heel}", "-k", "2"]
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    written = pd.read_csv(tmp_path / "wells_spacing.csv", index_col=["Name", "rank"])
+    pd.testing.assert_frame_equal(written, well_spacing(lateral, k=2))
+
+
+def test_partition_well_index():
+    index = pd.DataFrame(
+        {"Name": list("abcdef"), "offset": 0, "length": [10, 10, 10, 10, 50, 10]}
+    )
+    parts = partition_well_index(index, 3)
+    assert [list(part["Name"]) for part in parts] == [
+        ["a", "b", "c"],
+        ["d", "e"],
+        ["f"],
+    ]
+    assert sum(len(part) for part in partition_well_index(index.iloc[:2], 4)) == 2